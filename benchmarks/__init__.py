@@ -0,0 +1,13 @@
+"""Hot-path benchmark suite with a JSON baseline and regression check.
+
+Usage (from the repo root):
+
+    python -m benchmarks run [--full] [-k PATTERN] [-o results.json]
+    python -m benchmarks run --save-baseline
+    python -m benchmarks compare [results.json] [--baseline PATH] [--threshold 0.20]
+
+``compare`` without a results file runs the suite first. It exits 1 when
+any case's best round is slower than the baseline by more than the
+threshold. Timings are machine-specific: re-save the baseline on the
+machine that runs ``compare``.
+"""
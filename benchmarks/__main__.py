@@ -0,0 +1,69 @@
+"""CLI for the benchmark suite (see benchmarks/__init__.py)."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from benchmarks import harness
+
+
+def _run(args: argparse.Namespace) -> dict:
+    import benchmarks.suite  # noqa: F401  (registers the cases)
+
+    cases = harness.select(args.k, full=args.full)
+    if not cases:
+        sys.exit(f"No benchmark matches {args.k!r}")
+    logging.disable(logging.CRITICAL)
+    try:
+        return harness.run(cases)
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_run_options(p: argparse.ArgumentParser) -> None:
+        p.add_argument("-k", help="only cases whose name contains this (fnmatch)")
+        p.add_argument("--full", action="store_true", help="include slow cases (1M-bar backtest)")
+
+    run = sub.add_parser("run", help="run the suite and write a results file")
+    add_run_options(run)
+    run.add_argument("-o", "--output", type=Path, default=Path("bench_results.json"))
+    run.add_argument("--save-baseline", action="store_true",
+                     help=f"write the results to {harness.BASELINE_PATH} instead")
+
+    cmp = sub.add_parser("compare", help="compare results against the baseline")
+    cmp.add_argument("results", type=Path, nargs="?", help="results file (default: run now)")
+    cmp.add_argument("--baseline", type=Path, default=harness.BASELINE_PATH)
+    cmp.add_argument("--threshold", type=float, default=harness.DEFAULT_THRESHOLD,
+                     help="relative slowdown that counts as a regression (default 0.20)")
+    add_run_options(cmp)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = _run(args)
+        path = harness.BASELINE_PATH if args.save_baseline else args.output
+        harness.save(report, path)
+        print(f"Wrote {path}")
+        return 0
+
+    if not args.baseline.exists():
+        sys.exit(f"No baseline at {args.baseline}; create one with: python -m benchmarks run --save-baseline")
+    current = harness.load(args.results) if args.results else _run(args)
+    rows = harness.compare(harness.load(args.baseline), current, args.threshold)
+    print(harness.format_comparison(rows))
+    regressions = [row["name"] for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
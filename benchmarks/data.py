@@ -0,0 +1,40 @@
+"""Synthetic MES bars from generate_backtest_data's session generator."""
+
+from __future__ import annotations
+
+import random
+import sys
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+
+from icc.market.candle import Candle
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import generate_backtest_data as gen  # noqa: E402
+
+
+@lru_cache(maxsize=None)
+def synthetic_bars(n: int, seed: int = 42) -> tuple[Candle, ...]:
+    """``n`` 5-minute bars over consecutive weekday sessions, reproducible per seed."""
+    gen.random.seed(seed)
+    gap_rng = random.Random(seed)
+    bars: list[Candle] = []
+    price = 5200.0
+    day = datetime(2025, 12, 1)
+    while len(bars) < n:
+        if day.weekday() < 5:
+            rows, price = gen.generate_session_candles(day, price)
+            for row in rows:
+                bars.append(Candle(
+                    timestamp=datetime.strptime(row["timestamp"], "%Y-%m-%d %H:%M:%S"),
+                    open=float(row["open"]), high=float(row["high"]),
+                    low=float(row["low"]), close=float(row["close"]),
+                    volume=int(row["volume"]),
+                ))
+            price = gen.snap_to_tick(price + gap_rng.gauss(0, 3.0))
+        day += timedelta(days=1)
+    return tuple(bars[:n])
@@ -0,0 +1,153 @@
+"""Benchmark registry, timing loop, result files and comparison."""
+
+from __future__ import annotations
+
+import contextlib
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.20
+MIN_ROUND_SEC = 0.05
+
+
+@dataclass
+class Case:
+    name: str
+    group: str
+    setup: Callable[[], Callable[[], object]]  # returns the callable to time
+    rounds: int = 5
+    number: int | None = None  # calls per round; None = autorange to MIN_ROUND_SEC
+    slow: bool = False  # only with --full
+
+
+CASES: list[Case] = []
+
+
+def benchmark(name: str, group: str, rounds: int = 5, number: int | None = None,
+              slow: bool = False) -> Callable:
+    """Register ``setup`` as a case. It returns the zero-argument callable to time."""
+    def register(setup: Callable[[], Callable[[], object]]) -> Callable:
+        CASES.append(Case(name, group, setup, rounds, number, slow))
+        return setup
+    return register
+
+
+def _autorange(fn: Callable[[], object]) -> int:
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - started >= MIN_ROUND_SEC:
+            return number
+        number *= 2 if number < 8 else 5
+
+
+def run_case(case: Case) -> dict[str, Any]:
+    # Keep stray stdout (broker stubs, third-party code) out of the report
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        fn = case.setup()
+        number = case.number or _autorange(fn)
+        per_op: list[float] = []
+        for _ in range(case.rounds):
+            started = time.perf_counter_ns()
+            for _ in range(number):
+                fn()
+            per_op.append((time.perf_counter_ns() - started) / number)
+    return {
+        "group": case.group,
+        "number": number,
+        "rounds": case.rounds,
+        "min_ns": round(min(per_op), 1),
+        "median_ns": round(statistics.median(per_op), 1),
+        "mean_ns": round(statistics.fmean(per_op), 1),
+    }
+
+
+def select(pattern: str | None = None, full: bool = False) -> list[Case]:
+    return [
+        c for c in CASES
+        if (full or not c.slow) and (pattern is None or fnmatch.fnmatch(c.name, f"*{pattern}*"))
+    ]
+
+
+def run(cases: list[Case], log: Callable[[str], None] = print) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for case in cases:
+        results[case.name] = row = run_case(case)
+        log(f"{case.name:<44} {format_ns(row['median_ns']):>12}  (x{row['number']})")
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def save(report: dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+def load(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text())
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD) -> list[dict[str, Any]]:
+    """Per-case ratio of best-round times, current/baseline, with a status.
+
+    ``regression`` when slower by more than ``threshold``, ``improved``
+    when faster by more than it, else ``ok``. Cases missing on either side
+    are reported as ``new`` or ``missing``.
+    """
+    base, cur = baseline["results"], current["results"]
+    rows = []
+    for name in sorted(set(base) | set(cur)):
+        if name not in base:
+            rows.append({"name": name, "status": "new", "current_ns": cur[name]["min_ns"]})
+            continue
+        if name not in cur:
+            rows.append({"name": name, "status": "missing", "baseline_ns": base[name]["min_ns"]})
+            continue
+        b, c = base[name]["min_ns"], cur[name]["min_ns"]
+        ratio = c / b if b else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"name": name, "status": status, "baseline_ns": b, "current_ns": c,
+                     "ratio": round(ratio, 3)})
+    return rows
+
+
+def format_ns(ns: float) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
+
+
+def format_comparison(rows: list[dict[str, Any]]) -> str:
+    lines = [f"{'case':<44}{'baseline':>12}{'current':>12}{'ratio':>8}  status"]
+    for row in rows:
+        base = format_ns(row["baseline_ns"]) if "baseline_ns" in row else "-"
+        cur = format_ns(row["current_ns"]) if "current_ns" in row else "-"
+        ratio = f"{row['ratio']:.2f}" if "ratio" in row else "-"
+        lines.append(f"{row['name']:<44}{base:>12}{cur:>12}{ratio:>8}  {row['status'].upper()}")
+    return "\n".join(lines)
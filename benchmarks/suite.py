@@ -0,0 +1,173 @@
+"""Benchmark cases for the trading hot paths."""
+
+from __future__ import annotations
+
+import itertools
+from datetime import date, datetime
+
+from benchmarks.data import synthetic_bars
+from benchmarks.harness import benchmark
+from icc.backtest.engine import BacktestEngine
+from icc.backtest.premium import bs_premium
+from icc.broker.backtest import BacktestBrokerAdapter
+from icc.broker.option_chain import MockOptionChainProvider, OptionChainResolver
+from icc.config import AppSettings, ORBConfig, StrategyConfig
+from icc.constants import FSMState
+from icc.core import indicators
+from icc.core.orb_strategy import ORBStrategyEngine
+from icc.core.strategy import StrategyEngine
+from icc.core.trader import Trader
+from icc.market.candle import CandleBuffer
+from icc.oms.manager import OrderManager
+
+
+def _buffer(n: int = 200) -> CandleBuffer:
+    buf = CandleBuffer(maxlen=200)
+    for candle in synthetic_bars(n):
+        buf.append(candle)
+    return buf
+
+
+# --- Indicators ---------------------------------------------------------------
+
+@benchmark("indicators.ema[200]", "indicators")
+def _ema():
+    closes = _buffer().closes()
+    return lambda: indicators.ema(closes, 20)
+
+
+@benchmark("indicators.atr[200]", "indicators")
+def _atr():
+    buf = _buffer()
+    highs, lows, closes = buf.highs(), buf.lows(), buf.closes()
+    return lambda: indicators.atr(highs, lows, closes, 14)
+
+
+# --- CandleBuffer -------------------------------------------------------------
+
+@benchmark("candle_buffer.append", "candle_buffer")
+def _append():
+    buf = CandleBuffer(maxlen=200)
+    bars = itertools.cycle(synthetic_bars(1000))
+    return lambda: buf.append(next(bars))
+
+
+@benchmark("candle_buffer.closes[all]", "candle_buffer")
+def _closes():
+    return _buffer().closes
+
+
+@benchmark("candle_buffer.closes[20]", "candle_buffer")
+def _closes_tail():
+    buf = _buffer()
+    return lambda: buf.closes(20)
+
+
+@benchmark("candle_buffer.candles[20]", "candle_buffer")
+def _candles_tail():
+    buf = _buffer()
+    return lambda: buf.candles(20)
+
+
+@benchmark("candle_buffer.last", "candle_buffer")
+def _last():
+    buf = _buffer()
+    return lambda: buf.last
+
+
+# --- Strategies ---------------------------------------------------------------
+
+def _strategy_case(state: FSMState):
+    def setup():
+        engine = StrategyEngine(StrategyConfig())
+        buf = _buffer()
+        return lambda: engine.evaluate(state, buf)
+    return setup
+
+
+for _state in (FSMState.FLAT, FSMState.INDICATION_UP, FSMState.INDICATION_DOWN,
+               FSMState.CORRECTION_UP, FSMState.CORRECTION_DOWN,
+               FSMState.CONTINUATION_UP, FSMState.CONTINUATION_DOWN):
+    benchmark(f"strategy.evaluate[{_state.value}]", "strategy")(_strategy_case(_state))
+
+
+def _orb_case(state: FSMState):
+    def setup():
+        engine = ORBStrategyEngine(ORBConfig())
+        buf = _buffer()
+        if state == FSMState.ORB_ARMED:
+            # A range around the recent bars, so breakout checks run to completion
+            recent = buf.candles(15)
+            engine._range_high = max(c.high for c in recent)
+            engine._range_low = min(c.low for c in recent)
+            engine._range_candle_count = len(recent)
+        return lambda: engine.evaluate(state, buf)
+    return setup
+
+
+for _state in (FSMState.ORB_BUILDING, FSMState.ORB_ARMED):
+    benchmark(f"orb.evaluate[{_state.value}]", "strategy")(_orb_case(_state))
+
+
+# --- Trader -------------------------------------------------------------------
+
+def _trader_case(strategy_name: str):
+    def setup():
+        config = AppSettings()
+        config.strategy_name = strategy_name
+        broker = BacktestBrokerAdapter(
+            slippage_ticks=config.risk.slippage_ticks,
+            commission_per_side=config.risk.commission_per_side,
+        )
+        broker.connect()
+        trader = Trader(config=config, order_manager=OrderManager(broker, retry_backoff_sec=0.0))
+        bars = itertools.cycle(synthetic_bars(10_000))
+
+        def step():
+            candle = next(bars)
+            broker.set_bar(candle)
+            trader.on_candle(candle)
+        return step
+    return setup
+
+
+benchmark("trader.on_candle[ICC]", "trader")(_trader_case("ICC"))
+benchmark("trader.on_candle[ORB]", "trader")(_trader_case("ORB"))
+
+
+# --- Backtest -----------------------------------------------------------------
+
+def _backtest_case(n: int):
+    def setup():
+        bars = list(synthetic_bars(n))
+        return lambda: BacktestEngine(AppSettings(), bars).run()
+    return setup
+
+
+benchmark("backtest.run[10k]", "backtest", rounds=3, number=1)(_backtest_case(10_000))
+benchmark("backtest.run[100k]", "backtest", rounds=1, number=1)(_backtest_case(100_000))
+benchmark("backtest.run[1M]", "backtest", rounds=1, number=1, slow=True)(_backtest_case(1_000_000))
+
+
+# --- Options ------------------------------------------------------------------
+
+@benchmark("premium.bs_premium", "options")
+def _bs_premium():
+    return lambda: bs_premium(5420.0, 5425.0, 3.0, 0.20, "CALL")
+
+
+@benchmark("option_chain.resolve[ATM]", "options")
+def _resolve():
+    today = date(2026, 3, 13)
+    chain = []
+    for strike in range(5370, 5475, 5):
+        for option_type in ("CALL", "PUT"):
+            premium = max(0.25, 5.0 + (5420.0 - strike) * (0.1 if option_type == "CALL" else -0.1))
+            chain.append({"strike": float(strike), "option_type": option_type,
+                          "ask": premium, "bid": premium - 0.25, "last": premium - 0.1,
+                          "delta": 0.5})
+    provider = MockOptionChainProvider(expirations=[today, date(2026, 3, 20)], chain=chain)
+    resolver = OptionChainResolver(provider=provider, underlying="MES", strike_mode="ATM",
+                                   expiration_mode="ZERO_DTE")
+    now = datetime(2026, 3, 13, 10, 30)
+    return lambda: resolver.resolve("long", 5420.0, now=now)
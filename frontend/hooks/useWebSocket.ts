@@ -1,10 +1,12 @@
 "use client";
 
 import { useEffect, useRef, useCallback, useState } from "react";
-import { WS_URL } from "@/lib/env";
+import { WS_BINARY, WS_URL } from "@/lib/env";
 import { useTradingStore } from "@/stores/tradingStore";
 import { useSessionStore } from "@/stores/sessionStore";
 import { useEventStore } from "@/stores/eventStore";
+import { applyPatch, type SnapshotDelta } from "@/lib/snapshotPatch";
+import { BINARY_PROTOCOL, decodeBinary } from "@/lib/binaryProtocol";
 import type { Candle, FSMState, TradingSnapshot } from "@/lib/types";
 
 const MIN_RECONNECT_MS = 1000;
@@ -13,12 +15,17 @@ const PING_INTERVAL_MS = 30000;
 
 export type WSReadyState = "connecting" | "connected" | "disconnected";
 
+type WSMessage = { type: string; data: Record<string, unknown>; ts?: number; seq?: number };
+
 export function useWebSocket() {
   const wsRef = useRef<WebSocket | null>(null);
   const reconnectDelayRef = useRef(MIN_RECONNECT_MS);
   const reconnectTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
   const pingTimerRef = useRef<ReturnType<typeof setInterval> | null>(null);
   const [readyState, setReadyState] = useState<WSReadyState>("disconnected");
+  // Versioned snapshot state: deltas apply only on top of seq
+  const snapshotRef = useRef<Record<string, unknown> | null>(null);
+  const seqRef = useRef<number | null>(null);
 
   const { updateSnapshot, addCandle, updateFSMState, setRunning } =
     useTradingStore.getState();
@@ -26,24 +33,40 @@ export function useWebSocket() {
     useSessionStore.getState();
   const addEvent = useEventStore.getState().addEvent;
 
-  const handleMessage = useCallback(
-    (raw: string) => {
-      let msg: { type: string; data: Record<string, unknown>; ts?: number };
-      try {
-        msg = JSON.parse(raw);
-      } catch {
-        return;
-      }
+  const applySnapshot = useCallback(
+    (data: Record<string, unknown>) => {
+      if (!data || !("fsm_state" in data)) return; // no active session
+      const snap = data as unknown as TradingSnapshot;
+      updateSnapshot(snap);
+      setSessionRunning(snap.running);
+      if (snap.mode) setMode(snap.mode);
+    },
+    [updateSnapshot, setSessionRunning, setMode],
+  );
 
+  const dispatch = useCallback(
+    (msg: WSMessage) => {
       const { type, data, ts } = msg;
 
       switch (type) {
         case "snapshot": {
-          if (!data || !("fsm_state" in data)) break; // no active session
-          const snap = data as unknown as TradingSnapshot;
-          updateSnapshot(snap);
-          setSessionRunning(snap.running);
-          if (snap.mode) setMode(snap.mode);
+          snapshotRef.current = data;
+          seqRef.current = msg.seq ?? null;
+          applySnapshot(data);
+          break;
+        }
+        case "snapshot_delta": {
+          const delta = data as unknown as SnapshotDelta;
+          if (seqRef.current === null || snapshotRef.current === null) break; // awaiting full snapshot
+          if (delta.base !== seqRef.current) {
+            // Missed a delta — ask for a full resync
+            seqRef.current = null;
+            if (wsRef.current?.readyState === WebSocket.OPEN) wsRef.current.send("snapshot");
+            break;
+          }
+          snapshotRef.current = applyPatch(snapshotRef.current, delta.ops);
+          seqRef.current = delta.seq;
+          applySnapshot(snapshotRef.current);
           break;
         }
         case "candle": {
@@ -108,7 +131,26 @@ export function useWebSocket() {
           addEvent(type, JSON.stringify(data).slice(0, 120), ts);
       }
     },
-    [updateSnapshot, addCandle, updateFSMState, setRunning, setSessionRunning, setMode, addEvent],
+    [applySnapshot, addCandle, updateFSMState, setRunning, setSessionRunning, setMode, addEvent],
+  );
+
+  const handleMessage = useCallback(
+    (raw: string | ArrayBuffer) => {
+      let msg: WSMessage;
+      try {
+        // Binary frames only arrive when the icc.bin.v1 subprotocol was negotiated
+        msg = typeof raw === "string" ? JSON.parse(raw) : decodeBinary(raw);
+      } catch {
+        return;
+      }
+      if (msg.type === "batch") {
+        // Burst of events relayed in one frame
+        for (const inner of msg.data as unknown as WSMessage[]) dispatch(inner);
+      } else {
+        dispatch(msg);
+      }
+    },
+    [dispatch],
   );
 
   const connect = useCallback(() => {
@@ -118,7 +160,8 @@ export function useWebSocket() {
     setReadyState("connecting");
     let ws: WebSocket;
     try {
-      ws = new WebSocket(WS_URL);
+      ws = WS_BINARY ? new WebSocket(WS_URL, [BINARY_PROTOCOL]) : new WebSocket(WS_URL);
+      ws.binaryType = "arraybuffer";
     } catch {
       setReadyState("disconnected");
       const delay = reconnectDelayRef.current;
@@ -130,6 +173,7 @@ export function useWebSocket() {
 
     ws.onopen = () => {
       setReadyState("connected");
+      seqRef.current = null; // server sends a full snapshot on connect
       reconnectDelayRef.current = MIN_RECONNECT_MS;
       // Start ping interval
       pingTimerRef.current = setInterval(() => {
@@ -0,0 +1,136 @@
+/** Decoder for the "icc.bin.v1" WebSocket subprotocol (see icc/web/binary_protocol.py). */
+
+export const BINARY_PROTOCOL = "icc.bin.v1";
+
+const VERSION = 1;
+const KIND_BATCH = 0;
+const KIND_CANDLE = 1;
+const KIND_ENTRY = 2;
+const KIND_EXIT = 3;
+const NAIVE_TZ = 0x7fff;
+const HEADER_SIZE = 10; // B version, B kind, d ts
+
+export interface BinaryMessage {
+  type: string;
+  data: Record<string, unknown>;
+  ts?: number;
+}
+
+const utf8 = new TextDecoder();
+
+class Reader {
+  constructor(
+    private view: DataView,
+    public offset: number,
+  ) {}
+
+  u8() {
+    return this.view.getUint8(this.offset++);
+  }
+  u16() {
+    const v = this.view.getUint16(this.offset, true);
+    this.offset += 2;
+    return v;
+  }
+  i16() {
+    const v = this.view.getInt16(this.offset, true);
+    this.offset += 2;
+    return v;
+  }
+  u32() {
+    const v = this.view.getUint32(this.offset, true);
+    this.offset += 4;
+    return v;
+  }
+  i64() {
+    const v = Number(this.view.getBigInt64(this.offset, true));
+    this.offset += 8;
+    return v;
+  }
+  f64() {
+    const v = this.view.getFloat64(this.offset, true);
+    this.offset += 8;
+    return v;
+  }
+  optF64() {
+    const v = this.f64();
+    return Number.isNaN(v) ? null : v;
+  }
+  str() {
+    const n = this.u8();
+    const bytes = new Uint8Array(this.view.buffer, this.view.byteOffset + this.offset, n);
+    this.offset += n;
+    return utf8.decode(bytes);
+  }
+}
+
+const pad = (n: number) => String(n).padStart(2, "0");
+
+/** Rebuild the ISO string Python's datetime.isoformat() would give. */
+function isoTimestamp(seconds: number, offsetMin: number): string {
+  const wall = new Date(seconds * 1000).toISOString().slice(0, 19);
+  if (offsetMin === NAIVE_TZ) return wall;
+  const sign = offsetMin < 0 ? "-" : "+";
+  const abs = Math.abs(offsetMin);
+  return `${wall}${sign}${pad(Math.floor(abs / 60))}:${pad(abs % 60)}`;
+}
+
+function decodeAt(view: DataView): BinaryMessage {
+  const r = new Reader(view, 0);
+  const version = r.u8();
+  if (version !== VERSION) throw new Error(`Unsupported binary frame version ${version}`);
+  const kind = r.u8();
+  const ts = r.f64();
+  r.offset = HEADER_SIZE;
+
+  switch (kind) {
+    case KIND_BATCH: {
+      const count = r.u16();
+      const data: BinaryMessage[] = [];
+      for (let i = 0; i < count; i++) {
+        const length = r.u16();
+        data.push(decodeAt(new DataView(view.buffer, view.byteOffset + r.offset, length)));
+        r.offset += length;
+      }
+      return { type: "batch", data: data as unknown as Record<string, unknown> };
+    }
+    case KIND_CANDLE: {
+      const seconds = r.i64();
+      const tz = r.i16();
+      const [open, high, low, close] = [r.f64(), r.f64(), r.f64(), r.f64()];
+      const volume = r.u32();
+      const symbol = r.str();
+      return {
+        type: "candle",
+        data: { timestamp: isoTimestamp(seconds, tz), open, high, low, close, volume, symbol },
+        ts,
+      };
+    }
+    case KIND_ENTRY: {
+      const side = r.str();
+      const [entry_price, stop_price, target_price] = [r.f64(), r.optF64(), r.optF64()];
+      return {
+        type: "entry",
+        data: { side, entry_price, stop_price, target_price, option: null },
+        ts,
+      };
+    }
+    case KIND_EXIT: {
+      const side = r.str();
+      const [entry_price, exit_price, pnl, daily_pnl] = [r.f64(), r.f64(), r.f64(), r.f64()];
+      const reason = r.str();
+      return {
+        type: "exit",
+        data: { side, entry_price, exit_price, pnl, reason, daily_pnl, option: null },
+        ts,
+      };
+    }
+    default:
+      throw new Error(`Unknown binary frame kind ${kind}`);
+  }
+}
+
+/** Decode a binary frame into the same message shape as its JSON form. */
+export function decodeBinary(buf: ArrayBuffer): BinaryMessage {
+  return decodeAt(new DataView(buf));
+}
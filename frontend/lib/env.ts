@@ -3,3 +3,6 @@ export const API_URL =
 
 export const WS_URL =
   process.env.NEXT_PUBLIC_WS_URL ?? "ws://localhost:8000/ws";
+
+/** Opt in to the packed binary WebSocket protocol for candle/entry/exit events. */
+export const WS_BINARY = process.env.NEXT_PUBLIC_WS_BINARY === "1";
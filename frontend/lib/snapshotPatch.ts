@@ -0,0 +1,42 @@
+/** JSON-patch deltas for the versioned snapshot stream (see icc/web/state_sync.py). */
+
+export interface PatchOp {
+  op: "add" | "replace" | "remove";
+  path: string;
+  value?: unknown;
+}
+
+/** WS snapshot_delta payload: apply `ops` to the state at `base` to reach `seq`. */
+export interface SnapshotDelta {
+  seq: number;
+  base: number;
+  ops: PatchOp[];
+}
+
+const unescape = (token: string) => token.replace(/~1/g, "/").replace(/~0/g, "~");
+
+type Doc = Record<string, unknown>;
+
+/** Apply ops immutably: only objects along each changed path are copied. */
+export function applyPatch<T>(doc: T, ops: PatchOp[]): T {
+  let root = doc as unknown;
+  for (const { op, path, value } of ops) {
+    if (path === "") {
+      root = value;
+      continue;
+    }
+    const tokens = path.split("/").slice(1).map(unescape);
+    const copy: Doc = { ...(root as Doc) };
+    root = copy;
+    let target = copy;
+    for (const token of tokens.slice(0, -1)) {
+      const child = { ...(target[token] as Doc) };
+      target[token] = child;
+      target = child;
+    }
+    const last = tokens[tokens.length - 1];
+    if (op === "remove") delete target[last];
+    else target[last] = value;
+  }
+  return root as T;
+}
@@ -1,3 +1,5 @@
+import type { SnapshotDelta } from "./snapshotPatch";
+
 /** Matches backend Candle dataclass */
 export interface Candle {
   timestamp: string; // ISO string
@@ -135,6 +137,9 @@ export interface SchedulerStatus {
 /** Session status from GET /api/session/status */
 export interface SessionStatus {
   running: boolean;
-  snapshot: TradingSnapshot | null;
+  seq: number;
+  snapshot?: TradingSnapshot | null;
+  /** Present instead of `snapshot` when requested with ?since=<seq> */
+  snapshot_delta?: SnapshotDelta;
   ws_clients: number;
 }
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from datetime import date
+from typing import TYPE_CHECKING, Optional
 
 from icc.backtest.report import BacktestResult
 from icc.broker.backtest import BacktestBrokerAdapter
@@ -13,22 +14,38 @@ from icc.market.candle import Candle
 from icc.market.feed import ReplayFeed
 from icc.oms.manager import OrderManager
 
+if TYPE_CHECKING:
+    from icc.backtest.research import ResearchSeries
+
 logger = logging.getLogger(__name__)
 
 
 class BacktestEngine:
-    def __init__(self, config: AppSettings, candles: list[Candle]):
+    def __init__(self, config: AppSettings, candles: list[Candle],
+                 research_series: Optional[ResearchSeries] = None):
         self.config = config
         self.candles = candles
         self.result = BacktestResult()
+        # Reusable across engines sharing `candles` (e.g. a min_confidence sweep)
+        self.research_series = research_series
 
     def run(self) -> BacktestResult:
+        fill_model = None
+        if self.config.backtest.fill_model_enabled:
+            from icc.backtest.fills import FillModel
+            fill_model = FillModel.from_config(
+                self.config.backtest, slippage_ticks=self.config.risk.slippage_ticks,
+            )
+            fill_model.precompute(self.candles)
+
         broker = BacktestBrokerAdapter(
             slippage_ticks=self.config.risk.slippage_ticks,
             commission_per_side=self.config.risk.commission_per_side,
+            fill_model=fill_model,
         )
         broker.connect()
-        oms = OrderManager(broker)
+        # No wall-clock backoff in replay — a rejected stop just wasn't triggered
+        oms = OrderManager(broker, retry_backoff_sec=0.0)
 
         # Set up option chain resolver for OPTIONS mode
         option_chain_resolver = None
@@ -58,10 +75,16 @@ class BacktestEngine:
                 otm_fallback=self.config.options.otm_fallback,
             )
 
+        research_agent = None
+        if self.config.backtest.research_gate and self.config.research.enabled:
+            research_agent = self._build_research_agent()
+
         trader = Trader(
             config=self.config,
             order_manager=oms,
             option_chain_resolver=option_chain_resolver,
+            research_agent=research_agent,
+            fill_model=fill_model,
         )
 
         feed = ReplayFeed(self.candles)
@@ -74,6 +97,7 @@ class BacktestEngine:
             if self.config.options.instrument_type == "OPTIONS" and hasattr(trader, '_active_contract'):
                 self._update_synthetic_provider(trader, candle, premium_calc)
 
+            broker.set_bar(candle)
             trader.on_candle(candle)
 
             # Track equity — for options, use synthetic premium for unrealized
@@ -104,6 +128,16 @@ class BacktestEngine:
         logger.info("Backtest complete: %s", self.result.summary())
         return self.result
 
+    def _build_research_agent(self):
+        """Research agent backed by the candle array's precomputed series."""
+        from icc.backtest.research import BacktestResearchAgent, ResearchSeries
+        from icc.research.config import ResearchConfig as RAConfig
+
+        ra_config = RAConfig(**self.config.research.model_dump())
+        if self.research_series is None or not self.research_series.matches(ra_config):
+            self.research_series = ResearchSeries.build(self.candles, ra_config)
+        return BacktestResearchAgent(ra_config, self.research_series)
+
     def _update_synthetic_provider(self, trader, candle, premium_calc):
         """Keep the synthetic provider's reference price in sync with candles."""
         # The provider needs the current candle date for DTE calculations
@@ -0,0 +1,231 @@
+"""FillModel — intrabar fill simulation for backtests.
+
+Replaces the "fill at price +/- slippage, stop before target" shortcut with:
+
+- an intrabar path assumption (OHLC, OLHC, or a Brownian bridge seeded per
+  bar) that decides whether the bar's high or low traded first,
+- gap-through handling: a stop the bar opened beyond fills at the open,
+- volume-limited (partial) fills capped at a fraction of bar volume, at
+  least one contract on any bar that traded; the unfilled remainder is
+  cancelled (IOC), not carried to the next bar,
+- a square-root liquidity slippage curve: thin bars cost more ticks.
+
+The high/low ordering is computed once per bar and cached, so parameter
+sweeps that replay the same candles reuse it. ``resolve_exits`` runs the
+first-touch logic over a whole candle array in a single pass.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from typing import TYPE_CHECKING, Sequence
+
+from icc.constants import MES_TICK_SIZE, IntrabarPath, OrderSide
+from icc.market.candle import Candle
+
+if TYPE_CHECKING:
+    from icc.config import BacktestConfig
+
+BRIDGE_STEPS = 16
+
+
+class FillModel:
+    """Intrabar fill assumptions shared by the backtest broker and Trader exits."""
+
+    def __init__(
+        self,
+        path: IntrabarPath | str = IntrabarPath.OHLC,
+        base_slippage_ticks: int = 1,
+        impact_ticks: float = 2.0,
+        max_slippage_ticks: int = 8,
+        max_participation: float = 0.10,
+        tick_size: float = MES_TICK_SIZE,
+        seed: int = 0,
+    ) -> None:
+        self.path = IntrabarPath(path)
+        self.base_slippage_ticks = base_slippage_ticks
+        self.impact_ticks = impact_ticks
+        self.max_slippage_ticks = max_slippage_ticks
+        self.max_participation = max_participation
+        self.tick_size = tick_size
+        self.seed = seed
+        self._high_first: dict[tuple, bool] = {}
+
+    @classmethod
+    def from_config(cls, config: BacktestConfig, slippage_ticks: int = 1) -> FillModel:
+        return cls(
+            path=config.intrabar_path,
+            base_slippage_ticks=slippage_ticks,
+            impact_ticks=config.slippage_impact_ticks,
+            max_slippage_ticks=config.max_slippage_ticks,
+            max_participation=config.max_volume_participation,
+            seed=config.fill_seed,
+        )
+
+    # -- intrabar path ------------------------------------------------------
+
+    def high_first(self, candle: Candle) -> bool:
+        """True if the bar is assumed to trade its high before its low."""
+        if self.path == IntrabarPath.OHLC:
+            return True
+        if self.path == IntrabarPath.OLHC:
+            return False
+        key = (candle.symbol, candle.timestamp)
+        cached = self._high_first.get(key)
+        if cached is None:
+            cached = self._bridge_high_first(candle)
+            self._high_first[key] = cached
+        return cached
+
+    def precompute(self, candles: Sequence[Candle]) -> list[bool]:
+        """Resolve the high/low ordering for every bar up front."""
+        return [self.high_first(c) for c in candles]
+
+    def _bridge_high_first(self, candle: Candle) -> bool:
+        """Draw a Brownian bridge open -> close and see which extreme comes first."""
+        if candle.open >= candle.high:
+            return True
+        if candle.open <= candle.low:
+            return False
+        # Seeded per (seed, symbol, bar): reproducible, independent across symbols
+        rng = random.Random(f"{self.seed}:{candle.symbol}:{candle.timestamp.isoformat()}")
+
+        n = BRIDGE_STEPS
+        walk = [0.0]
+        for _ in range(n):
+            walk.append(walk[-1] + rng.gauss(0.0, 1.0))
+        end = walk[-1]
+        drift = candle.close - candle.open
+        scale = max(candle.high - candle.low, self.tick_size) / math.sqrt(n)
+        bridge = [
+            candle.open + drift * i / n + (walk[i] - end * i / n) * scale
+            for i in range(n + 1)
+        ]
+        i_max = max(range(n + 1), key=bridge.__getitem__)
+        i_min = min(range(n + 1), key=bridge.__getitem__)
+        return i_max <= i_min
+
+    def waypoints(self, candle: Candle) -> tuple[float, float, float, float]:
+        """Bar path as (open, first extreme, second extreme, close)."""
+        if self.high_first(candle):
+            return candle.open, candle.high, candle.low, candle.close
+        return candle.open, candle.low, candle.high, candle.close
+
+    # -- liquidity ----------------------------------------------------------
+
+    def slippage(self, quantity: int, volume: int) -> float:
+        """Slippage in price units: base ticks plus sqrt(participation) impact."""
+        ratio = quantity / max(volume, 1)
+        ticks = self.base_slippage_ticks + round(self.impact_ticks * math.sqrt(ratio))
+        return min(ticks, self.max_slippage_ticks) * self.tick_size
+
+    def fillable_quantity(self, quantity: int, volume: int) -> int:
+        """Contracts that can fill within one bar given its volume.
+
+        At least one contract fills on any bar with volume, so thin bars
+        still fill; the remainder of the order is cancelled (IOC).
+        """
+        if volume <= 0:
+            return 0
+        cap = max(1, int(volume * self.max_participation))
+        return max(0, min(quantity, cap))
+
+    # -- orders -------------------------------------------------------------
+
+    def stop_fill(self, side: OrderSide, stop_price: float, quantity: int,
+                  candle: Candle) -> tuple[float, int] | None:
+        """Fill a stop entry against ``candle``.
+
+        Returns (fill_price, filled_quantity), or None if the bar never
+        traded through the stop or had no volume to fill against.
+        """
+        if side == OrderSide.BUY:
+            if candle.open >= stop_price:
+                trigger = candle.open  # gapped through — market at the open
+            elif candle.high >= stop_price:
+                trigger = stop_price
+            else:
+                return None
+        else:
+            if candle.open <= stop_price:
+                trigger = candle.open
+            elif candle.low <= stop_price:
+                trigger = stop_price
+            else:
+                return None
+
+        filled = self.fillable_quantity(quantity, candle.volume)
+        if filled == 0:
+            return None
+        slip = self.slippage(filled, candle.volume)
+        price = trigger + slip if side == OrderSide.BUY else trigger - slip
+        return price, filled
+
+    # -- exits --------------------------------------------------------------
+
+    def resolve_exit(self, is_long: bool, stop_price: float, target_price: float,
+                     quantity: int, candle: Candle) -> tuple[str | None, float]:
+        """First-touch of stop vs target along the assumed intrabar path.
+
+        Returns ('stop_hit' | 'target_hit' | None, fill_price). Stops fill as
+        market orders (gap-through at the open, adverse slippage); targets
+        fill as limits at the target or better on a gap.
+        """
+        o, first, second, c = self.waypoints(candle)
+        return self._first_touch(
+            is_long, stop_price, target_price,
+            (o, first, second, c), self.slippage(quantity, candle.volume),
+        )
+
+    def resolve_exits(
+        self,
+        candles: Sequence[Candle],
+        is_long: bool,
+        stop_prices: Sequence[float],
+        target_prices: Sequence[float],
+        quantity: int = 1,
+    ) -> list[tuple[str | None, float]]:
+        """Batch ``resolve_exit`` over a candle array (one result per bar)."""
+        order = self.precompute(candles)
+        results: list[tuple[str | None, float]] = []
+        first_touch = self._first_touch
+        slippage = self.slippage
+        for candle, high_first, stop, target in zip(candles, order, stop_prices, target_prices):
+            if high_first:
+                points = (candle.open, candle.high, candle.low, candle.close)
+            else:
+                points = (candle.open, candle.low, candle.high, candle.close)
+            results.append(first_touch(
+                is_long, stop, target, points, slippage(quantity, candle.volume),
+            ))
+        return results
+
+    @staticmethod
+    def _first_touch(is_long: bool, stop: float, target: float,
+                     points: tuple[float, float, float, float],
+                     slip: float) -> tuple[str | None, float]:
+        o = points[0]
+        if is_long:
+            if o <= stop:
+                return "stop_hit", o - slip
+            if o >= target:
+                return "target_hit", o
+        else:
+            if o >= stop:
+                return "stop_hit", o + slip
+            if o <= target:
+                return "target_hit", o
+
+        for a, b in zip(points, points[1:]):
+            if b < a:  # falling leg
+                if is_long and b <= stop:
+                    return "stop_hit", stop - slip
+                if not is_long and b <= target:
+                    return "target_hit", target
+            elif b > a:  # rising leg
+                if is_long and b >= target:
+                    return "target_hit", target
+                if not is_long and b >= stop:
+                    return "stop_hit", stop + slip
+        return None, points[-1]
@@ -0,0 +1,128 @@
+"""Research gating for backtests from precomputed per-candle series.
+
+The live ResearchAgent assesses each entry from the trader's buffer and the
+wall clock. In a replay the inputs are known up front, so ``ResearchSeries``
+walks the candle array once and records, per candle:
+
+- the ATR percentile rank (RollingRegime, the same rolling state the live
+  RegimeDetector keeps, so values match a live run over the same candles),
+- the session VWAP and close used for VWAP alignment,
+- the economic calendar blackout state.
+
+Session phase is a function of the candle timestamp and is derived at
+lookup. Thresholds and multipliers are applied only at lookup too
+(``RegimeDetector.combine``), so one series serves a whole sweep over
+``min_confidence`` and the multiplier knobs; only ``atr_lookback`` and
+``calendar_file`` need a rebuild.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional, Sequence
+
+from icc.market.candle import Candle, CandleBuffer
+from icc.research.agent import ResearchAgent
+from icc.research.calendar import CalendarState, EconomicCalendar
+from icc.research.config import ResearchConfig
+from icc.research.regime import RegimeState, RollingRegime
+
+
+class ResearchSeries:
+    """Raw research inputs for every candle of one candle array."""
+
+    def __init__(
+        self,
+        timestamps: list[datetime],
+        atr_percentile: list[Optional[float]],
+        vwap: list[Optional[float]],
+        close: list[float],
+        blackouts: dict[int, CalendarState],
+        atr_lookback: int,
+        calendar_file: str,
+    ) -> None:
+        self.timestamps = timestamps
+        self.atr_percentile = atr_percentile
+        self.vwap = vwap
+        self.close = close
+        self.blackouts = blackouts
+        self.atr_lookback = atr_lookback
+        self.calendar_file = calendar_file
+        self._index = {ts: i for i, ts in enumerate(timestamps)}
+
+    @classmethod
+    def build(cls, candles: Sequence[Candle], config: ResearchConfig) -> ResearchSeries:
+        track = RollingRegime(config)
+        calendar = EconomicCalendar(config.calendar_file)
+        atr_percentile: list[Optional[float]] = []
+        vwap: list[Optional[float]] = []
+        blackouts: dict[int, CalendarState] = {}
+        for i, candle in enumerate(candles):
+            track.update(candle)
+            atr_percentile.append(track.atr_percentile)
+            vwap.append(track.vwap)
+            state = calendar.check(candle.timestamp)
+            if state.in_blackout:
+                blackouts[i] = state
+        return cls(
+            timestamps=[c.timestamp for c in candles],
+            atr_percentile=atr_percentile,
+            vwap=vwap,
+            close=[c.close for c in candles],
+            blackouts=blackouts,
+            atr_lookback=config.atr_lookback,
+            calendar_file=config.calendar_file,
+        )
+
+    def matches(self, config: ResearchConfig) -> bool:
+        """True if the series was built with the config's data-shaping fields."""
+        return (self.atr_lookback == config.atr_lookback
+                and self.calendar_file == config.calendar_file)
+
+    def index_of(self, ts: datetime) -> Optional[int]:
+        return self._index.get(ts)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+class BacktestResearchAgent(ResearchAgent):
+    """ResearchAgent whose calendar and regime inputs are series lookups.
+
+    ``now`` defaults to the timestamp of the buffer's last candle instead
+    of the wall clock.
+    """
+
+    def __init__(self, config: ResearchConfig, series: ResearchSeries) -> None:
+        super().__init__(config)
+        self._series = series
+
+    def observe(self, buffer: CandleBuffer) -> None:
+        """No-op: regime values come from the precomputed series."""
+
+    def assess_entry(
+        self,
+        buffer: CandleBuffer,
+        signal_direction: str,
+        now: Optional[datetime] = None,
+        win_rate_adj: float = 1.0,
+    ) -> tuple[bool, str, float]:
+        if now is None and buffer.last is not None:
+            now = buffer.last.timestamp
+        return super().assess_entry(buffer, signal_direction, now, win_rate_adj)
+
+    def _calendar_state(self, now: datetime) -> CalendarState:
+        i = self._series.index_of(now)
+        if i is None:
+            return super()._calendar_state(now)
+        return self._series.blackouts.get(i) or CalendarState(in_blackout=False)
+
+    def _regime_state(self, buffer: CandleBuffer, signal_direction: str,
+                      now: datetime) -> RegimeState | None:
+        last = buffer.last
+        i = self._series.index_of(last.timestamp) if last is not None else None
+        if self._regime is None or i is None:
+            return super()._regime_state(buffer, signal_direction, now)
+        s = self._series
+        return self._regime.combine(s.atr_percentile[i], s.vwap[i], s.close[i],
+                                    signal_direction, now)
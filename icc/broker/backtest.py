@@ -3,20 +3,38 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import TYPE_CHECKING, Optional
 
 from icc.broker.base import BrokerAdapter
 from icc.constants import MES_TICK_SIZE, OrderSide, OrderType
 from icc.oms.orders import Fill, Order
 
+if TYPE_CHECKING:
+    from icc.backtest.fills import FillModel
+    from icc.market.candle import Candle
+
 
 class BacktestBrokerAdapter(BrokerAdapter):
-    """Simulates order fills for backtesting."""
+    """Simulates order fills for backtesting.
+
+    With a ``fill_model`` and the current bar set via ``set_bar``, STOP orders
+    only fill if the bar traded through them (at the open on a gap), fill
+    quantity is capped by bar volume, and slippage follows the model's
+    liquidity curve. Without one, fills use the flat ``slippage_ticks``.
+    """
 
-    def __init__(self, slippage_ticks: int = 1, commission_per_side: float = 2.50):
+    def __init__(self, slippage_ticks: int = 1, commission_per_side: float = 2.50,
+                 fill_model: Optional[FillModel] = None):
         self.slippage_ticks = slippage_ticks
         self.commission_per_side = commission_per_side
+        self.fill_model = fill_model
+        self._bar: Optional[Candle] = None
         self._connected = False
 
+    def set_bar(self, candle: Candle) -> None:
+        """Set the bar that incoming orders are filled against."""
+        self._bar = candle
+
     def connect(self) -> bool:
         self._connected = True
         return True
@@ -28,6 +46,26 @@ class BacktestBrokerAdapter(BrokerAdapter):
         if order.price is None and order.order_type != OrderType.MARKET:
             return None
 
+        if (
+            self.fill_model is not None
+            and self._bar is not None
+            and order.order_type == OrderType.STOP
+        ):
+            result = self.fill_model.stop_fill(
+                order.side, order.price, order.quantity, self._bar,
+            )
+            if result is None:
+                return None
+            fill_price, filled_qty = result
+            return Fill(
+                order_id=order.order_id,
+                price=fill_price,
+                quantity=filled_qty,
+                side=order.side,
+                timestamp=self._bar.timestamp,
+                commission=self.commission_per_side,
+            )
+
         # Simulate fill with slippage
         slippage = self.slippage_ticks * MES_TICK_SIZE
         if order.order_type == OrderType.MARKET:
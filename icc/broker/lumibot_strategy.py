@@ -1,7 +1,8 @@
 """ICCLumibotStrategy — Lumibot strategy that runs ICC Trader inside on_trading_iteration().
 
 Supports multi-ticker mode: creates one Trader per ticker, monitors all ORB
-ranges simultaneously, and takes the first clean breakout.
+ranges simultaneously, and lets a PortfolioAllocator fill several breakouts
+at once under the shared risk, settlement and correlation caps.
 """
 
 from __future__ import annotations
@@ -16,6 +17,7 @@ from icc.alerts.base import AlertRouter
 from icc.alerts.ws_alert import WebSocketAlertChannel
 from icc.broker.lumibot_adapter import LumibotBrokerAdapter
 from icc.config import load_config
+from icc.core.latency import profiler as latency_profiler
 from icc.core.trader import Trader
 from icc.market.candle import Candle
 from icc.oms.manager import OrderManager
@@ -27,11 +29,12 @@ class ICCLumibotStrategy(Strategy):
     """Bridges Lumibot's lifecycle into ICC's Trader.on_candle().
 
     Lumibot drives the iteration loop (sleeptime = "1M" for 1-min bars).
-    Each iteration fetches the latest bar per ticker from yfinance, converts
-    to ICC Candle, and feeds into the appropriate Trader.
+    Each iteration fetches new bars per ticker from yfinance (in parallel,
+    incrementally, via BarFetcher) and feeds them into the appropriate Trader.
 
-    Multi-ticker: all tickers build ORB ranges simultaneously; the first
-    clean breakout wins (only one position at a time across all tickers).
+    Multi-ticker: all tickers build ORB ranges simultaneously; each
+    iteration's breakouts are ranked by research confidence and filled up to
+    risk.max_open_positions and the portfolio caps.
     """
 
     parameters = {
@@ -52,9 +55,9 @@ class ICCLumibotStrategy(Strategy):
             expiration=front_exp,
             multiplier=5,
         )
-        print(f"[ICC] MES contract expiration: {front_exp}", flush=True)
+        logger.info("MES contract expiration: %s", front_exp)
 
-        print(f"[ICC] initialize() self.parameters = {self.parameters}", flush=True)
+        logger.info("initialize() self.parameters = %s", self.parameters)
         event_bus = self.parameters.get("event_bus")
         instrument_type = self.parameters.get("instrument_type", "FUTURES")
         option_underlying = self.parameters.get("option_underlying", "MES")
@@ -75,7 +78,7 @@ class ICCLumibotStrategy(Strategy):
             self._tickers = [option_underlying]
 
         self._multi_ticker = len(self._tickers) > 1
-        print(f"[ICC] {'Multi' if self._multi_ticker else 'Single'}-ticker mode: {self._tickers}", flush=True)
+        logger.info("%s-ticker mode: %s", "Multi" if self._multi_ticker else "Single", self._tickers)
 
         # Shared components
         broker_adapter = LumibotBrokerAdapter(self)
@@ -87,6 +90,9 @@ class ICCLumibotStrategy(Strategy):
         from icc.db.engine import get_session as get_db_session, init_db
         init_db(config.db_url)
         db_session = get_db_session(config.db_url)
+        # Trade/risk writes go through a write-behind queue off the trading thread
+        from icc.db.write_behind import start_write_behind
+        self._persistence = start_write_behind(config.db_url, config.persistence)
         session_id = date.today().strftime("%Y%m%d") + "-" + uuid4().hex[:8]
 
         # Settlement tracker (shared across tickers — one $500 account)
@@ -119,11 +125,17 @@ class ICCLumibotStrategy(Strategy):
             config.risk,
             settlement_tracker=settlement_tracker,
             db_session=db_session,
+            persistence=self._persistence,
         )
 
+        # One position book + allocator across tickers (positions keyed by ticker)
+        from icc.core.portfolio import PortfolioAllocator
+        from icc.oms.position_tracker import PositionBook
+        self._book = PositionBook()
+        self._allocator = PortfolioAllocator(config.portfolio, self._book)
+
         # Create one Trader per ticker
         self._traders: dict[str, Trader] = {}
-        self._active_ticker: str | None = None
 
         for ticker in self._tickers:
             ticker_oms = OrderManager(broker_adapter)
@@ -167,21 +179,58 @@ class ICCLumibotStrategy(Strategy):
                 research_agent=research_agent,
                 option_chain_resolver=option_chain_resolver,
                 shared_risk_engine=shared_risk,
+                position_book=self._book,
+                persistence=self._persistence,
             )
+            if self._multi_ticker:
+                self._allocator.register(ticker, trader)
 
             # Wire live premium feed for options
             if instrument_type == "OPTIONS":
                 trader._premium_feed = self._get_live_option_premium
 
             self._traders[ticker] = trader
-            print(f"[ICC] Trader created for {ticker}", flush=True)
+            logger.info("Trader created for %s", ticker)
+
+        # Parallel, incremental bar fetching for multi-ticker mode
+        from icc.market.bar_fetcher import BarFetcher
+        self._bar_fetcher = BarFetcher(
+            max_workers=config.feed.fetch_workers,
+            timeout_sec=config.feed.fetch_timeout_sec,
+        )
+
+        # Sub-second quote polling for open positions (exits between bars),
+        # from the broker's real-time quotes only
+        self._position_monitor = None
+        if config.position_monitor.enabled:
+            from icc.core.position_monitor import PositionMonitor
+            self._position_monitor = PositionMonitor(
+                self._traders,
+                quote_fn=self._get_broker_quote,
+                premium_fn=self._get_broker_option_premium,
+                interval_sec=config.position_monitor.interval_sec,
+            )
+            self._position_monitor.start()
+
+        # Versioned, audited parameter updates (REST/CLI and edited YAML)
+        from icc.core.live_params import LiveParams
+        self.params = LiveParams(self._traders, persistence=self._persistence,
+                                 session_id=session_id)
+        self._config_watcher = None
+        if config.hot_reload.enabled:
+            from icc.core.config_watcher import ConfigWatcher
+            self._config_watcher = ConfigWatcher(
+                "live", self._traders, interval_sec=config.hot_reload.interval_sec,
+                params=self.params,
+            )
+            self._config_watcher.start()
 
         # Backward compat: icc_trader points to first ticker's trader (updated dynamically)
         self.icc_trader = self._traders[self._tickers[0]]
 
         self._option_chain_tested = instrument_type != "OPTIONS"
         self._nextorderid_patched = False
-        print(f"[ICC] ICCLumibotStrategy initialized — {len(self._tickers)} ticker(s)", flush=True)
+        logger.info("ICCLumibotStrategy initialized — %d ticker(s)", len(self._tickers))
 
     # ---- Candle fetching ----
 
@@ -225,7 +274,7 @@ class ICCLumibotStrategy(Strategy):
 
         # Fallback: yfinance SPY 1-min bars
         if not getattr(self, '_yf_fallback_logged', False):
-            print("[ICC] MES data unavailable, falling back to yfinance SPY candles", flush=True)
+            logger.warning("MES data unavailable, falling back to yfinance SPY candles")
             self._yf_fallback_logged = True
         return self._get_candle_for("SPY")
 
@@ -236,9 +285,9 @@ class ICCLumibotStrategy(Strategy):
         try:
             if hasattr(self.broker, 'ib') and self.broker.ib is not None:
                 self.broker.ib.reqMarketDataType(3)
-                print("[ICC] Enabled delayed market data (type 3) for unsubscribed instruments", flush=True)
+                logger.info("Enabled delayed market data (type 3) for unsubscribed instruments")
         except Exception as e:
-            print(f"[ICC] Failed to enable delayed data: {e}", flush=True)
+            logger.warning("Failed to enable delayed data: %s", e)
 
     def _test_option_chain(self) -> None:
         """One-time diagnostic: test option chain access for the first ticker."""
@@ -252,15 +301,15 @@ class ICCLumibotStrategy(Strategy):
             return
         try:
             exps = resolver._provider.get_option_expirations(first_ticker)
-            print(f"[ICC] Option chain test: {len(exps)} expirations for {first_ticker}", flush=True)
+            logger.info("Option chain test: %d expirations for %s", len(exps), first_ticker)
             if exps:
-                print(f"[ICC]   Nearest: {exps[:5]}", flush=True)
+                logger.info("  Nearest: %s", exps[:5])
                 price = resolver._provider.get_underlying_price(first_ticker)
-                print(f"[ICC]   {first_ticker} price: {price}", flush=True)
+                logger.info("  %s price: %s", first_ticker, price)
             else:
-                print("[ICC]   WARNING: No expirations — option trading will fail!", flush=True)
+                logger.warning("No expirations for %s — option trading will fail!", first_ticker)
         except Exception as e:
-            print(f"[ICC]   Option chain test error: {e}", flush=True)
+            logger.warning("Option chain test error: %s", e)
 
     # ---- Order ID timeout patch ----
 
@@ -274,10 +323,10 @@ class ICCLumibotStrategy(Strategy):
         self._nextorderid_patched = True
 
         if not hasattr(self, 'broker') or self.broker is None:
-            print("[ICC] broker not yet available — skipping nextOrderId patch", flush=True)
+            logger.info("broker not yet available — skipping nextOrderId patch")
             return
         if not hasattr(self.broker, 'ib') or self.broker.ib is None:
-            print("[ICC] broker.ib not yet available — skipping nextOrderId patch", flush=True)
+            logger.info("broker.ib not yet available — skipping nextOrderId patch")
             return
 
         ib_app = self.broker.ib
@@ -312,7 +361,7 @@ class ICCLumibotStrategy(Strategy):
         ib_app.nextOrderId = nextOrderId_with_timeout
         # Also patch the class to catch any other IBApp instances
         type(ib_app).nextOrderId = lambda self_: nextOrderId_with_timeout()
-        print("[ICC] Patched IBApp.nextOrderId with 30s timeout", flush=True)
+        logger.info("Patched IBApp.nextOrderId with 30s timeout")
 
     # ---- Main trading loop ----
 
@@ -346,43 +395,38 @@ class ICCLumibotStrategy(Strategy):
             candle = self._get_candle_for(ticker)
         if candle is None:
             return
-        print(f"[ICC] [{ticker}] Candle: {candle.timestamp} O={candle.open:.2f} H={candle.high:.2f} L={candle.low:.2f} C={candle.close:.2f} V={candle.volume}", flush=True)
+        logger.info("[%s] Candle: %s O=%.2f H=%.2f L=%.2f C=%.2f V=%s", ticker, candle.timestamp,
+                    candle.open, candle.high, candle.low, candle.close, candle.volume)
         self.icc_trader.on_candle(candle)
 
     def _multi_ticker_iteration(self):
-        """Multi-ticker flow: feed all tickers, first breakout wins."""
+        """Multi-ticker flow: feed all tickers, then allocate queued entries."""
+        bars = self._bar_fetcher.fetch(self._tickers)
         for ticker in self._tickers:
-            candle = self._get_candle_for(ticker)
-            if candle is None:
-                continue
+            # Exits and signal evaluation run inline; entries are queued
+            for candle in bars.get(ticker, []):
+                self._traders[ticker].on_candle(candle)
 
-            trader = self._traders[ticker]
+        for ticker in self._allocator.allocate():
+            self.icc_trader = self._traders[ticker]  # point snapshot to latest entry
+            logger.info("MULTI: %s entered position (%d open)", ticker,
+                        self._book.open_position_count)
 
-            if self._active_ticker is None:
-                # No position across any ticker — all can evaluate
-                trader.on_candle(candle)
-                if not trader.positions.is_flat:
-                    self._active_ticker = ticker
-                    self.icc_trader = trader  # point snapshot to active
-                    print(f"[ICC] MULTI: {ticker} entered position — other tickers locked", flush=True)
-                    break  # skip remaining tickers this iteration
-            elif self._active_ticker == ticker:
-                # This ticker has the active position — manage it
-                trader.on_candle(candle)
-                if trader.positions.is_flat:
-                    self._active_ticker = None
-                    self.icc_trader = self._traders[self._tickers[0]]
-                    print(f"[ICC] MULTI: {ticker} position closed — all tickers unlocked", flush=True)
-            else:
-                # Another ticker holds the position — just buffer candles
-                # so ORB range building continues
-                trader.buffer.append(candle)
+        # Keep the snapshot on an open position while any remain
+        if self.icc_trader.positions.is_flat:
+            active = self._active_tickers()
+            self.icc_trader = self._traders[active[0] if active else self._tickers[0]]
 
         # Log ORB state across tickers periodically
-        if not getattr(self, '_orb_state_logged_bar', 0) % 5:
+        if not getattr(self, '_orb_state_logged_bar', 0) % 5 and logger.isEnabledFor(logging.INFO):
             self._log_orb_state()
+            self._log_fetch_latency()
         self._orb_state_logged_bar = getattr(self, '_orb_state_logged_bar', 0) + 1
 
+    def _active_tickers(self) -> list[str]:
+        """Tickers currently holding a position, in configured order."""
+        return [t for t in self._tickers if not self._traders[t].positions.is_flat]
+
     def _log_orb_state(self):
         """Log ORB range state for all tickers."""
         from icc.core.orb_strategy import ORBStrategyEngine
@@ -399,18 +443,32 @@ class ICCLumibotStrategy(Strategy):
                 else:
                     parts.append(f"{ticker}[{state}]")
         if parts:
-            active = f" active={self._active_ticker}" if self._active_ticker else ""
-            print(f"[ICC] ORB ranges: {' | '.join(parts)}{active}", flush=True)
+            open_tickers = self._active_tickers()
+            active = f" active={','.join(open_tickers)}" if open_tickers else ""
+            logger.info("ORB ranges: %s%s", " | ".join(parts), active)
+
+    def _log_fetch_latency(self):
+        """Log per-ticker bar fetch latency."""
+        stats = self._bar_fetcher.get_latency_stats()
+        if stats:
+            parts = [f"{t}={s['last_ms']:.0f}ms(avg {s['avg_ms']:.0f})"
+                     for t, s in stats.items()]
+            logger.info("Fetch latency: %s", " | ".join(parts))
 
     # ---- Lifecycle ----
 
     def on_abrupt_closing(self):
         logger.warning("Lumibot abrupt closing — flattening positions")
-        for ticker, trader in self._traders.items():
-            if not trader.positions.is_flat:
-                last = trader.buffer.last
-                if last:
-                    trader._exit_position(last.close, "emergency_exit")
+        for trader in self._traders.values():
+            trader.flatten(None, "emergency_exit")
+        self._bar_fetcher.close()
+        if self._position_monitor is not None:
+            self._position_monitor.stop()
+        if self._config_watcher is not None:
+            self._config_watcher.stop()
+        if self._persistence is not None:
+            self._persistence.stop()  # commit the emergency exits before exiting
+        latency_profiler.log_summary(logger)
 
     def flatten_positions(self):
         """Flatten all positions at broker level via Lumibot sell_all."""
@@ -420,16 +478,26 @@ class ICCLumibotStrategy(Strategy):
         except Exception as e:
             logger.error("Error in sell_all: %s", e)
         # Flatten ICC internal positions across all tickers
-        for ticker, trader in self._traders.items():
-            if not trader.positions.is_flat:
-                last = trader.buffer.last
-                if last:
-                    trader._exit_position(last.close, "session_flatten")
+        for trader in self._traders.values():
+            trader.flatten(None, "session_flatten")
 
     def on_bot_crash(self, error):
         logger.critical("Lumibot bot crash: %s", error)
         self.on_abrupt_closing()
 
+    def _get_broker_quote(self, ticker: str) -> float | None:
+        """Last underlying price from the broker's market data (position monitor)."""
+        try:
+            if ticker == "MES" and self.parameters.get("instrument_type") == "FUTURES":
+                price = self.get_last_price(self.asset, exchange="CME")
+            else:
+                from lumibot.entities import Asset
+                price = self.get_last_price(Asset(symbol=ticker, asset_type=Asset.AssetType.STOCK))
+        except Exception as e:
+            logger.debug("Broker quote for %s failed: %s", ticker, e)
+            return None
+        return float(price) if price is not None else None
+
     def _get_live_option_premium(self, contract) -> float | None:
         """Fetch option premium — yfinance first, IB fallback.
 
@@ -446,6 +514,10 @@ class ICCLumibotStrategy(Strategy):
             return yf_price
 
         # Fallback: IB direct quote
+        return self._get_broker_option_premium(contract)
+
+    def _get_broker_option_premium(self, contract) -> float | None:
+        """Option premium from the broker's market data only."""
         try:
             from lumibot.entities import Asset
 
@@ -471,7 +543,13 @@ class ICCLumibotStrategy(Strategy):
         """Return snapshot covering all tickers."""
         # Primary snapshot from active trader
         snapshot = self.icc_trader.get_snapshot()
-        snapshot["active_ticker"] = self._active_ticker
+        active = self._active_tickers()
+        snapshot["active_ticker"] = active[0] if active else None
+        snapshot["active_tickers"] = active
+        snapshot["portfolio"] = self._allocator.get_snapshot()
+        snapshot["fetch_latency"] = self._bar_fetcher.get_latency_stats()
+        if self._position_monitor is not None:
+            snapshot["position_monitor"] = self._position_monitor.get_stats()
         snapshot["tickers"] = self._tickers
         snapshot["multi_ticker"] = self._multi_ticker
 
@@ -480,21 +558,22 @@ class ICCLumibotStrategy(Strategy):
         ticker_states = {}
         for ticker in self._tickers:
             trader = self._traders[ticker]
-            strat = trader.strategy
-            ts: dict = {
-                "fsm_state": trader.fsm.state.value,
-                "candle_count": len(trader.buffer),
-                "is_flat": trader.positions.is_flat,
-            }
-            if isinstance(strat, ORBStrategyEngine):
-                ts["range_high"] = strat._range_high
-                ts["range_low"] = strat._range_low
-                ts["range_height"] = strat.range_height
-                ts["armed_bars"] = strat._armed_bar_count
-                ts["trade_taken"] = strat._trade_taken
-            last = trader.buffer.last
-            if last:
-                ts["last_price"] = last.close
+            with trader._lock:  # consistent with the trading thread's candle
+                strat = trader.strategy
+                ts: dict = {
+                    "fsm_state": trader.fsm.state.value,
+                    "candle_count": len(trader.buffer),
+                    "is_flat": trader.positions.is_flat,
+                }
+                if isinstance(strat, ORBStrategyEngine):
+                    ts["range_high"] = strat._range_high
+                    ts["range_low"] = strat._range_low
+                    ts["range_height"] = strat.range_height
+                    ts["armed_bars"] = strat._armed_bar_count
+                    ts["trade_taken"] = strat._trade_taken
+                last = trader.buffer.last
+                if last:
+                    ts["last_price"] = last.close
             ticker_states[ticker] = ts
         snapshot["ticker_states"] = ticker_states
         return snapshot
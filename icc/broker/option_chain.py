@@ -4,14 +4,20 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
+from functools import cache
 from datetime import date, datetime, timedelta
 from typing import Protocol, runtime_checkable
 
-import pytz
-
 logger = logging.getLogger(__name__)
 
-_ET = pytz.timezone("US/Eastern")
+
+@cache
+def _eastern():
+    """US/Eastern tzinfo; pytz is imported on first use, not with the module."""
+    import pytz
+
+    return pytz.timezone("US/Eastern")
+
 
 # Cache yfinance Ticker to avoid repeated instantiation
 _yf_ticker_cache: dict[str, object] = {}
@@ -491,10 +497,11 @@ class OptionChainResolver:
         # 2b. Afternoon 0DTE override: avoid catastrophic theta decay
         #     After noon ET, upgrade 0DTE to the next available expiration.
         if expiration == now.date():
+            et = _eastern()
             try:
-                now_et = now.astimezone(_ET) if now.tzinfo else _ET.localize(now)
+                now_et = now.astimezone(et) if now.tzinfo else et.localize(now)
             except Exception:
-                now_et = datetime.now(_ET)
+                now_et = datetime.now(et)
             if now_et.hour >= 12:
                 future_exps = sorted(
                     e for e in self._provider.get_option_expirations(self._underlying)
@@ -1,4 +1,4 @@
-"""Typer CLI: backtest, paper, trades, init-db, import-data, config-show."""
+"""Typer CLI: backtest, paper, trades, init-db, import-data, config-show, params-set."""
 
 from __future__ import annotations
 
@@ -10,15 +10,26 @@ from pathlib import Path
 from typing import Optional
 
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
 app = typer.Typer(
     name="icc",
     help="ICC MES AutoTrader — FSM-driven automated trading for MES futures",
 )
-console = Console()
+
+
+class _LazyConsole:
+    """rich Console created on first use, so importing the CLI stays cheap."""
+
+    _console = None
+
+    def __getattr__(self, name: str):
+        if _LazyConsole._console is None:
+            from rich.console import Console
+            _LazyConsole._console = Console()
+        return getattr(_LazyConsole._console, name)
+
+
+console = _LazyConsole()
 
 # PID lock file to prevent duplicate auto-trader instances
 _PID_FILE = Path(__file__).resolve().parent.parent / ".icc_autotrader.pid"
@@ -66,6 +77,15 @@ def _kill_existing_process() -> None:
     _PID_FILE.unlink(missing_ok=True)
 
 
+def _setup_logging(env: str | None = "live") -> None:
+    """Route icc.* logging through the queued console/file pipeline."""
+    from icc.config import load_config
+    from icc.logging_config import setup_logging
+
+    config = load_config(env)
+    setup_logging(log_dir=config.log_dir, level=config.log_level, json_files=config.log_json)
+
+
 def _write_pid() -> None:
     """Write current process PID to the lock file."""
     _PID_FILE.write_text(str(os.getpid()))
@@ -82,13 +102,21 @@ def backtest(
     start: Optional[str] = typer.Option(None, "--start", help="Start date (YYYY-MM-DD)"),
     end: Optional[str] = typer.Option(None, "--end", help="End date (YYYY-MM-DD)"),
     env: str = typer.Option("backtest", "--env", "-e", help="Environment config to use"),
+    research: bool = typer.Option(False, "--research", help="Apply the research confidence gate"),
+    latency: bool = typer.Option(False, "--latency", help="Profile on_candle stages and print them"),
 ):
     """Run a backtest on historical data."""
+    from rich.table import Table
+
     from icc.backtest.data_loader import load_candles_csv
     from icc.backtest.engine import BacktestEngine
     from icc.config import load_config
 
     config = load_config(env)
+    if research:
+        config.backtest.research_gate = True
+    if latency:
+        config.metrics.latency = True
     console.print(f"[bold]Loading candles from {data_file}...[/bold]")
 
     candles = load_candles_csv(data_file)
@@ -114,10 +142,18 @@ def backtest(
         table.add_row(k.replace("_", " ").title(), str(v))
     console.print(table)
 
+    if config.metrics.latency:
+        from icc.core.latency import profiler
+
+        console.print("[bold]on_candle latency by stage[/bold]")
+        console.print(profiler.format_table(), markup=False, highlight=False)
+
 
 @app.command()
 def paper():
     """Start paper trading session (placeholder)."""
+    from rich.panel import Panel
+
     from icc.config import load_config
 
     config = load_config("paper")
@@ -135,6 +171,8 @@ def trades(
     limit: int = typer.Option(20, "--limit", "-n", help="Number of trades to show"),
 ):
     """Show recent trades from the database."""
+    from rich.table import Table
+
     from icc.config import load_config
     from icc.db.engine import get_session
 
@@ -207,11 +245,82 @@ def import_data(
     db.close()
 
 
+@app.command("config-compile")
+def config_compile(
+    envs: list[str] = typer.Argument(None, help="Environments to compile (default: all)"),
+):
+    """Write validated config snapshots for fast startup."""
+    from icc.config import CONFIGS_DIR, compile_config
+
+    names = envs or sorted(p.stem for p in (CONFIGS_DIR / "environments").glob("*.yaml"))
+    for env in names:
+        path = compile_config(env)
+        console.print(f"[green]Compiled[/green] {env} -> {path}")
+
+
+def _parse_assignments(assignments: list[str]) -> dict:
+    """``section.field=value`` pairs -> ``{section: {field: value}}``; values parsed as YAML."""
+    import yaml
+
+    patch: dict = {}
+    for item in assignments:
+        key, sep, raw = item.partition("=")
+        section, dot, name = key.strip().partition(".")
+        if not sep or not dot or not section or not name:
+            raise typer.BadParameter(f"expected section.field=value, got {item!r}")
+        patch.setdefault(section, {})[name] = yaml.safe_load(raw)
+    return patch
+
+
+@app.command("params-show")
+def params_show(
+    url: str = typer.Option("http://127.0.0.1:8000", "--url", help="Dashboard base URL"),
+):
+    """Show the running session's live-updatable parameters and their version."""
+    import httpx
+    from rich.panel import Panel
+
+    from icc.serialization import dumps
+
+    resp = httpx.get(f"{url}/api/params", timeout=10.0)
+    data = resp.json()
+    if resp.status_code != 200:
+        console.print(f"[red]{data.get('error', resp.text)}[/red]")
+        raise typer.Exit(1)
+    console.print(Panel(dumps(data["params"]), title=f"Parameters v{data['version']}",
+                        border_style="blue"))
+
+
+@app.command("params-set")
+def params_set(
+    assignments: list[str] = typer.Argument(..., help="section.field=value, e.g. orb.min_range_pct=0.25"),
+    url: str = typer.Option("http://127.0.0.1:8000", "--url", help="Dashboard base URL"),
+):
+    """Update strategy/orb/risk/options parameters of the running session."""
+    import httpx
+
+    patch = _parse_assignments(assignments)
+    resp = httpx.put(f"{url}/api/params", json=patch, timeout=10.0)
+    data = resp.json()
+    if resp.status_code != 200:
+        console.print(f"[red]Rejected:[/red] {data.get('error', resp.text)}")
+        raise typer.Exit(1)
+    if not data.get("changes"):
+        console.print(f"[dim]No change (v{data['version']})[/dim]")
+        return
+    for section, fields in data["changes"].items():
+        for name, (old, new) in fields.items():
+            console.print(f"{section}.{name}: {old} -> [bold]{new}[/bold]")
+    console.print(f"[green]Applied as v{data['version']}[/green]")
+
+
 @app.command("config-show")
 def config_show(
     env: str = typer.Argument("backtest", help="Environment to show config for"),
 ):
     """Display the merged configuration for an environment."""
+    from rich.panel import Panel
+
     from icc.config import load_config
 
     config = load_config(env)
@@ -243,6 +352,9 @@ def live(
 
     ticker_list = [t.strip() for t in tickers.split(",") if t.strip()] or None
 
+    if not auto:
+        _setup_logging("live")
+
     if auto:
         _run_auto_live(headless=headless, web_port=web_port,
                        instrument_type=instrument, option_underlying=underlying,
@@ -251,6 +363,8 @@ def live(
         _run_headless_live()
     else:
         import uvicorn
+        from rich.panel import Panel
+
         console.print(Panel(
             f"Starting ICC Live Trading\n"
             f"IB Gateway: [bold]{ip}:{port}[/bold] (client {client_id})\n"
@@ -278,6 +392,8 @@ def _run_auto_live(headless: bool = False, web_port: int = 8000,
     import signal
     import threading
 
+    from rich.panel import Panel
+
     from icc.config import load_config
     from icc.core.events import EventBus, EventType
     from icc.core.scheduler import SessionScheduler
@@ -286,7 +402,7 @@ def _run_auto_live(headless: bool = False, web_port: int = 8000,
     from icc.web.trading_session import TradingSession
 
     config = load_config("live")
-    setup_logging(log_dir=config.log_dir, level=config.log_level)
+    setup_logging(log_dir=config.log_dir, level=config.log_level, json_files=config.log_json)
 
     event_bus = EventBus()
     session = TradingSession(event_bus)
@@ -379,6 +495,8 @@ def _run_headless_live():
     import signal
     import threading
 
+    from rich.panel import Panel
+
     from icc.core.events import EventBus, EventType
     from icc.web.trading_session import TradingSession
 
@@ -429,6 +547,9 @@ def web(
 ):
     """Start the web dashboard server."""
     import uvicorn
+    from rich.panel import Panel
+
+    _setup_logging(None)
 
     console.print(Panel(
         f"Starting ICC Web Dashboard at [bold]http://{host}:{port}[/bold]\n"
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
+import logging
+import os
+import threading
 from pathlib import Path
 from typing import Optional
 
-import yaml
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -32,6 +35,8 @@ from icc.constants import (
     CONTINUATION_VOLUME_PERIOD,
 )
 
+logger = logging.getLogger(__name__)
+
 CONFIGS_DIR = Path(__file__).resolve().parent.parent / "configs"
 
 
@@ -66,6 +71,9 @@ class RiskConfig(BaseModel):
     large_loss_threshold: float = 100.0  # Dollar amount that counts as a "large loss"
     large_loss_cooldown_seconds: int = 600  # 10-minute cooldown after large loss
     scratch_loss_threshold: float = 10.0  # Losses below this don't count toward consecutive_losses
+    futures_quantity: int = 1  # Contracts per futures entry
+    scale_out_quantity: int = 0  # Contracts to take off at target 1 (0 = no scale-out)
+    scale_out_target_pct: float = 0.5  # Target 1 as a fraction of the entry->target distance
 
 
 class BrokerConfig(BaseModel):
@@ -154,6 +162,61 @@ class ORBConfig(BaseModel):
     trail_range_pct: float = 0.5
 
 
+class PortfolioConfig(BaseModel):
+    # Multi-ticker allocation. Concurrent positions are capped by risk.max_open_positions.
+    max_gross_exposure: float = 0.0  # Dollars of open notional across tickers (0 = no cap)
+    max_premium_budget: float = 0.0  # Dollars of open option premium across tickers (0 = no cap)
+    correlation_lookback: int = 30  # 1-min returns used for pairwise correlation
+    correlation_threshold: float = 0.8  # Return correlation at or above this counts as correlated
+    max_correlated_positions: int = 1  # Same-direction correlated positions allowed at once
+
+
+class BacktestConfig(BaseModel):
+    fill_model_enabled: bool = False  # False = legacy fills (stop price +/- slippage, stop-first)
+    intrabar_path: str = "OHLC"  # OHLC, OLHC, BROWNIAN
+    fill_seed: int = 0  # seeds the per-bar Brownian bridge
+    max_volume_participation: float = 0.10  # max fraction of bar volume one order may take
+    slippage_impact_ticks: float = 2.0  # extra ticks when an order equals the whole bar volume
+    max_slippage_ticks: int = 8
+    research_gate: bool = False  # Apply the research confidence gate from precomputed series
+
+
+class FeedConfig(BaseModel):
+    # Live 1-min bar fetching (multi-ticker Lumibot loop)
+    fetch_workers: int = 4  # Concurrent per-ticker history requests
+    fetch_timeout_sec: float = 20.0  # Give up on a ticker's fetch after this long
+
+
+class PositionMonitorConfig(BaseModel):
+    # Quote-driven exits between completed candles (live multi/single-ticker loop).
+    # Quotes come from the broker's market data only (IB streaming quotes need a
+    # real-time subscription for the underlying and its options), so it is off
+    # unless that is in place; delayed yfinance quotes are never polled.
+    enabled: bool = False
+    interval_sec: float = 0.25  # Quote polling cadence per open position
+
+
+class PersistenceConfig(BaseModel):
+    # Write-behind DB persistence for live/simulated sessions
+    write_behind: bool = True  # Queue trade/risk writes off the trading thread
+    journal: bool = True  # Crash-safe journal next to the DB file (<db>.wbq)
+    fsync_journal: bool = False  # Also survive power loss (fsync per write)
+    batch_size: int = 200  # Max queued mutations per commit
+    flush_interval_sec: float = 0.05  # Worker poll interval when idle
+    max_attempts: int = 3  # Failed batch commits before ops are retried singly / dead-lettered
+
+
+class MetricsConfig(BaseModel):
+    # In-process metrics for the trading process
+    latency: bool = False  # Per-stage on_candle latency histograms (icc.core.latency)
+
+
+class HotReloadConfig(BaseModel):
+    # Push edited strategy/orb/risk YAML into running traders (icc.core.config_watcher)
+    enabled: bool = False
+    interval_sec: float = 2.0  # How often the config files' mtimes are checked
+
+
 class AlertConfig(BaseModel):
     console_enabled: bool = True
     email_enabled: bool = False
@@ -176,6 +239,7 @@ class AppSettings(BaseSettings):
     db_url: str = "sqlite:///icc_trades.db"
     log_level: str = "INFO"
     log_dir: str = "logs"
+    log_json: bool = True  # JSON-lines file logs; console output stays plain text
 
     strategy_name: str = "ICC"  # "ICC" or "ORB"
 
@@ -188,6 +252,13 @@ class AppSettings(BaseSettings):
     research: ResearchConfig = Field(default_factory=ResearchConfig)
     options: OptionsConfig = Field(default_factory=OptionsConfig)
     orb: ORBConfig = Field(default_factory=ORBConfig)
+    backtest: BacktestConfig = Field(default_factory=BacktestConfig)
+    portfolio: PortfolioConfig = Field(default_factory=PortfolioConfig)
+    feed: FeedConfig = Field(default_factory=FeedConfig)
+    position_monitor: PositionMonitorConfig = Field(default_factory=PositionMonitorConfig)
+    persistence: PersistenceConfig = Field(default_factory=PersistenceConfig)
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig)
+    hot_reload: HotReloadConfig = Field(default_factory=HotReloadConfig)
 
 
 def _deep_merge(base: dict, override: dict) -> dict:
@@ -204,26 +275,107 @@ def _deep_merge(base: dict, override: dict) -> dict:
 def _load_yaml(path: Path) -> dict:
     if not path.exists():
         return {}
+    import yaml
+
     with open(path) as f:
         return yaml.safe_load(f) or {}
 
 
-def load_config(env: Optional[str] = None) -> AppSettings:
-    """Load config by merging: defaults < strategy_default.yaml < risk_default.yaml < options_default.yaml < environment yaml."""
-    strategy_yaml = _load_yaml(CONFIGS_DIR / "strategy_default.yaml")
-    risk_yaml = _load_yaml(CONFIGS_DIR / "risk_default.yaml")
-    options_yaml = _load_yaml(CONFIGS_DIR / "options_default.yaml")
-    orb_yaml = _load_yaml(CONFIGS_DIR / "orb_default.yaml")
+# Defaults layered under the environment YAML, in merge order
+_DEFAULT_SECTIONS = (
+    ("strategy", "strategy_default.yaml"),
+    ("risk", "risk_default.yaml"),
+    ("options", "options_default.yaml"),
+    ("orb", "orb_default.yaml"),
+)
 
+SNAPSHOT_DIR = CONFIGS_DIR / ".compiled"
+SNAPSHOT_VERSION = 1
+
+Signature = tuple[tuple[str, int], ...]
+
+
+class _CachedConfig:
+    __slots__ = ("settings", "sources", "signature")
+
+    def __init__(self, settings: AppSettings, sources: tuple[Path, ...]) -> None:
+        self.settings = settings
+        self.sources = sources
+        self.signature = source_signature(sources)
+
+
+# Validated settings per (env, ICC_* environment variables)
+_config_cache: dict[tuple, _CachedConfig] = {}
+_config_cache_lock = threading.Lock()
+
+
+def _env_key() -> tuple[tuple[str, str], ...]:
+    """The ICC_* environment variables, which AppSettings reads as overrides."""
+    return tuple(sorted((k, v) for k, v in os.environ.items() if k.upper().startswith("ICC_")))
+
+
+def _env_digest() -> str:
+    """Hash of ``_env_key()``; snapshots record it instead of the values (secrets)."""
+    return hashlib.sha256(repr(_env_key()).encode()).hexdigest()
+
+
+def config_sources(env: str) -> tuple[Path, ...]:
+    """Files that feed ``load_config(env)``, in merge order (.env last)."""
+    return (
+        *(CONFIGS_DIR / name for _, name in _DEFAULT_SECTIONS),
+        CONFIGS_DIR / "environments" / f"{env}.yaml",
+        Path(".env").resolve(),
+    )
+
+
+def source_signature(sources: tuple[Path, ...]) -> Signature:
+    """(path, mtime_ns) per source, -1 for a missing file."""
+    sig = []
+    for path in sources:
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            mtime = -1
+        sig.append((str(path), mtime))
+    return tuple(sig)
+
+
+def load_config(env: Optional[str] = None) -> AppSettings:
+    """Merged config for ``env``; the YAML files are read and validated once.
+
+    Later calls with the same ``env`` and ICC_* environment return a deep
+    copy of the cached settings, so callers may mutate what they get. The
+    cache entry is rebuilt when any source file's mtime changes. On a
+    miss, a compiled snapshot (``compile_config``) whose sources are
+    unchanged is used instead of the YAML files.
+    """
+    key = (env, _env_key())
+    entry = _config_cache.get(key)
+    if entry is None or source_signature(entry.sources) != entry.signature:
+        with _config_cache_lock:
+            entry = _config_cache.get(key)
+            if entry is None or source_signature(entry.sources) != entry.signature:
+                entry = (_load_snapshot(env) if env else None) or _CachedConfig(*_build_config(env))
+                _config_cache[key] = entry
+    return entry.settings.model_copy(deep=True)
+
+
+def clear_config_cache() -> None:
+    """Drop cached settings so the next load_config re-reads the YAML files."""
+    with _config_cache_lock:
+        _config_cache.clear()
+
+
+def _build_config(env: Optional[str]) -> tuple[AppSettings, tuple[Path, ...]]:
+    """Merge: defaults < strategy_default.yaml < risk_default.yaml < options_default.yaml < environment yaml.
+
+    Returns the settings and the files they were built from.
+    """
     merged: dict = {}
-    if strategy_yaml:
-        merged = _deep_merge(merged, {"strategy": strategy_yaml})
-    if risk_yaml:
-        merged = _deep_merge(merged, {"risk": risk_yaml})
-    if options_yaml:
-        merged = _deep_merge(merged, {"options": options_yaml})
-    if orb_yaml:
-        merged = _deep_merge(merged, {"orb": orb_yaml})
+    for section, name in _DEFAULT_SECTIONS:
+        data = _load_yaml(CONFIGS_DIR / name)
+        if data:
+            merged = _deep_merge(merged, {section: data})
 
     settings = AppSettings()
     target_env = env or settings.env.value
@@ -238,4 +390,60 @@ def load_config(env: Optional[str] = None) -> AppSettings:
     if env:
         settings.env = Environment(env)
 
-    return settings
+    return settings, config_sources(target_env)
+
+
+# --- Compiled snapshots ---------------------------------------------------------
+
+def snapshot_path(env: str) -> Path:
+    return SNAPSHOT_DIR / f"{env}.json"
+
+
+def compile_config(env: str, path: Optional[Path] = None) -> Path:
+    """Write the validated settings for ``env`` to a snapshot file.
+
+    The snapshot holds the resolved values plus the mtimes of every source
+    and a digest of the ICC_* environment. ``load_config`` uses it only
+    while all of those still match, so a stale snapshot is ignored, never
+    served. It may contain credentials, so the file is owner-only.
+    """
+    from icc import serialization
+
+    settings, sources = _build_config(env)
+    path = path or snapshot_path(env)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "env": env,
+        "env_digest": _env_digest(),
+        "sources": [list(item) for item in source_signature(sources)],
+        "settings": settings.model_dump(mode="json"),
+    }
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(serialization.dumps_bytes(data))
+    tmp.chmod(0o600)
+    tmp.replace(path)
+    return path
+
+
+def _load_snapshot(env: str, path: Optional[Path] = None) -> Optional[_CachedConfig]:
+    path = path or snapshot_path(env)
+    try:
+        raw = path.read_bytes()
+    except OSError:
+        return None
+    from icc import serialization
+
+    try:
+        data = serialization.loads(raw)
+        if (data.get("version") != SNAPSHOT_VERSION or data.get("env") != env
+                or data.get("env_digest") != _env_digest()):
+            return None
+        sources = tuple(Path(p) for p, _ in data["sources"])
+        if source_signature(sources) != tuple((p, m) for p, m in data["sources"]):
+            return None
+        settings = AppSettings.model_validate(data["settings"])
+    except Exception as e:
+        logger.warning("Ignoring config snapshot %s: %s", path, e)
+        return None
+    return _CachedConfig(settings, sources)
@@ -67,6 +67,13 @@ class ExpirationMode(str, Enum):
     MONTHLY = "MONTHLY"
 
 
+class IntrabarPath(str, Enum):
+    """Assumed order in which a bar visits its high and low (backtest fills)."""
+    OHLC = "OHLC"          # open -> high -> low -> close
+    OLHC = "OLHC"          # open -> low -> high -> close
+    BROWNIAN = "BROWNIAN"  # order drawn from a Brownian bridge seeded per bar
+
+
 # Option contract specs per underlying
 OPTION_SPECS = {
     "MES": {"multiplier": 5.0, "strike_increment": 5.0, "exchange": "CME"},
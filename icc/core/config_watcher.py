@@ -0,0 +1,97 @@
+"""ConfigWatcher — hot reload of strategy and risk parameters.
+
+Polls the mtimes of the files behind ``load_config(env)``. When one
+changes, the config is reloaded (and validated) and any changed
+reloadable section is applied through the session's LiveParams, which
+versions and audits it and swaps it into every running Trader between
+candles. Per-session overrides that live outside these sections
+(strategy_name, instrument type, underlying) are left alone.
+
+A file that fails to parse or validate is logged and skipped; traders keep
+their current parameters until the next good save.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import TYPE_CHECKING, Mapping, Optional
+
+from icc.config import AppSettings, Signature, config_sources, load_config, source_signature
+from icc.core.live_params import LiveParams
+
+if TYPE_CHECKING:
+    from icc.core.trader import Trader
+
+logger = logging.getLogger(__name__)
+
+RELOADABLE_SECTIONS = ("strategy", "orb", "risk")
+
+
+class ConfigWatcher:
+    """Watches one environment's config files and updates traders in place."""
+
+    def __init__(self, env: str, traders: Mapping[str, Trader], interval_sec: float = 2.0,
+                 sections: tuple[str, ...] = RELOADABLE_SECTIONS,
+                 params: Optional[LiveParams] = None) -> None:
+        self._env = env
+        self._params = params or LiveParams(traders)
+        self._interval = interval_sec
+        self._sections = sections
+        self._sources = config_sources(env)
+        self._signature: Signature = source_signature(self._sources)
+        self._current: AppSettings = load_config(env)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.reloads = 0
+        self.errors = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+        self._thread.start()
+        logger.info("Config watcher started for %s (%.1fs interval)", self._env, self._interval)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.check_once()
+
+    def check_once(self) -> list[str]:
+        """Reload if a source changed. Returns the sections pushed to traders."""
+        signature = source_signature(self._sources)
+        if signature == self._signature:
+            return []
+        self._signature = signature
+        try:
+            config = load_config(self._env)
+        except Exception as e:
+            self.errors += 1
+            logger.error("Config reload failed, keeping current parameters: %s", e)
+            return []
+        changed = [name for name in self._sections
+                   if getattr(config, name) != getattr(self._current, name)]
+        self._current = config
+        if not changed:
+            return []
+        patch = {name: getattr(config, name).model_dump() for name in changed}
+        try:
+            self._params.apply(patch, source=f"file:{self._env}")
+        except Exception as e:
+            self.errors += 1
+            logger.error("Config push failed, keeping current parameters: %s", e)
+            return []
+        self.reloads += 1
+        logger.info("Config reloaded from %s: %s", self._env, ", ".join(changed))
+        return changed
@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import queue
+import threading
 import time
-from dataclasses import dataclass, field
+from collections import Counter
+from dataclasses import dataclass, field, fields
+from datetime import datetime
 from enum import Enum, auto
-from typing import Any
+from typing import TYPE_CHECKING, Any, Union
+
+if TYPE_CHECKING:
+    from icc.market.candle import Candle
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +24,7 @@ class EventType(str, Enum):
     FSM_TRANSITION = "fsm_transition"
     ENTRY = "entry"
     EXIT = "exit"
+    SCALE_OUT = "scale_out"
     KILL_SWITCH = "kill_switch"
     RISK_VETO = "risk_veto"
     SNAPSHOT = "snapshot"
@@ -30,25 +38,161 @@ class EventType(str, Enum):
     SETTLEMENT_BLOCKED = "settlement_blocked"
 
 
+class EventPayload:
+    """Base for typed event payloads; dict-style reads keep old consumers working."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+@dataclass(frozen=True, slots=True)
+class CandlePayload(EventPayload):
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    symbol: str = "MES"
+
+    @classmethod
+    def from_candle(cls, candle: Candle) -> CandlePayload:
+        return cls(candle.timestamp, candle.open, candle.high, candle.low,
+                   candle.close, candle.volume, candle.symbol)
+
+
+@dataclass(frozen=True, slots=True)
+class EntryPayload(EventPayload):
+    side: str
+    entry_price: float
+    stop_price: float | None
+    target_price: float | None
+    option: dict[str, Any] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ExitPayload(EventPayload):
+    side: str
+    entry_price: float
+    exit_price: float
+    pnl: float
+    reason: str
+    daily_pnl: float
+    option: dict[str, Any] | None = None
+
+
+EventData = Union[dict[str, Any], EventPayload]
+
+
 @dataclass(frozen=True, slots=True)
 class TradingEvent:
     event_type: EventType
-    data: dict[str, Any] = field(default_factory=dict)
+    data: EventData = field(default_factory=dict)
     timestamp: float = field(default_factory=time.time)
+    _frame: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    def to_message(self) -> dict[str, Any]:
+        return {"type": self.event_type.value, "data": self.data, "ts": self.timestamp}
+
+    def encode(self) -> str:
+        """The WebSocket JSON frame for this event, encoded once and cached."""
+        frame = self._frame
+        if frame is None:
+            from icc.serialization import dumps
+            frame = dumps(self.to_message())
+            object.__setattr__(self, "_frame", frame)
+        return frame
 
 
 class EventBus:
-    """Thread-safe event queue bridging sync producer → async consumer."""
+    """Thread-safe event queue bridging sync producer → async consumer.
+
+    Without an event loop attached, events go to a ``queue.Queue`` that sync
+    consumers (headless CLI) ``drain``. Once ``attach_loop`` is called, emit
+    hands each event to the loop with ``call_soon_threadsafe`` and an async
+    consumer awaits ``get_batch``, which wakes as soon as an event arrives.
+    Events dropped on a full queue are counted per type.
+    """
 
     def __init__(self, maxsize: int = 1000) -> None:
+        self._maxsize = maxsize
         self._queue: queue.Queue[TradingEvent] = queue.Queue(maxsize=maxsize)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._async_queue: asyncio.Queue[TradingEvent] | None = None
+        self._stats_lock = threading.Lock()
+        self.emitted = 0
+        self.dropped = 0
+        self.dropped_by_type: Counter[str] = Counter()
+
+    def attach_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Route events to ``loop``. Must be called from the loop's thread."""
+        self._async_queue = asyncio.Queue(maxsize=self._maxsize)
+        self._loop = loop
+        # Hand over anything emitted before the consumer started
+        for event in self.drain():
+            self._deliver(event)
 
-    def emit(self, event_type: EventType, data: dict[str, Any] | None = None) -> None:
+    def detach_loop(self) -> None:
+        self._loop = None
+        self._async_queue = None
+
+    def emit(self, event_type: EventType, data: EventData | None = None) -> None:
         event = TradingEvent(event_type=event_type, data=data or {})
+        with self._stats_lock:  # emit runs on the trading and monitor threads
+            self.emitted += 1
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._deliver, event)
+                return
+            except RuntimeError:
+                # Loop closed under us — fall back to the sync queue
+                self.detach_loop()
         try:
             self._queue.put_nowait(event)
         except queue.Full:
-            logger.warning("EventBus queue full, dropping event: %s", event_type)
+            self._record_drop(event)
+
+    def _deliver(self, event: TradingEvent) -> None:
+        """Runs on the event loop thread."""
+        q = self._async_queue
+        try:
+            if q is None:  # detached after this callback was scheduled
+                self._queue.put_nowait(event)
+            else:
+                q.put_nowait(event)
+        except (queue.Full, asyncio.QueueFull):
+            self._record_drop(event)
+
+    def _record_drop(self, event: TradingEvent) -> None:
+        with self._stats_lock:
+            self.dropped += 1
+            self.dropped_by_type[event.event_type.value] += 1
+        logger.warning("EventBus queue full, dropping event: %s", event.event_type)
+
+    async def get_batch(self, max_events: int = 100) -> list[TradingEvent]:
+        """Wait for the next event, then take whatever else is already queued."""
+        q = self._async_queue
+        if q is None:
+            raise RuntimeError("EventBus has no event loop attached")
+        events = [await q.get()]
+        while len(events) < max_events:
+            try:
+                events.append(q.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return events
 
     def get(self, timeout: float = 0.1) -> TradingEvent | None:
         try:
@@ -71,3 +215,13 @@ class EventBus:
             except queue.Empty:
                 break
         return events
+
+    def get_stats(self) -> dict[str, Any]:
+        pending = self._async_queue.qsize() if self._async_queue is not None else self._queue.qsize()
+        return {
+            "mode": "async" if self._loop is not None else "sync",
+            "emitted": self.emitted,
+            "pending": pending,
+            "dropped": self.dropped,
+            "dropped_by_type": dict(self.dropped_by_type),
+        }
@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 from typing import Callable
 
+from icc import metrics
 from icc.constants import FSMState
 
 logger = logging.getLogger(__name__)
@@ -130,5 +131,6 @@ class ICCStateMachine:
 
     def _notify(self, old: FSMState, action: str, new: FSMState) -> None:
         logger.info("FSM: %s -[%s]-> %s", old.value, action, new.value)
+        metrics.fsm_transitions_total.inc(labels=(action, new.value))
         for fn in self._listeners:
             fn(old, action, new)
@@ -0,0 +1,209 @@
+"""LatencyProfiler — per-stage timing of Trader.on_candle.
+
+Stages are timed with ``time.perf_counter_ns`` and recorded into
+HDR-style histograms: log-linear buckets with ``2**SUB_BUCKET_BITS``
+sub-buckets per power of two, so every value is kept to ~3% relative
+error in a few hundred integer counters, whatever the sample count.
+
+Profiling is off unless ``metrics.latency`` is set. When it is off,
+Trader times nothing. Otherwise each stage costs two ``perf_counter_ns``
+calls and a counter increment. ``profiler`` is process-wide: every
+Trader records into it, ``/api/metrics`` reads it, and the sessions dump
+it when they stop.
+
+Stages:
+
+- ``on_candle``: the whole call, lock held
+- ``buffer_append``, ``emit``, ``exit_checks``, ``risk_checks``,
+  ``strategy_evaluate``: the steps of each candle
+- ``research_gate``, ``option_resolve``, ``oms_submit``, ``db_persist``:
+  the steps of an entry
+- ``candle_to_order``: from on_candle entry to the order submit returning
+"""
+
+from __future__ import annotations
+
+import threading
+from time import perf_counter_ns
+from typing import Any
+
+SUB_BUCKET_BITS = 5
+
+STAGES = (
+    "on_candle",
+    "buffer_append",
+    "emit",
+    "exit_checks",
+    "risk_checks",
+    "strategy_evaluate",
+    "research_gate",
+    "option_resolve",
+    "oms_submit",
+    "db_persist",
+    "candle_to_order",
+)
+
+
+def _bucket(value: int) -> int:
+    shift = max(0, value.bit_length() - SUB_BUCKET_BITS - 1)
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def _bucket_upper(index: int) -> int:
+    """Largest value that maps to ``index``."""
+    shift = max(0, (index >> SUB_BUCKET_BITS) - 1)
+    top = index - (shift << SUB_BUCKET_BITS)
+    return ((top + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Log-linear histogram of nanosecond durations."""
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.counts: list[int] = []
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, ns: int) -> None:
+        if ns < 0:
+            ns = 0
+        i = _bucket(ns)
+        counts = self.counts
+        if i >= len(counts):
+            counts.extend([0] * (i + 1 - len(counts)))
+        counts[i] += 1
+        if self.count == 0 or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+        self.count += 1
+        self.total += ns
+
+    def percentile(self, q: float) -> int:
+        """Value at quantile ``q`` (0-1), within one bucket's resolution."""
+        if self.count == 0:
+            return 0
+        rank = max(1, round(q * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(_bucket_upper(i), self.max)
+        return self.max
+
+    def merge(self, other: LatencyHistogram) -> None:
+        if other.count == 0:
+            return
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def copy(self) -> LatencyHistogram:
+        h = LatencyHistogram()
+        h.merge(self)
+        return h
+
+    def summary(self) -> dict[str, Any]:
+        """Count plus mean/p50/p90/p99/max in microseconds."""
+        us = 1000.0
+        return {
+            "count": self.count,
+            "mean_us": round(self.total / self.count / us, 2) if self.count else 0.0,
+            "p50_us": round(self.percentile(0.50) / us, 2),
+            "p90_us": round(self.percentile(0.90) / us, 2),
+            "p99_us": round(self.percentile(0.99) / us, 2),
+            "max_us": round(self.max / us, 2),
+        }
+
+
+class _StageTimer:
+    __slots__ = ("_hist", "_start")
+
+    def __init__(self, hist: LatencyHistogram) -> None:
+        self._hist = hist
+
+    def __enter__(self) -> None:
+        self._start = perf_counter_ns()
+
+    def __exit__(self, *exc: Any) -> None:
+        self._hist.record(perf_counter_ns() - self._start)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+NULL_TIMER = _NullTimer()
+
+
+def null_stage(name: str) -> _NullTimer:
+    """Stand-in for ``LatencyProfiler.stage`` when profiling is off."""
+    return NULL_TIMER
+
+
+class LatencyProfiler:
+    """Named latency histograms, fed by the trading threads."""
+
+    def __init__(self) -> None:
+        self._hists: dict[str, LatencyHistogram] = {name: LatencyHistogram() for name in STAGES}
+        self._lock = threading.Lock()  # guards adding stages and reset, not records
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        hist = self._hists.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self._hists.setdefault(name, LatencyHistogram())
+        return hist
+
+    def stage(self, name: str) -> _StageTimer:
+        """Context manager timing one pass through ``name``."""
+        return _StageTimer(self.histogram(name))
+
+    def record(self, name: str, ns: int) -> None:
+        self.histogram(name).record(ns)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Per-stage summaries, stages that never ran omitted."""
+        return {
+            name: hist.copy().summary()
+            for name, hist in list(self._hists.items())
+            if hist.count
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hists = {name: LatencyHistogram() for name in STAGES}
+
+    def log_summary(self, log) -> None:
+        """Write the table to ``log`` at INFO, if anything was recorded."""
+        if any(hist.count for hist in self._hists.values()):
+            log.info("on_candle latency by stage:\n%s", self.format_table())
+
+    def format_table(self) -> str:
+        """Plain-text table of ``snapshot()`` for logs and the CLI."""
+        rows = self.snapshot()
+        if not rows:
+            return "(no latency samples)"
+        cols = ("count", "mean_us", "p50_us", "p90_us", "p99_us", "max_us")
+        lines = [f"{'stage':<18}" + "".join(f"{c:>11}" for c in cols)]
+        for name, row in rows.items():
+            lines.append(f"{name:<18}" + "".join(f"{row[c]:>11}" for c in cols))
+        return "\n".join(lines)
+
+
+profiler = LatencyProfiler()
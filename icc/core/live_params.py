@@ -0,0 +1,189 @@
+"""LiveParams — versioned, audited parameter updates for a running session.
+
+A partial update names sections and fields, e.g.::
+
+    {"orb": {"min_range_pct": 0.25}, "options": {"premium_stop_pct": 0.25}}
+
+It is validated in full (unknown sections and fields, session-fixed fields
+and pydantic constraints) against every trader before any trader changes.
+Then each trader swaps the new sections in through
+``Trader.update_config`` under its own lock, so a candle sees either the
+old or the new parameters, never a mix. Strategy state (ORB ranges,
+buffers, daily PnL, open positions) is kept.
+
+Every applied change bumps ``version`` and is written to the audit log
+(``AuditLogRecord``, action ``config_update``) with its source and the
+old/new value of each field, per ticker (traders may start from
+different per-ticker overrides).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Mapping, Optional
+
+from icc import serialization
+
+if TYPE_CHECKING:
+    from icc.core.trader import Trader
+
+logger = logging.getLogger(__name__)
+
+UPDATABLE_SECTIONS = ("strategy", "orb", "risk", "options")
+
+# Read once when the session is built (option resolver, tickers, instrument),
+# so a live change would not take effect
+FIXED_FIELDS: dict[str, frozenset[str]] = {
+    "options": frozenset({
+        "instrument_type", "underlying", "tickers", "strike_mode", "expiration_mode",
+        "expiration_guard_minutes", "min_premium", "max_premium", "otm_fallback",
+        "per_ticker_max_premium",
+    }),
+}
+
+AUDIT_ACTION = "config_update"
+
+Patch = dict[str, dict[str, Any]]
+
+
+@dataclass
+class ParamChange:
+    """One applied update: section -> field -> [old, new].
+
+    ``changes`` merges every trader's diff (old value from the first trader
+    that changed); ``tickers`` holds each changed trader's own diff.
+    """
+    version: int
+    source: str
+    changes: dict[str, dict[str, list]]
+    tickers: dict[str, dict[str, dict[str, list]]] = field(default_factory=dict)
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": self.version,
+            "source": self.source,
+            "changes": self.changes,
+            "tickers": self.tickers,
+            "timestamp": self.timestamp.isoformat(),
+        }
+
+
+class LiveParams:
+    """Applies partial config updates to a session's traders."""
+
+    def __init__(self, traders: Mapping[str, Trader], persistence=None, db_session=None,
+                 session_id: Optional[str] = None, max_history: int = 100) -> None:
+        self._traders = traders
+        self._persistence = persistence  # WriteBehindQueue; audit rows go through it if set
+        self._db = db_session
+        self._session_id = session_id
+        self._lock = threading.Lock()
+        self.version = 0
+        self.history: deque[ParamChange] = deque(maxlen=max_history)
+
+    def current(self) -> dict[str, dict[str, Any]]:
+        """Updatable sections as the first trader has them."""
+        trader = next(iter(self._traders.values()), None)
+        if trader is None:
+            return {}
+        return {name: getattr(trader.config, name).model_dump(mode="json")
+                for name in UPDATABLE_SECTIONS}
+
+    def validate(self, patch: Patch) -> dict[str, dict[str, Any]]:
+        """New section models per ticker. Raises ValueError (incl. ValidationError)."""
+        if not isinstance(patch, dict) or not patch:
+            raise ValueError("Update is empty")
+        for section, fields in patch.items():
+            if section not in UPDATABLE_SECTIONS:
+                raise ValueError(f"Section {section!r} is not updatable "
+                                 f"(one of: {', '.join(UPDATABLE_SECTIONS)})")
+            if not isinstance(fields, dict) or not fields:
+                raise ValueError(f"Section {section!r} needs a mapping of fields")
+            fixed = sorted(set(fields) & FIXED_FIELDS.get(section, frozenset()))
+            if fixed:
+                raise ValueError(f"{section}.{fixed[0]} is fixed for the session; restart to change it")
+
+        updates: dict[str, dict[str, Any]] = {}
+        for ticker, trader in self._traders.items():
+            sections = {}
+            for section, fields in patch.items():
+                current = getattr(trader.config, section)
+                model = type(current)
+                unknown = sorted(set(fields) - set(model.model_fields))
+                if unknown:
+                    raise ValueError(f"Unknown field {section}.{unknown[0]}")
+                sections[section] = model.model_validate({**current.model_dump(), **fields})
+            updates[ticker] = sections
+        return updates
+
+    def apply(self, patch: Patch, source: str = "api") -> Optional[ParamChange]:
+        """Validate and apply ``patch`` to every trader.
+
+        Returns the recorded change, or None if nothing differed. Raises
+        ValueError on an invalid patch, RuntimeError with no traders.
+        """
+        with self._lock:
+            traders = dict(self._traders)
+            if not traders:
+                raise RuntimeError("No running traders to update")
+            updates = self.validate(patch)
+            per_ticker = {}
+            for ticker, trader in traders.items():
+                diff = _diff(trader.config, updates[ticker])
+                if diff:
+                    per_ticker[ticker] = diff
+            if not per_ticker:
+                return None
+            for ticker in per_ticker:
+                traders[ticker].update_config(**updates[ticker])
+            changes = _merge(per_ticker.values())
+            self.version += 1
+            change = ParamChange(self.version, source, changes, per_ticker)
+            self.history.append(change)
+        self._audit(change)
+        logger.info("Parameters v%d from %s: %s", change.version, source,
+                    _describe(changes), extra={"event": "params_update", **change.to_dict()})
+        return change
+
+    def _audit(self, change: ParamChange) -> None:
+        details = serialization.dumps({**change.to_dict(), "session_id": self._session_id})
+        try:
+            if self._persistence is not None:
+                self._persistence.log_audit(AUDIT_ACTION, details=details)
+            elif self._db is not None:
+                from icc.db.repo import log_audit
+                log_audit(self._db, AUDIT_ACTION, details=details)
+        except Exception as e:
+            logger.error("Failed to audit parameter change v%d: %s", change.version, e)
+
+
+def _diff(config, sections: dict[str, Any]) -> dict[str, dict[str, list]]:
+    changes: dict[str, dict[str, list]] = {}
+    for name, new in sections.items():
+        old = getattr(config, name).model_dump(mode="json")
+        new_values = new.model_dump(mode="json")
+        fields = {k: [old.get(k), v] for k, v in new_values.items() if old.get(k) != v}
+        if fields:
+            changes[name] = fields
+    return changes
+
+
+def _merge(diffs) -> dict[str, dict[str, list]]:
+    merged: dict[str, dict[str, list]] = {}
+    for diff in diffs:
+        for section, fields in diff.items():
+            target = merged.setdefault(section, {})
+            for name, values in fields.items():
+                target.setdefault(name, values)
+    return merged
+
+
+def _describe(changes: dict[str, dict[str, list]]) -> str:
+    return ", ".join(f"{section}.{name}={old}->{new}"
+                     for section, fields in changes.items()
+                     for name, (old, new) in fields.items())
@@ -0,0 +1,165 @@
+"""PortfolioAllocator — concurrent multi-ticker entries under aggregate caps."""
+
+from __future__ import annotations
+
+import logging
+import math
+from typing import TYPE_CHECKING
+
+from icc.config import PortfolioConfig
+from icc.constants import MES_POINT_VALUE
+from icc.oms.position_tracker import PositionBook
+
+if TYPE_CHECKING:
+    from icc.core.trader import Trader
+
+logger = logging.getLogger(__name__)
+
+
+def _returns(closes: list[float]) -> list[float]:
+    return [
+        (b - a) / a if a else 0.0
+        for a, b in zip(closes, closes[1:])
+    ]
+
+
+def _correlation(xs: list[float], ys: list[float]) -> float | None:
+    """Pearson correlation of two equal-length series (None if undefined)."""
+    n = min(len(xs), len(ys))
+    if n < 3:
+        return None
+    xs, ys = xs[-n:], ys[-n:]
+    mx = sum(xs) / n
+    my = sum(ys) / n
+    cov = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    vx = sum((x - mx) ** 2 for x in xs)
+    vy = sum((y - my) ** 2 for y in ys)
+    if vx == 0 or vy == 0:
+        return None
+    return cov / math.sqrt(vx * vy)
+
+
+class PortfolioAllocator:
+    """Lets several Traders hold positions at once.
+
+    Registered traders queue entries instead of executing them in on_candle.
+    ``allocate`` ranks the queued entries by research confidence and executes
+    them best-first. Each execution passes the shared RiskEngine (position
+    count, settlement budget) and then ``can_allocate``, which enforces gross
+    exposure, open premium and same-direction correlation caps.
+    """
+
+    def __init__(self, config: PortfolioConfig, book: PositionBook) -> None:
+        self.config = config
+        self.book = book
+        self._traders: dict[str, Trader] = {}
+
+    def register(self, ticker: str, trader: Trader) -> None:
+        self._traders[ticker] = trader
+        trader.attach_portfolio(self)
+
+    def allocate(self) -> list[str]:
+        """Execute this iteration's queued entries, highest confidence first.
+
+        Returns the tickers that filled.
+        """
+        pending = [
+            (ticker, trader) for ticker, trader in self._traders.items()
+            if trader.pending_entry is not None
+        ]
+        pending.sort(key=lambda item: item[1].pending_entry.confidence, reverse=True)
+        filled: list[str] = []
+        for ticker, trader in pending:
+            confidence = trader.pending_entry.confidence
+            if trader.execute_pending_entry():
+                filled.append(ticker)
+                logger.info("Portfolio: %s filled (confidence=%.3f, open=%d)",
+                            ticker, confidence, self.book.open_position_count)
+        return filled
+
+    # -- gate ---------------------------------------------------------------
+
+    def can_allocate(self, trader: Trader, direction: str, notional: float,
+                     premium_cost: float) -> tuple[bool, str]:
+        """Aggregate caps for a new entry. Called by Trader after the risk gate."""
+        cfg = self.config
+        if cfg.max_gross_exposure > 0:
+            exposure = self.gross_exposure()
+            if exposure + notional > cfg.max_gross_exposure:
+                return False, (
+                    f"Gross exposure cap: ${exposure:.2f} open + ${notional:.2f} "
+                    f"> ${cfg.max_gross_exposure:.2f}"
+                )
+
+        if cfg.max_premium_budget > 0 and trader.config.options.instrument_type == "OPTIONS":
+            open_premium = self.open_premium()
+            if open_premium + premium_cost > cfg.max_premium_budget:
+                return False, (
+                    f"Premium budget cap: ${open_premium:.2f} open + ${premium_cost:.2f} "
+                    f"> ${cfg.max_premium_budget:.2f}"
+                )
+
+        ticker = self._ticker_of(trader)
+        correlated = self.correlated_open(ticker, direction)
+        if len(correlated) >= cfg.max_correlated_positions:
+            return False, (
+                f"Correlation cap: {ticker} correlated with open {', '.join(correlated)}"
+            )
+        return True, "OK"
+
+    # -- aggregates ---------------------------------------------------------
+
+    def gross_exposure(self) -> float:
+        total = 0.0
+        for pos in self.book.positions.values():
+            if pos.is_option:
+                total += pos.entry_premium * (pos.multiplier or 5.0) * pos.quantity
+            else:
+                total += pos.entry_price * MES_POINT_VALUE * pos.quantity
+        return total
+
+    def open_premium(self) -> float:
+        return sum(
+            pos.entry_premium * (pos.multiplier or 5.0) * pos.quantity
+            for pos in self.book.positions.values() if pos.is_option
+        )
+
+    def correlation(self, a: str, b: str) -> float | None:
+        """Correlation of recent 1-min returns between two tickers' buffers."""
+        ta, tb = self._traders.get(a), self._traders.get(b)
+        if ta is None or tb is None:
+            return None
+        n = self.config.correlation_lookback + 1
+        return _correlation(_returns(ta.buffer.closes(n)), _returns(tb.buffer.closes(n)))
+
+    def correlated_open(self, ticker: str, direction: str) -> list[str]:
+        """Open same-direction tickers whose return correlation with ticker meets the threshold.
+
+        Negatively correlated same-direction positions offset each other, so
+        only positive correlation counts toward the cap.
+        """
+        want_long = direction == "long"
+        result = []
+        for other, pos in self.book.positions.items():
+            if other == ticker or pos.is_long != want_long:
+                continue
+            corr = self.correlation(ticker, other)
+            if corr is not None and corr >= self.config.correlation_threshold:
+                result.append(other)
+        return result
+
+    def _ticker_of(self, trader: Trader) -> str:
+        for ticker, t in self._traders.items():
+            if t is trader:
+                return ticker
+        return trader.config.options.underlying
+
+    def get_snapshot(self) -> dict:
+        return {
+            "open_positions": self.book.open_position_count,
+            "open_tickers": sorted(self.book.positions),
+            "gross_exposure": self.gross_exposure(),
+            "open_premium": self.open_premium(),
+            "unrealized_pnl": self.book.unrealized_pnl,
+            "closed_pnl": self.book.closed_pnl,
+        }
@@ -0,0 +1,122 @@
+"""PositionMonitor — sub-second quote polling for open positions.
+
+Completed candles arrive once a minute, so a premium stop or trailing stop
+could be blown through for up to a minute before on_candle reacts. The
+monitor polls the latest quote for each trader holding a position on its
+own thread and hands it to ``Trader.on_quote``, which takes the trader's
+lock and exits at once. Exit-reaction latency (quote observed -> exit
+done, including any wait for the trading thread) is recorded per exit.
+
+``quote_fn`` and ``premium_fn`` should read the broker's real-time quote
+cache; polling a delayed, rate-limited HTTP source at this cadence adds
+load without adding precision.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Optional
+
+if TYPE_CHECKING:
+    from icc.core.trader import Trader
+
+logger = logging.getLogger(__name__)
+
+QuoteFn = Callable[[str], Optional[float]]
+PremiumFn = Callable[[Any], Optional[float]]  # OptionContract -> premium
+
+
+class PositionMonitor:
+    """Watches quotes for every trader with an open position."""
+
+    def __init__(self, traders: Mapping[str, Trader], quote_fn: Optional[QuoteFn] = None,
+                 premium_fn: Optional[PremiumFn] = None, interval_sec: float = 0.25,
+                 max_samples: int = 500) -> None:
+        self._traders = traders
+        self._quote_fn = quote_fn
+        self._premium_fn = premium_fn
+        self._interval = interval_sec
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.exit_latency_ms: deque[float] = deque(maxlen=max_samples)
+        self.exits = 0
+        self.polls = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="position-monitor", daemon=True)
+        self._thread.start()
+        logger.info("Position monitor started (%.2fs interval)", self._interval)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.exception("Position monitor poll failed: %s", e)
+
+    def poll_once(self) -> list[tuple[str, str]]:
+        """One pass over open positions. Returns (ticker, exit reason) pairs."""
+        self.polls += 1
+        exits: list[tuple[str, str]] = []
+        for ticker, trader in list(self._traders.items()):
+            if trader.positions.is_flat:
+                continue
+            price, premium = self._quote(ticker, trader)
+            if price is None and premium is None:
+                continue
+            observed = time.perf_counter_ns()
+            reason = trader.on_quote(price, premium)
+            if reason is not None:
+                latency_ms = (time.perf_counter_ns() - observed) / 1e6
+                self.exit_latency_ms.append(latency_ms)
+                self.exits += 1
+                exits.append((ticker, reason))
+                logger.info("Monitor exit %s (%s) in %.1fms", ticker, reason, latency_ms)
+        return exits
+
+    def _quote(self, ticker: str, trader: Trader) -> tuple[float | None, float | None]:
+        price = premium = None
+        if self._quote_fn is not None:
+            try:
+                price = self._quote_fn(ticker)
+            except Exception as e:
+                logger.debug("Quote for %s failed: %s", ticker, e)
+        contract = trader._active_contract
+        if self._premium_fn is not None and contract is not None:
+            try:
+                premium = self._premium_fn(contract)
+            except Exception as e:
+                logger.debug("Premium quote for %s failed: %s", ticker, e)
+        return price, premium
+
+    def get_stats(self) -> dict:
+        samples = sorted(self.exit_latency_ms)
+        n = len(samples)
+        return {
+            "running": self.is_running,
+            "interval_sec": self._interval,
+            "polls": self.polls,
+            "exits": self.exits,
+            "exit_latency_ms": {
+                "last": round(self.exit_latency_ms[-1], 2) if n else None,
+                "p50": round(samples[n // 2], 2) if n else None,
+                "p95": round(samples[min(n - 1, int(n * 0.95))], 2) if n else None,
+                "max": round(samples[-1], 2) if n else None,
+            },
+        }
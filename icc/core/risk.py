@@ -2,6 +2,7 @@
 
 State persists across process restarts when a db_session is provided.
 Without a db_session, behavior is identical to the in-memory original.
+With a write-behind queue, mutations are queued instead of committed inline.
 """
 
 from __future__ import annotations
@@ -53,18 +54,24 @@ class RiskEngine:
         settlement_tracker=None,
         db_session=None,
         today_provider=None,
+        persistence=None,
     ):
-        self.config = config
         self.state = RiskState()
-        self._kill_cap = config.account_size * config.daily_loss_kill_pct
-        self._prekill_cap = config.account_size * config.daily_loss_prekill_pct
+        self.update_config(config)
         self._settlement = settlement_tracker
         self._db = db_session
+        self._persistence = persistence  # Optional WriteBehindQueue for _persist
         self._today_provider = today_provider or _today_et
         # open_positions is intentionally NOT persisted — it's broker-derived
         # and re-set on startup. Everything else hydrates from today's row.
         self._load_state()
 
+    def update_config(self, config: RiskConfig) -> None:
+        """Swap in new limits; today's state (PnL, counts, kill flag) is kept."""
+        self.config = config
+        self._kill_cap = config.account_size * config.daily_loss_kill_pct
+        self._prekill_cap = config.account_size * config.daily_loss_prekill_pct
+
     # -- persistence --------------------------------------------------------
 
     def _today(self) -> str:
@@ -94,6 +101,19 @@ class RiskEngine:
             logger.warning("RiskState load failed (will start fresh): %s", e)
 
     def _persist(self) -> None:
+        if self._persistence is not None:
+            # Off the trading thread; repeated updates for the day coalesce
+            self._persistence.put_risk_state(
+                self._today(),
+                daily_pnl=self.state.daily_pnl,
+                trade_count=self.state.trade_count,
+                consecutive_losses=self.state.consecutive_losses,
+                last_loss_time=self.state.last_loss_time,
+                last_large_loss_time=self.state.last_large_loss_time,
+                killed=self.state.killed,
+                pre_kill_triggered=self.state.pre_kill_triggered,
+            )
+            return
         if self._db is None:
             return
         try:
@@ -3,29 +3,54 @@
 from __future__ import annotations
 
 import logging
+import math
+import threading
+from dataclasses import dataclass
+from time import perf_counter_ns
 from typing import TYPE_CHECKING, Any, Optional
 
+from icc import metrics
 from icc.config import AppSettings
 from icc.constants import FSMState, OrderSide, OrderType
+from icc.core.events import (
+    CandlePayload,
+    EntryPayload,
+    EventBus,
+    EventData,
+    EventType,
+    ExitPayload,
+)
 from icc.core.fsm import ICCStateMachine
+from icc.core.latency import null_stage, profiler
 from icc.core.risk import RiskEngine
 from icc.core.strategy import StrategyEngine
 from icc.market.candle import Candle, CandleBuffer
 from icc.oms.manager import OrderManager
 from icc.oms.orders import Order
 from icc.core.win_tracker import WinRateTracker
-from icc.oms.position_tracker import PositionTracker
+from icc.oms.position_tracker import PositionBook, PositionTracker
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session as DBSession
 
+    from icc.db.write_behind import WriteBehindQueue
+
     from icc.alerts.base import AlertRouter
+    from icc.backtest.fills import FillModel
     from icc.broker.option_chain import OptionChainResolver, OptionContract
-    from icc.core.events import EventBus
+    from icc.core.portfolio import PortfolioAllocator
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class PendingEntry:
+    """Entry signal that passed the research gate, awaiting portfolio allocation."""
+    signal: Any
+    candle: Candle
+    confidence: float
+
+
 class Trader:
     """Main orchestrator: receives candles, drives FSM + risk + strategy + OMS."""
 
@@ -41,6 +66,9 @@ class Trader:
         research_agent=None,
         option_chain_resolver: Optional[OptionChainResolver] = None,
         shared_risk_engine: Optional[RiskEngine] = None,
+        position_book: Optional[PositionBook] = None,
+        persistence: Optional[WriteBehindQueue] = None,
+        fill_model: Optional[FillModel] = None,
     ):
         self.config = config
         self.fsm = ICCStateMachine()
@@ -54,36 +82,53 @@ class Trader:
             self.strategy = StrategyEngine(config.strategy)
 
         self.oms = order_manager
-        self.positions = PositionTracker()
+        # With a shared book, this trader's position is keyed by its underlying
+        self.positions = (
+            position_book.tracker(config.options.underlying)
+            if position_book is not None else PositionTracker()
+        )
         self.buffer = CandleBuffer(maxlen=200)
         self.alert_router = alert_router
         self.event_bus = event_bus
         self._db = db_session
+        # Write-behind queue: when set, trades persist through it, not db_session
+        self._persistence = persistence
         self._session_id = session_id or "default"
         self._trade_count = 0
-        self._open_trade_id: Optional[int] = None
+        self._open_trade_id: Optional[int] = None  # Row id, or write-behind ticket
         self._settlement = settlement_tracker
         self._research = research_agent
         self._option_resolver = option_chain_resolver
         self._active_contract: Optional[OptionContract] = None
         self._premium_feed = None  # Callable(contract) -> float | None, set by live strategy
         self._cached_premium: float | None = None  # Updated each candle for PnL display
+        self._portfolio: Optional[PortfolioAllocator] = None  # Set by attach_portfolio
+        self._defer_entries = False  # Portfolio mode: queue entries for the allocator
+        self.pending_entry: Optional[PendingEntry] = None
+        self._fill_model = fill_model  # Optional intrabar stop/target resolution (backtests)
         self._win_tracker = WinRateTracker()
+        # Serializes the trading thread with the PositionMonitor's quote-driven exits
+        self._lock = threading.RLock()
+        # Per-stage latency histograms (metrics.latency); a no-op timer when off
+        self.latency = profiler if config.metrics.latency else None
+        self._stage = profiler.stage if self.latency is not None else null_stage
+        self._candle_start_ns = 0
+        self._metric_labels = (config.options.underlying,)
 
         is_options = config.options.instrument_type == "OPTIONS"
-        print(f"[ICC] Trader initialized: strategy={config.strategy_name}, "
-              f"instrument={config.options.instrument_type}, "
-              f"underlying={config.options.underlying}, "
-              f"option_resolver={'YES' if option_chain_resolver else 'NO'}, "
-              f"research={'ON' if research_agent else 'OFF'}, "
-              f"settlement={'ON' if settlement_tracker else 'OFF'}",
-              flush=True)
-
-    def _emit(self, event_type_str: str, data: dict[str, Any] | None = None) -> None:
+        logger.info(
+            "Trader initialized: strategy=%s, instrument=%s, underlying=%s, "
+            "option_resolver=%s, research=%s, settlement=%s",
+            config.strategy_name, config.options.instrument_type, config.options.underlying,
+            "YES" if option_chain_resolver else "NO",
+            "ON" if research_agent else "OFF",
+            "ON" if settlement_tracker else "OFF",
+        )
+
+    def _emit(self, event_type_str: str, data: EventData | None = None) -> None:
         """Emit an event if event_bus is available."""
         if self.event_bus is None:
             return
-        from icc.core.events import EventType
         try:
             et = EventType(event_type_str)
         except ValueError:
@@ -92,59 +137,84 @@ class Trader:
 
     def on_candle(self, candle: Candle) -> None:
         """Single integration point for the full pipeline."""
-        self.buffer.append(candle)
-
-        self._emit("candle", {
-            "timestamp": candle.timestamp.isoformat(),
-            "open": candle.open,
-            "high": candle.high,
-            "low": candle.low,
-            "close": candle.close,
-            "volume": candle.volume,
-        })
+        with self._lock:
+            if self.latency is None:
+                self._on_candle(candle)
+                return
+            self._candle_start_ns = start = perf_counter_ns()
+            self._on_candle(candle)
+            self.latency.record("on_candle", perf_counter_ns() - start)
+
+    def _on_candle(self, candle: Candle) -> None:
+        metrics.candles_total.inc(labels=self._metric_labels)
+        with self._stage("buffer_append"):
+            self.buffer.append(candle)
+            if self._research is not None:
+                self._research.observe(self.buffer)
+
+        with self._stage("emit"):
+            self._emit("candle", CandlePayload.from_candle(candle))
 
         # Check stop/target on open positions
         if not self.positions.is_flat:
-            self._check_exit(candle)
-            if self.positions.is_flat:
-                return
-
-            # Option-specific exits: premium stop + expiration guard
-            if self._active_contract is not None:
-                self._check_option_exit(candle)
+            with self._stage("exit_checks"):
+                self._check_exit(candle)
                 if self.positions.is_flat:
                     return
 
-            # Trailing stop management
-            if self._should_trail():
-                self._update_trailing(candle)
-
-            # Increment bar counter and check timeout
-            bars = self.positions.increment_bars()
-            timeout = (self.config.orb.trade_timeout_bars
-                       if self.config.strategy_name == "ORB"
-                       else self.config.strategy.trade_timeout_bars)
-            if bars >= timeout:
-                self._exit_position(candle.close, "timeout_exit")
-                return
+                # Option-specific exits: premium stop + expiration guard
+                if self._active_contract is not None:
+                    self._check_option_exit(candle)
+                    if self.positions.is_flat:
+                        return
 
-        # Update risk engine position count
-        self.risk.set_open_positions(self.positions.open_position_count)
+                # Target 1 partial exit — the runner keeps trailing
+                if self.positions.check_scale_out(candle.high, candle.low):
+                    self._scale_out(candle)
+
+                # Trailing stop management
+                if self._should_trail():
+                    self._update_trailing(candle)
+
+                # Increment bar counter and check timeout
+                bars = self.positions.increment_bars()
+                timeout = (self.config.orb.trade_timeout_bars
+                           if self.config.strategy_name == "ORB"
+                           else self.config.strategy.trade_timeout_bars)
+                if bars >= timeout:
+                    self._exit_position(candle.close, "timeout_exit")
+                    return
 
-        # Check kill switch (state.killed avoids re-logging every candle)
-        if self.risk.state.killed:
-            return
-        if self.risk.check_kill_switch():
-            self._handle_kill_switch(candle)
-            return
+                pos = self.positions.position
+                if pos is not None and pos.is_option and self._cached_premium is not None:
+                    self.positions.mark(self._cached_premium)
+                else:
+                    self.positions.mark(candle.close)
+
+        with self._stage("risk_checks"):
+            # Update risk engine position count
+            self.risk.set_open_positions(self.positions.open_position_count)
+
+            # Check kill switch (state.killed avoids re-logging every candle)
+            if self.risk.state.killed:
+                return
+            if self.risk.check_kill_switch():
+                self._handle_kill_switch(candle)
+                return
 
         # Get signal from strategy
-        signal = self.strategy.evaluate(self.fsm.state, self.buffer)
+        with self._stage("strategy_evaluate"):
+            signal = self.strategy.evaluate(self.fsm.state, self.buffer)
 
         if signal.action == "none":
             return
+        metrics.signals_total.inc(labels=(signal.action,))
 
-        print(f"[ICC] Signal: {signal.action} | FSM: {self.fsm.state.value} | price={candle.close:.2f}", flush=True)
+        if logger.isEnabledFor(logging.INFO):
+            state = self.fsm.state.value
+            logger.info("Signal: %s | FSM: %s | price=%.2f", signal.action, state, candle.close,
+                        extra={"event": "signal", "action": signal.action, "state": state,
+                               "price": candle.close})
 
         # Attempt FSM transition
         if signal.action in ("enter_long", "enter_short"):
@@ -157,15 +227,116 @@ class Trader:
             self.fsm.transition(signal.action)
             self._emit("fsm_transition", {"state": self.fsm.state.value})
 
+    def on_partial_candle(self, candle: Candle) -> None:
+        """Intra-bar stop/target check against the bar in progress.
+
+        Fed by LiveFeed.updates() between completed bars. Only exits run here;
+        the buffer, bar count, trailing and signals wait for the closed bar.
+        """
+        with self._lock:
+            if self.positions.is_flat:
+                return
+            self._check_exit(candle)
+
+    def on_quote(self, price: float | None, premium: float | None = None) -> str | None:
+        """Quote-driven exit check for the open position (PositionMonitor thread).
+
+        ``price`` is the underlying's last trade, ``premium`` the option's.
+        Exits at the quote: stops and premium stops/trails act immediately;
+        an underlying target on an option still needs the premium in profit.
+        Returns the exit reason, or None if the position stays open.
+        """
+        with self._lock:
+            pos = self.positions.position
+            if pos is None:
+                return None
+            if premium is not None and pos.is_option:
+                self._cached_premium = premium
+                reason = self._premium_exit_reason(pos, premium)
+                if reason is not None:
+                    self._exit_position(premium, reason)
+                    return reason
+            if price is None:
+                return None
+            result = self.positions.check_stop_target(price, price)
+            if result == "target_hit" and pos.is_option:
+                if premium is None or pos.entry_premium is None or premium < pos.entry_premium:
+                    return None
+            if result is not None:
+                # An option exits at the quoted premium; no second broker lookup
+                self._exit_position(price, result, premium=premium)
+            return result
+
+    def flatten(self, price: float | None, reason: str) -> bool:
+        """Close any open position at ``price`` (default: last close).
+
+        Safe to call from outside the trading thread (shutdown, session
+        close). Returns True if a position was closed.
+        """
+        with self._lock:
+            if self.positions.is_flat:
+                return False
+            if price is None:
+                last = self.buffer.last
+                if last is None:
+                    return False
+                price = last.close
+            self._exit_position(price, reason)
+            return True
+
+    def attach_portfolio(self, allocator: PortfolioAllocator) -> None:
+        """Join a portfolio: entries are queued for ``allocator`` and pass its caps."""
+        with self._lock:
+            self._portfolio = allocator
+            self._defer_entries = True
+
+    def update_config(self, **sections: Any) -> list[str]:
+        """Swap config sections (``strategy``, ``orb``, ``risk``, ``options``) in between candles.
+
+        Takes the trader lock, so the swap never lands mid-candle or
+        mid-exit. Strategy and risk state (ranges, buffers, daily PnL) are
+        kept; only the parameters change. Returns the sections that differed.
+        """
+        with self._lock:
+            changed = {name: value for name, value in sections.items()
+                       if getattr(self.config, name) != value}
+            if not changed:
+                return []
+            config = self.config.model_copy(update=changed)
+            if "risk" in changed:
+                self.risk.update_config(config.risk)
+            if "strategy" in changed or "orb" in changed:
+                from icc.core.orb_strategy import ORBStrategyEngine
+                self.strategy.config = (config.orb if isinstance(self.strategy, ORBStrategyEngine)
+                                        else config.strategy)
+            self.config = config
+        logger.info("Config updated: %s", ", ".join(sorted(changed)),
+                    extra={"event": "config_update", "sections": sorted(changed)})
+        return sorted(changed)
+
     def _check_exit(self, candle: Candle) -> None:
-        result = self.positions.check_stop_target(candle.high, candle.low)
+        pos = self.positions.position
+        fill_price: float | None = None
+        if self._fill_model is not None and pos is not None:
+            # A missing stop/target is one the bar can never touch
+            far, near = (-math.inf, math.inf) if pos.is_long else (math.inf, -math.inf)
+            result, fill_price = self._fill_model.resolve_exit(
+                pos.is_long,
+                pos.stop_price if pos.stop_price is not None else far,
+                pos.target_price if pos.target_price is not None else near,
+                pos.quantity, candle,
+            )
+        else:
+            result = self.positions.check_stop_target(candle.high, candle.low)
         if result == "stop_hit":
-            pos = self.positions.position
             exit_price = pos.stop_price if pos else candle.close
+            if fill_price is not None:
+                exit_price = fill_price
             self._exit_position(exit_price, "stop_hit")
         elif result == "target_hit":
-            pos = self.positions.position
             exit_price = pos.target_price if pos else candle.close
+            if fill_price is not None:
+                exit_price = fill_price
             # For options: only exit on underlying target if premium is profitable.
             # Underlying target_hit doesn't guarantee premium profit (theta/IV crush).
             if pos and pos.is_option:
@@ -216,34 +387,9 @@ class Trader:
             current_premium = self._get_current_premium(candle)
             self._cached_premium = current_premium  # Cache for snapshot PnL
 
-            # Track high-water mark for premium trailing
-            if not hasattr(pos, '_premium_high'):
-                pos._premium_high = pos.entry_premium
-            if current_premium > pos._premium_high:
-                pos._premium_high = current_premium
-
-            # Premium trailing: exit when premium drops from peak after trigger gain
-            trail_trigger = 1.0 + self.config.options.premium_trail_trigger_pct
-            trail_drop = self.config.options.premium_trail_drop_pct
-            if pos._premium_high > pos.entry_premium * trail_trigger:
-                drop_from_peak = (pos._premium_high - current_premium) / pos._premium_high
-                if drop_from_peak >= trail_drop:
-                    logger.info(
-                        "Premium trail stop: peaked at $%.2f, now $%.2f (%.1f%% drop from peak)",
-                        pos._premium_high, current_premium, drop_from_peak * 100,
-                    )
-                    self._exit_position(current_premium, "premium_trail_stop")
-                    return
-
-            # Premium stop: exit if premium drops by premium_stop_pct from entry
-            stop_pct = self.config.options.premium_stop_pct
-            pnl_pct = (current_premium - pos.entry_premium) / pos.entry_premium
-            if pnl_pct <= -stop_pct:
-                logger.info(
-                    "Premium stop: dropped %.1f%% (threshold %.1f%%)",
-                    abs(pnl_pct) * 100, stop_pct * 100,
-                )
-                self._exit_position(current_premium, "premium_stop")
+            reason = self._premium_exit_reason(pos, current_premium)
+            if reason is not None:
+                self._exit_position(current_premium, reason)
                 return
 
         # --- Expiration guard: exit N minutes before expiry ---
@@ -262,6 +408,39 @@ class Trader:
                 self._exit_position(current_premium, "expiration_guard")
                 return
 
+    def _premium_exit_reason(self, pos, current_premium: float) -> str | None:
+        """Premium trailing / premium stop check; updates the premium high-water mark."""
+        if pos.entry_premium is None or pos.entry_premium <= 0:
+            return None
+        # Track high-water mark for premium trailing
+        if not hasattr(pos, '_premium_high'):
+            pos._premium_high = pos.entry_premium
+        if current_premium > pos._premium_high:
+            pos._premium_high = current_premium
+
+        # Premium trailing: exit when premium drops from peak after trigger gain
+        trail_trigger = 1.0 + self.config.options.premium_trail_trigger_pct
+        trail_drop = self.config.options.premium_trail_drop_pct
+        if pos._premium_high > pos.entry_premium * trail_trigger:
+            drop_from_peak = (pos._premium_high - current_premium) / pos._premium_high
+            if drop_from_peak >= trail_drop:
+                logger.info(
+                    "Premium trail stop: peaked at $%.2f, now $%.2f (%.1f%% drop from peak)",
+                    pos._premium_high, current_premium, drop_from_peak * 100,
+                )
+                return "premium_trail_stop"
+
+        # Premium stop: exit if premium drops by premium_stop_pct from entry
+        stop_pct = self.config.options.premium_stop_pct
+        pnl_pct = (current_premium - pos.entry_premium) / pos.entry_premium
+        if pnl_pct <= -stop_pct:
+            logger.info(
+                "Premium stop: dropped %.1f%% (threshold %.1f%%)",
+                abs(pnl_pct) * 100, stop_pct * 100,
+            )
+            return "premium_stop"
+        return None
+
     def _estimate_trade_cost(self, signal, contract=None) -> float:
         """Estimate cost of a trade for settlement checking.
 
@@ -276,6 +455,14 @@ class Trader:
             return commission + option_commission
         return commission
 
+    def _entry_notional(self, signal, contract=None) -> float:
+        """Dollar exposure of a new entry: premium paid for options, contract value for futures."""
+        if contract is not None:
+            return contract.total_cost * self.config.options.quantity
+        from icc.constants import MES_POINT_VALUE
+        price = signal.entry_price or (self.buffer.last.close if self.buffer.last else 0.0)
+        return price * MES_POINT_VALUE * self.config.risk.futures_quantity
+
     def _resolve_option_contract(self, signal, candle: Candle):
         """Resolve option contract if instrument_type is OPTIONS.
 
@@ -288,13 +475,58 @@ class Trader:
             return None, self._estimate_trade_cost(signal)
 
         direction = "long" if signal.action == "enter_long" else "short"
+        started = perf_counter_ns()
         contract = self._option_resolver.resolve(direction, candle.close)
+        metrics.option_resolve_seconds.observe((perf_counter_ns() - started) / 1e9)
         if contract is None:
+            reason = getattr(self._option_resolver, "last_failure_reason", None) or "unknown"
+            metrics.option_resolve_failures_total.inc(labels=(metrics.reason_label(reason),))
             return None, 0.0  # signals caller to abort
         trade_cost = self._estimate_trade_cost(signal, contract=contract)
         return contract, trade_cost
 
     def _handle_entry(self, signal, candle: Candle) -> None:
+        with self._stage("research_gate"):
+            confidence = self._research_gate(signal)
+        if confidence is None:
+            return
+        if self._defer_entries:
+            # Portfolio mode: the allocator ranks this iteration's entries first
+            self.pending_entry = PendingEntry(signal=signal, candle=candle, confidence=confidence)
+            return
+        self._execute_entry(signal, candle)
+
+    def execute_pending_entry(self) -> bool:
+        """Execute the entry queued by on_candle (portfolio mode). Returns True if filled."""
+        with self._lock:
+            pending = self.pending_entry
+            self.pending_entry = None
+            if pending is None:
+                return False
+            self._execute_entry(pending.signal, pending.candle)
+            return not self.positions.is_flat
+
+    def discard_pending_entry(self, reason: str) -> None:
+        """Drop the queued entry — treated like a risk veto."""
+        if self.pending_entry is None:
+            return
+        self.pending_entry = None
+        self._veto_entry(reason)
+
+    def _veto_entry(self, reason: str) -> None:
+        metrics.risk_vetoes_total.inc(labels=(metrics.reason_label(reason),))
+        logger.info("Risk veto: %s (will retry)", reason,
+                    extra={"event": "risk_veto", "reason": reason})
+        # For ORB, don't go to RISK_BLOCKED — stay armed to retry
+        if self.config.strategy_name != "ORB":
+            self.fsm.transition("risk_block")
+        self._emit("risk_veto", {"reason": reason})
+        if self.alert_router:
+            self.alert_router.send("risk_veto", f"Trade blocked: {reason}")
+
+    def _research_gate(self, signal) -> float | None:
+        """Research confidence for the entry, or None if vetoed."""
+        confidence = 1.0
         # Research gate (before risk — returns to FLAT, not RISK_BLOCKED)
         if self._research is not None:
             direction = "long" if signal.action == "enter_long" else "short"
@@ -303,8 +535,9 @@ class Trader:
                 win_rate_adj=self._win_tracker.confidence_adjustment,
             )
             if not allowed:
-                print(f"[ICC] Research VETO: {reason} (confidence={confidence:.2f})", flush=True)
-                logger.info("Research veto: %s", reason)
+                logger.info("Research veto: %s (confidence=%.2f)", reason, confidence,
+                            extra={"event": "research_veto", "reason": reason,
+                                   "confidence": confidence})
                 self.fsm.transition("invalidate")
                 self._emit("research_veto", {
                     "reason": reason,
@@ -312,8 +545,10 @@ class Trader:
                 })
                 if self.alert_router:
                     self.alert_router.send("research_veto", f"Entry vetoed: {reason}")
-                return
+                return None
+        return confidence
 
+    def _execute_entry(self, signal, candle: Candle) -> None:
         # PUT confidence gate — require extra confidence for short/PUT entries
         if self.config.options.instrument_type == "OPTIONS":
             direction = "long" if signal.action == "enter_long" else "short"
@@ -323,35 +558,37 @@ class Trader:
                     conf = self._research._last_context.confidence
                     min_conf = self._research.config.min_confidence + put_boost
                     if conf < min_conf:
-                        print(f"[ICC] PUT confidence gate: {conf:.3f} < {min_conf:.3f} — skipping", flush=True)
-                        logger.info("PUT confidence gate: %.3f < %.3f", conf, min_conf)
+                        logger.info("PUT confidence gate: %.3f < %.3f — skipping", conf, min_conf)
                         return
 
         # Resolve option contract (if OPTIONS mode) and compute trade cost
-        contract, trade_cost = self._resolve_option_contract(signal, candle)
+        with self._stage("option_resolve"):
+            contract, trade_cost = self._resolve_option_contract(signal, candle)
         if self.config.options.instrument_type == "OPTIONS" and contract is None:
             reason = (
                 getattr(self._option_resolver, "last_failure_reason", None)
                 or "no suitable contract"
             )
-            print(f"[ICC] Option resolve FAILED — {reason} (will retry)", flush=True)
-            logger.info("Option resolve failed — %s", reason)
+            logger.info("Option resolve failed — %s (will retry)", reason,
+                        extra={"event": "option_resolve_failed", "reason": reason})
             # Don't transition FSM — stay in ORB_ARMED to retry next candle
             return
         if contract is not None:
-            print(f"[ICC] Option resolved: {contract.underlying} {contract.strike} {contract.option_type} exp={contract.expiration} premium=${contract.premium:.2f}", flush=True)
+            logger.info("Option resolved: %s %s %s exp=%s premium=$%.2f", contract.underlying,
+                        contract.strike, contract.option_type, contract.expiration,
+                        contract.premium)
 
-        # Risk gate (includes settlement check if trade_cost > 0)
+        # Risk gate (includes settlement check if trade_cost > 0).
+        # Refresh the count: another trader sharing the book may have just filled.
+        self.risk.set_open_positions(self.positions.open_position_count)
         allowed, reason = self.risk.can_open_trade(trade_cost=trade_cost)
+        if allowed and self._portfolio is not None:
+            direction = "long" if signal.action == "enter_long" else "short"
+            allowed, reason = self._portfolio.can_allocate(
+                self, direction, self._entry_notional(signal, contract), trade_cost,
+            )
         if not allowed:
-            print(f"[ICC] Risk VETO: {reason} (will retry)", flush=True)
-            logger.info("Risk veto: %s", reason)
-            # For ORB, don't go to RISK_BLOCKED — stay armed to retry
-            if self.config.strategy_name != "ORB":
-                self.fsm.transition("risk_block")
-            self._emit("risk_veto", {"reason": reason})
-            if self.alert_router:
-                self.alert_router.send("risk_veto", f"Trade blocked: {reason}")
+            self._veto_entry(reason)
             return
 
         # For options, buy calls (long) or puts (short) — always BUY side
@@ -378,10 +615,13 @@ class Trader:
                 order_type=OrderType.STOP,
                 side=side,
                 price=signal.entry_price,
-                quantity=1,
+                quantity=self.config.risk.futures_quantity,
             )
 
-        result = self.oms.submit(order)
+        with self._stage("oms_submit"):
+            result = self.oms.submit(order)
+        if self.latency is not None and self._candle_start_ns:
+            self.latency.record("candle_to_order", perf_counter_ns() - self._candle_start_ns)
         if result.filled_price is not None:
             fsm_action = "enter_long" if signal.action == "enter_long" else "enter_short"
             self.fsm.transition(fsm_action)
@@ -393,11 +633,17 @@ class Trader:
                 entry_price=entry_price,
                 stop_price=signal.stop_price,
                 target_price=signal.target_price,
+                quantity=result.filled_quantity or order.quantity,
             )
             if contract is not None:
                 open_kwargs["multiplier"] = contract.multiplier
                 open_kwargs["entry_premium"] = result.filled_price
-            self.positions.open_position(**open_kwargs)
+            pos = self.positions.open_position(**open_kwargs)
+            scale_qty = self.config.risk.scale_out_quantity
+            if contract is None and 0 < scale_qty < pos.quantity and signal.target_price:
+                pct = self.config.risk.scale_out_target_pct
+                pos.scale_out_price = entry_price + pct * (signal.target_price - entry_price)
+                pos.scale_out_quantity = scale_qty
             self.risk.record_trade()
             self._trade_count += 1
             self._active_contract = contract
@@ -413,16 +659,12 @@ class Trader:
 
             entry_label = "enter_long" if signal.action == "enter_long" else "enter_short"
             contract_label = f" ({contract.symbol})" if contract else ""
-            print(f"[ICC] ENTRY: {entry_label} at {entry_price:.2f}{contract_label}", flush=True)
-            logger.info("Trade entered: %s at %.2f%s", entry_label, entry_price, contract_label)
-            entry_data: dict[str, Any] = {
-                "side": side.value,
-                "entry_price": entry_price,
-                "stop_price": signal.stop_price,
-                "target_price": signal.target_price,
-            }
+            logger.info("Trade entered: %s at %.2f%s", entry_label, entry_price, contract_label,
+                        extra={"event": "entry", "action": entry_label, "price": entry_price,
+                               "symbol": contract.symbol if contract else None})
+            option_data = None
             if contract is not None:
-                entry_data["option"] = {
+                option_data = {
                     "symbol": contract.symbol,
                     "strike": contract.strike,
                     "expiration": contract.expiration.isoformat(),
@@ -430,12 +672,17 @@ class Trader:
                     "total_cost": contract.total_cost,
                     "delta": contract.delta,
                 }
-            self._emit("entry", entry_data)
+            self._emit("entry", EntryPayload(
+                side=side.value,
+                entry_price=entry_price,
+                stop_price=signal.stop_price,
+                target_price=signal.target_price,
+                option=option_data,
+            ))
 
             # Persist to DB
-            if self._db is not None:
+            if self._persistence is not None or self._db is not None:
                 try:
-                    from icc.db.repo import create_trade
                     trade_kwargs: dict[str, Any] = {
                         "session_id": self._session_id,
                         "side": side.value,
@@ -443,6 +690,7 @@ class Trader:
                         "stop_price": signal.stop_price or 0.0,
                         "target_price": signal.target_price or 0.0,
                         "instrument_type": self.config.options.instrument_type,
+                        "quantity": pos.quantity,
                     }
                     if contract is not None:
                         trade_kwargs.update({
@@ -453,24 +701,32 @@ class Trader:
                             "option_entry_premium": contract.premium,
                             "option_multiplier": contract.multiplier,
                         })
-                    rec = create_trade(self._db, **trade_kwargs)
-                    self._open_trade_id = rec.id
+                    with self._stage("db_persist"):
+                        if self._persistence is not None:
+                            self._open_trade_id = self._persistence.create_trade(**trade_kwargs)
+                        else:
+                            from icc.db.repo import create_trade
+                            self._open_trade_id = create_trade(self._db, **trade_kwargs).id
                 except Exception as e:
                     logger.error("Failed to persist trade entry: %s", e)
         else:
             logger.warning("Order rejected, resetting FSM")
             self.fsm.transition("invalidate")
 
-    def _exit_position(self, exit_price: float, reason: str) -> None:
+    def _exit_position(self, exit_price: float, reason: str,
+                       premium: float | None = None) -> None:
         pos = self.positions.position
         entry_price = pos.entry_price if pos else 0.0
         side = pos.side.value if pos else "UNKNOWN"
         was_option = pos.is_option if pos else False
+        quantity = pos.quantity if pos else 1
 
         # For options, exit_price must be the option premium, not the underlying price.
         # Callers like _check_exit pass the underlying stop/target price — override here.
-        if was_option and reason not in ("premium_stop", "premium_trail_stop", "expiration_guard"):
-            # These two reasons already pass the premium; all others need conversion.
+        if was_option and premium is not None:
+            exit_price = premium
+        elif was_option and reason not in ("premium_stop", "premium_trail_stop", "expiration_guard"):
+            # These reasons already pass the premium; all others need conversion.
             live_premium = self._get_current_premium_safe()
             if live_premium is not None:
                 exit_price = live_premium
@@ -484,9 +740,9 @@ class Trader:
 
         # For options, use option commission instead of futures commission
         if was_option:
-            commission = self.config.options.option_commission_per_side * 2
+            commission = self.config.options.option_commission_per_side * 2 * quantity
         else:
-            commission = self.risk.compute_commission(sides=2)
+            commission = self.risk.compute_commission(sides=2) * quantity
 
         pnl = self.positions.close_position(exit_price, commission)
         self._win_tracker.record(pnl)
@@ -499,8 +755,9 @@ class Trader:
         self.fsm.transition(fsm_reason)
         self.fsm.transition("reset")
         self.strategy.reset()
-        print(f"[ICC] EXIT ({reason}): PnL=${pnl:.2f}, daily=${self.risk.state.daily_pnl:.2f}", flush=True)
-        logger.info("Exit (%s): PnL=%.2f, daily=%.2f", reason, pnl, self.risk.state.daily_pnl)
+        logger.info("Exit (%s): PnL=%.2f, daily=%.2f", reason, pnl, self.risk.state.daily_pnl,
+                    extra={"event": "exit", "reason": reason, "price": exit_price, "pnl": pnl,
+                           "daily_pnl": self.risk.state.daily_pnl})
 
         # Record sale in settlement tracker
         if self._settlement is not None:
@@ -509,7 +766,7 @@ class Trader:
                 # Option proceeds = exit premium * multiplier * qty
                 contract = self._active_contract
                 mult = contract.multiplier if contract else 5.0
-                proceeds = max(0.0, exit_price * mult)
+                proceeds = max(0.0, exit_price * mult * quantity)
                 # Cash-settled underlyings (e.g. SPX) — no T+1 delay
                 underlying = contract.underlying if contract else self.config.options.underlying
                 if underlying in self.config.options.cash_settled_underlyings:
@@ -517,20 +774,21 @@ class Trader:
                 else:
                     self._settlement.record_sale(proceeds, trade_id)
             else:
-                proceeds = max(0.0, pnl + self.risk.compute_commission(sides=2))
+                proceeds = max(0.0, pnl + self.risk.compute_commission(sides=2) * quantity)
                 self._settlement.record_sale(proceeds, trade_id)
 
-        exit_data: dict[str, Any] = {
-            "side": side,
-            "entry_price": entry_price,
-            "exit_price": exit_price,
-            "pnl": pnl,
-            "reason": reason,
-            "daily_pnl": self.risk.state.daily_pnl,
-        }
-        if self._active_contract is not None:
-            exit_data["option"] = {"symbol": self._active_contract.symbol}
-        self._emit("exit", exit_data)
+        self._emit("exit", ExitPayload(
+            side=side,
+            entry_price=entry_price,
+            exit_price=exit_price,
+            pnl=pnl,
+            reason=reason,
+            daily_pnl=self.risk.state.daily_pnl,
+            option=(
+                {"symbol": self._active_contract.symbol}
+                if self._active_contract is not None else None
+            ),
+        ))
 
         # Capture exit premium before clearing contract
         option_exit_premium = exit_price if was_option else None
@@ -539,11 +797,17 @@ class Trader:
         self._active_contract = None
         self._cached_premium = None
         # Persist exit to DB
-        if self._db is not None and self._open_trade_id is not None:
+        has_store = self._persistence is not None or self._db is not None
+        if self._open_trade_id is not None and has_store:
             try:
-                from icc.db.repo import close_trade
-                close_trade(self._db, self._open_trade_id, exit_price, pnl, reason,
-                            option_exit_premium=option_exit_premium)
+                with self._stage("db_persist"):
+                    if self._persistence is not None:
+                        self._persistence.close_trade(self._open_trade_id, exit_price, pnl, reason,
+                                                      option_exit_premium=option_exit_premium)
+                    else:
+                        from icc.db.repo import close_trade
+                        close_trade(self._db, self._open_trade_id, exit_price, pnl, reason,
+                                    option_exit_premium=option_exit_premium)
                 self._open_trade_id = None
             except Exception as e:
                 logger.error("Failed to persist trade exit: %s", e)
@@ -551,6 +815,28 @@ class Trader:
         if self.alert_router and pnl < 0:
             self.alert_router.send("trade_loss", f"Loss: ${pnl:.2f}")
 
+    def _scale_out(self, candle: Candle) -> None:
+        """Take scale_out_quantity off at target 1 and move the runner's stop to breakeven."""
+        pos = self.positions.position
+        if pos is None or pos.scale_out_price is None:
+            return
+        qty = pos.scale_out_quantity
+        commission = self.risk.compute_commission(sides=2) * qty
+        pnl = self.positions.scale_out(pos.scale_out_price, qty, commission)
+        pos.scaled_out = True
+        if not pos.breakeven_triggered:
+            pos.stop_price = pos.entry_price
+            pos.breakeven_triggered = True
+        logger.info("Scale-out: %d at %.2f, PnL=%.2f, runner qty=%d",
+                    qty, pos.scale_out_price, pnl, pos.quantity)
+        self._emit("scale_out", {
+            "side": pos.side.value,
+            "quantity": qty,
+            "exit_price": pos.scale_out_price,
+            "pnl": pnl,
+            "remaining_quantity": pos.quantity,
+        })
+
     def _handle_kill_switch(self, candle: Candle) -> None:
         logger.critical("KILL SWITCH ACTIVATED — daily PnL: %.2f", self.risk.state.daily_pnl)
         if not self.positions.is_flat:
@@ -592,7 +878,15 @@ class Trader:
                 )
 
     def get_snapshot(self) -> dict[str, Any]:
-        """Return current trader state as a serializable dict."""
+        """Return current trader state as a serializable dict.
+
+        Taken under the trader lock so the dashboard never sees a
+        half-applied candle or exit.
+        """
+        with self._lock:
+            return self._build_snapshot()
+
+    def _build_snapshot(self) -> dict[str, Any]:
         pos = self.positions.position
         last_candle = self.buffer.last
         last_price = last_candle.close if last_candle else 0.0
@@ -616,6 +910,7 @@ class Trader:
             snapshot["position"] = {
                 "side": pos.side.value,
                 "entry_price": pos.entry_price,
+                "quantity": pos.quantity,
                 "stop_price": pos.stop_price,
                 "target_price": pos.target_price,
                 "bars_held": pos.bars_held,
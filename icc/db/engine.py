@@ -1,29 +1,121 @@
-"""Database engine setup and initialization."""
+"""Database engine setup and initialization.
+
+The trading thread, the write-behind worker, the web read paths and the
+Lumibot strategy can all share one SQLite file. Every file-backed SQLite
+engine is therefore pooled and tuned on connect. WAL lets readers run
+alongside the single writer, ``synchronous=NORMAL`` only fsyncs at WAL
+checkpoints, and ``busy_timeout`` makes writers queue instead of failing
+with "database is locked". A local file connection can't go stale, so
+checkouts skip the pre-ping round trip. Engines are created under a module
+lock, so threads racing on first use share one engine per URL.
+"""
 
 from __future__ import annotations
 
-from sqlalchemy import create_engine, Engine
+import threading
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import create_engine, Engine, event, make_url
 from sqlalchemy.orm import Session, sessionmaker
 
 from icc.db.models import Base
 
 # Support multiple engines keyed by URL
 _engines: dict[str, Engine] = {}
+_read_engines: dict[str, Engine] = {}
 _session_factories: dict[str, sessionmaker[Session]] = {}
+_lock = threading.RLock()
 
 _DEFAULT_URL = "sqlite:///icc_trades.db"
 
+# Applied to every SQLite connection (after journal_mode=WAL on writable files)
+SQLITE_PRAGMAS: dict[str, Any] = {
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,  # ms
+    "cache_size": -65536,  # KiB (64 MiB)
+    "mmap_size": 268435456,  # 256 MiB
+    "temp_store": "MEMORY",
+}
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+
+
+def _is_sqlite_file(db_url: str) -> bool:
+    url = make_url(db_url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def tune_sqlite(engine: Engine, wal: bool = True) -> None:
+    """Apply SQLITE_PRAGMAS (and WAL unless ``wal`` is False) on each new connection."""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record) -> None:
+        cursor = dbapi_conn.cursor()
+        try:
+            if wal:
+                cursor.execute("PRAGMA journal_mode=WAL")
+            for name, value in SQLITE_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def _create_engine(db_url: str, connect_url: str | None = None, read_only: bool = False) -> Engine:
+    if not _is_sqlite_file(db_url):
+        engine = create_engine(db_url, echo=False)
+        if make_url(db_url).get_backend_name() == "sqlite":
+            tune_sqlite(engine, wal=False)  # in-memory: no WAL
+        return engine
+    engine = create_engine(
+        connect_url or db_url, echo=False,
+        pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW,
+    )
+    # A read-only connection can't switch journal mode; it reads WAL files fine
+    tune_sqlite(engine, wal=not read_only)
+    return engine
+
 
 def get_engine(db_url: str = _DEFAULT_URL) -> Engine:
-    if db_url not in _engines:
-        _engines[db_url] = create_engine(db_url, echo=False)
-    return _engines[db_url]
+    engine = _engines.get(db_url)
+    if engine is None:
+        with _lock:
+            engine = _engines.get(db_url)
+            if engine is None:
+                engine = _engines[db_url] = _create_engine(db_url)
+    return engine
+
+
+def get_read_engine(db_url: str = _DEFAULT_URL) -> Engine:
+    """Pooled engine for read paths; file-backed SQLite is opened read-only.
+
+    Unlike init_db this never creates the file or its tables. In-memory
+    SQLite can't be shared across connections, so it gets the normal engine.
+    """
+    engine = _read_engines.get(db_url)
+    if engine is None:
+        with _lock:
+            engine = _read_engines.get(db_url)
+            if engine is None:
+                if _is_sqlite_file(db_url):
+                    path = Path(make_url(db_url).database).resolve().as_posix()
+                    engine = _create_engine(
+                        db_url, f"sqlite:///file:{path}?mode=ro&uri=true", read_only=True,
+                    )
+                else:
+                    engine = get_engine(db_url)
+                _read_engines[db_url] = engine
+    return engine
 
 
 def get_session(db_url: str = _DEFAULT_URL) -> Session:
-    if db_url not in _session_factories:
-        _session_factories[db_url] = sessionmaker(bind=get_engine(db_url))
-    return _session_factories[db_url]()
+    factory = _session_factories.get(db_url)
+    if factory is None:
+        with _lock:
+            factory = _session_factories.get(db_url)
+            if factory is None:
+                factory = _session_factories[db_url] = sessionmaker(bind=get_engine(db_url))
+    return factory()
 
 
 def init_db(db_url: str = _DEFAULT_URL) -> None:
@@ -34,6 +126,10 @@ def init_db(db_url: str = _DEFAULT_URL) -> None:
 
 def reset_engine() -> None:
     """Reset all engines (for testing)."""
-    global _engines, _session_factories
-    _engines = {}
-    _session_factories = {}
+    global _engines, _read_engines, _session_factories
+    with _lock:
+        for engine in {*_engines.values(), *_read_engines.values()}:
+            engine.dispose()
+        _engines = {}
+        _read_engines = {}
+        _session_factories = {}
@@ -0,0 +1,101 @@
+"""DBExecutor — runs blocking database reads off the event loop.
+
+FastAPI routes are ``async def``, so a synchronous SQLAlchemy query inside
+one stalls every WebSocket writer until it returns. Read paths instead
+hand a function to ``DBExecutor.read``, which runs it on a small dedicated
+thread pool against the pooled read-only engine and awaits the result.
+Having its own pool means slow queries can't starve the loop's default
+executor. Writes stay on the trading thread and never touch the loop.
+
+SQLAlchemy's AsyncSession would need an async driver (aiosqlite) for the
+same effect. The engines here are shared with the sync code, so a thread
+pool keeps one driver.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from sqlalchemy import Connection
+
+from icc.db.engine import get_read_engine
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class DBExecutor:
+    """Dedicated thread pool for blocking DB work awaited from async code."""
+
+    def __init__(self, max_workers: int = 4) -> None:
+        self._max_workers = max_workers
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_wait_ms = 0.0
+        self.max_run_ms = 0.0
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self._max_workers, thread_name_prefix="icc-db")
+            return self._pool
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` on the DB pool and await its result."""
+        submitted = time.perf_counter()
+
+        def call() -> T:
+            started = time.perf_counter()
+            self.max_wait_ms = max(self.max_wait_ms, (started - submitted) * 1000.0)
+            try:
+                return fn(*args)
+            finally:
+                self.max_run_ms = max(self.max_run_ms, (time.perf_counter() - started) * 1000.0)
+
+        self.in_flight += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor(), call)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        self.completed += 1
+        return result
+
+    async def read(self, db_url: str, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(conn, *args)`` with a connection from the read-only engine."""
+
+        def work() -> T:
+            with get_read_engine(db_url).connect() as conn:
+                return fn(conn, *args)
+
+        return await self.run(work)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "workers": self._max_workers,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "max_wait_ms": round(self.max_wait_ms, 2),
+            "max_run_ms": round(self.max_run_ms, 2),
+        }
+
+
+db_executor = DBExecutor()
@@ -127,3 +127,12 @@ class RiskStateRecord(Base):
     killed: Mapped[bool] = mapped_column(Boolean, default=False)
     pre_kill_triggered: Mapped[bool] = mapped_column(Boolean, default=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class WriteBehindCheckpointRecord(Base):
+    """Highest write-behind journal seq committed — updated in the same transaction."""
+    __tablename__ = "write_behind_checkpoint"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    seq: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -5,6 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Connection, Row, select
 from sqlalchemy.orm import Session
 
 from icc.db.models import (
@@ -43,6 +44,26 @@ def close_trade(db: Session, trade_id: int, exit_price: float, pnl: float,
     return record
 
 
+# Columns served by /api/trades (everything but rationale/multiplier)
+TRADE_LIST_COLUMNS = (
+    TradeRecord.id, TradeRecord.session_id, TradeRecord.side,
+    TradeRecord.entry_price, TradeRecord.exit_price,
+    TradeRecord.stop_price, TradeRecord.target_price,
+    TradeRecord.quantity, TradeRecord.pnl, TradeRecord.commission,
+    TradeRecord.entry_time, TradeRecord.exit_time, TradeRecord.exit_reason,
+    TradeRecord.instrument_type, TradeRecord.option_underlying,
+    TradeRecord.option_right, TradeRecord.option_strike,
+    TradeRecord.option_expiration, TradeRecord.option_entry_premium,
+    TradeRecord.option_exit_premium,
+)
+
+
+def recent_trade_rows(conn: Connection, limit: int) -> list[Row]:
+    """Newest-first trade rows (TRADE_LIST_COLUMNS only), without ORM hydration."""
+    stmt = select(*TRADE_LIST_COLUMNS).order_by(TradeRecord.entry_time.desc()).limit(limit)
+    return list(conn.execute(stmt))
+
+
 def get_session_trades(db: Session, session_id: str) -> list[TradeRecord]:
     return db.query(TradeRecord).filter(TradeRecord.session_id == session_id).all()
 
@@ -0,0 +1,445 @@
+"""WriteBehindQueue — DB persistence off the trading thread's critical path.
+
+Trade entries/exits, risk-state updates and audit rows are handed to a
+queue and committed by a worker thread in batches, so order handling never
+waits on a SQLite commit/fsync. Guarantees:
+
+* Crash safety: each mutation is appended to a JSON-lines journal before
+  ``create_trade``/``close_trade``/... return. Every batch commit also
+  writes the highest journal seq it covers to ``write_behind_checkpoint``
+  in the same transaction, so on restart exactly the uncommitted tail of
+  the journal is replayed. The journal is truncated whenever the queue
+  drains. Without ``fsync_journal`` the journal survives a process crash
+  but not a power loss.
+* Flush on exit: ``stop`` (also registered with atexit) drains the queue
+  before returning; ``flush`` waits for everything queued so far.
+* Coalescing: only the latest risk state per trading date is written.
+* Poison ops: a batch that fails ``max_attempts`` commits in a row is
+  retried one op at a time. An op that still fails (constraint violation,
+  bad payload) is logged and appended to a dead-letter file
+  (``<journal>.dead``) and skipped, so it cannot block later writes.
+
+``create_trade`` returns a ticket rather than the row id (the row doesn't
+exist yet); ``close_trade`` takes that ticket. A close replayed after a
+restart finds its row by (session_id, entry_time) instead.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import make_url, select
+from sqlalchemy.orm import Session
+
+from icc import metrics
+from icc.db.models import (
+    AuditLogRecord,
+    RiskStateRecord,
+    TradeRecord,
+    WriteBehindCheckpointRecord,
+)
+from icc.serialization import dumps, loads
+
+if TYPE_CHECKING:
+    from icc.config import PersistenceConfig
+
+logger = logging.getLogger(__name__)
+
+CREATE_TRADE = "create_trade"
+CLOSE_TRADE = "close_trade"
+RISK_STATE = "risk_state"
+AUDIT = "audit"
+
+_DATETIME_FIELDS = ("entry_time", "exit_time", "timestamp")
+
+
+@dataclass(slots=True)
+class _Op:
+    seq: int
+    kind: str
+    data: dict[str, Any]
+
+
+def default_journal_path(db_url: str) -> str | None:
+    """``<db file>.wbq`` next to a file-backed SQLite DB, else None."""
+    url = make_url(db_url)
+    if url.get_backend_name() != "sqlite" or not url.database or url.database == ":memory:":
+        return None
+    return f"{url.database}.wbq"
+
+
+def start_write_behind(db_url: str, config: PersistenceConfig) -> WriteBehindQueue | None:
+    """A started queue for ``db_url`` per config, or None if write-behind is off."""
+    if not config.write_behind:
+        return None
+    queue = WriteBehindQueue(
+        db_url,
+        journal_path=default_journal_path(db_url) if config.journal else None,
+        batch_size=config.batch_size,
+        flush_interval_sec=config.flush_interval_sec,
+        fsync_journal=config.fsync_journal,
+        max_attempts=config.max_attempts,
+    )
+    queue.start()
+    return queue
+
+
+class WriteBehindQueue:
+    """Queues DB mutations and commits them in batches on a worker thread."""
+
+    def __init__(
+        self,
+        db_url: str,
+        journal_path: str | None = None,
+        batch_size: int = 200,
+        flush_interval_sec: float = 0.05,
+        fsync_journal: bool = False,
+        name: str = "default",
+        max_attempts: int = 3,
+        dead_letter_path: str | None = None,
+    ) -> None:
+        self._db_url = db_url
+        self._journal_path = journal_path
+        self._dead_letter_path = dead_letter_path or (
+            f"{journal_path}.dead" if journal_path else None)
+        self._max_attempts = max(1, max_attempts)
+        self._batch_size = batch_size
+        self._interval = flush_interval_sec
+        self._fsync = fsync_journal
+        self._name = name
+        self._cond = threading.Condition()
+        self._pending: deque[_Op] = deque()
+        self._risk: dict[str, _Op] = {}  # trading_date -> latest state
+        self._refs: dict[int, int] = {}  # create ticket -> trade row id
+        self._open_trades: dict[int, tuple[str | None, datetime]] = {}  # ticket -> (session_id, entry_time)
+        self._journal = None
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self._seq = 0
+        self.durable_seq = 0
+        self.committed = 0
+        self.batches = 0
+        self.coalesced = 0
+        self.replayed = 0
+        self.errors = 0
+        self.dead_lettered = 0
+        self.max_batch_ms = 0.0
+
+    # -- lifecycle ----------------------------------------------------------
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Replay any uncommitted journal tail, then start the worker."""
+        if self.is_running:
+            return
+        from icc.db.engine import init_db
+        init_db(self._db_url)
+        self._stopping = False
+        self._replay()
+        if self._journal_path:
+            self._journal = open(self._journal_path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        if self.replayed:
+            # Replayed risk state must be in the DB before anyone hydrates from it
+            self.flush()
+        logger.info("Write-behind persistence started for %s", self._db_url)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Commit everything still queued, then stop the worker."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.error("Write-behind worker did not drain within %.1fs", timeout)
+            self._thread = None
+        with self._cond:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+        atexit.unregister(self.stop)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until everything queued so far is committed."""
+        with self._cond:
+            target = self._seq
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self.durable_seq >= target, timeout)
+
+    # -- producers (trading thread) -----------------------------------------
+
+    def create_trade(self, **fields: Any) -> int:
+        """Queue a TradeRecord insert; returns the ticket for ``close_trade``."""
+        fields.setdefault("entry_time", datetime.utcnow())
+        ticket = self._submit(CREATE_TRADE, fields)
+        self._open_trades[ticket] = (fields.get("session_id"), fields["entry_time"])
+        return ticket
+
+    def close_trade(self, ticket: int, exit_price: float, pnl: float, exit_reason: str,
+                    option_exit_premium: float | None = None) -> None:
+        data: dict[str, Any] = {
+            "ticket": ticket, "exit_price": exit_price, "pnl": pnl,
+            "exit_reason": exit_reason, "exit_time": datetime.utcnow(),
+            "option_exit_premium": option_exit_premium,
+        }
+        key = self._open_trades.pop(ticket, None)
+        if key is not None:
+            data["session_id"], data["entry_time"] = key
+        self._submit(CLOSE_TRADE, data)
+
+    def put_risk_state(self, trading_date: str, **fields: Any) -> None:
+        """Queue the RiskStateRecord for ``trading_date``; replaces any queued one."""
+        self._submit(RISK_STATE, {"trading_date": trading_date, **fields})
+
+    def log_audit(self, action: str, **fields: Any) -> None:
+        fields.setdefault("timestamp", datetime.utcnow())
+        self._submit(AUDIT, {"action": action, **fields})
+
+    def _submit(self, kind: str, data: dict[str, Any]) -> int:
+        with self._cond:
+            self._seq += 1
+            op = _Op(self._seq, kind, data)
+            self._write_journal(op)
+            self._enqueue(op)
+            self._cond.notify_all()
+            return op.seq
+
+    def _enqueue(self, op: _Op) -> None:
+        if op.kind == RISK_STATE:
+            if op.data["trading_date"] in self._risk:
+                self.coalesced += 1
+            self._risk[op.data["trading_date"]] = op
+        else:
+            self._pending.append(op)
+
+    # -- journal ------------------------------------------------------------
+
+    def _write_journal(self, op: _Op) -> None:
+        if self._journal is None:
+            return
+        self._journal.write(dumps({"seq": op.seq, "kind": op.kind, "data": op.data}) + "\n")
+        self._journal.flush()
+        if self._fsync:
+            os.fsync(self._journal.fileno())
+
+    def _replay(self) -> None:
+        checkpoint = self._load_checkpoint()
+        self._seq = max(self._seq, checkpoint)
+        self.durable_seq = checkpoint
+        path = self._journal_path
+        if not path or not Path(path).exists():
+            return
+        for line in Path(path).read_text(encoding="utf-8").splitlines():
+            try:
+                entry = loads(line)
+            except ValueError:
+                logger.warning("Skipping torn write-behind journal line")
+                continue  # a crash mid-write leaves at most one partial line
+            self._seq = max(self._seq, entry["seq"])
+            if entry["seq"] <= checkpoint:
+                continue
+            data = entry["data"]
+            for key in _DATETIME_FIELDS:
+                if isinstance(data.get(key), str):
+                    data[key] = datetime.fromisoformat(data[key])
+            self._enqueue(_Op(entry["seq"], entry["kind"], data))
+            self.replayed += 1
+        if self.replayed:
+            logger.warning("Replaying %d uncommitted write-behind ops from %s", self.replayed, path)
+
+    def _load_checkpoint(self) -> int:
+        from icc.db.engine import get_session
+        db = get_session(self._db_url)
+        try:
+            row = db.get(WriteBehindCheckpointRecord, self._name)
+            return row.seq if row is not None else 0
+        finally:
+            db.close()
+
+    # -- worker -------------------------------------------------------------
+
+    def _run(self) -> None:
+        from icc.db.engine import get_session
+        db = get_session(self._db_url)
+        backoff = self._interval
+        attempts = 0
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(
+                        lambda: self._stopping or self._pending or self._risk, self._interval,
+                    )
+                    if not (self._pending or self._risk):
+                        if self._stopping:
+                            return
+                        continue
+                    ops = [self._pending.popleft()
+                           for _ in range(min(self._batch_size, len(self._pending)))]
+                    risk, self._risk = self._risk, {}
+                    # Everything below the oldest op still queued is covered by this batch
+                    upto = self._pending[0].seq - 1 if self._pending else self._seq
+                batch = ops + list(risk.values())
+                try:
+                    if attempts >= self._max_attempts:
+                        self._commit_singly(db, batch, upto)
+                    else:
+                        self._commit(db, batch, upto)
+                    self._truncate_if_drained()
+                    backoff = self._interval
+                    attempts = 0
+                except Exception as e:
+                    self.errors += 1
+                    attempts += 1
+                    logger.warning("Write-behind commit failed (%d ops, attempt %d, retrying): %s",
+                                   len(batch), attempts, e)
+                    db.rollback()
+                    with self._cond:
+                        self._pending.extendleft(reversed([op for op in batch
+                                                           if op.kind != RISK_STATE]))
+                        for op in batch:
+                            if op.kind == RISK_STATE:
+                                self._risk.setdefault(op.data["trading_date"], op)
+                        if self._stopping and backoff > 5.0:
+                            logger.error("Giving up on %d write-behind ops at shutdown",
+                                         len(self._pending) + len(self._risk))
+                            return
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, 10.0)
+        finally:
+            db.close()
+
+    def _commit_singly(self, db: Session, batch: list[_Op], upto: int) -> None:
+        """Commit ``batch`` one op at a time, dead-lettering ops that fail.
+
+        ``batch`` is consumed in seq order as ops are settled, so on a
+        failure that is not the op's own (e.g. the checkpoint commit) the
+        caller requeues only what is left. After each op the checkpoint
+        advances to just below the next one, so a crash never replays a
+        settled op (and the journal is kept until the whole batch settles).
+        """
+        batch.sort(key=lambda op: op.seq)
+        while batch:
+            op = batch[0]
+            checkpoint = min(upto, batch[1].seq - 1) if len(batch) > 1 else upto
+            try:
+                self._commit(db, [op], checkpoint)
+            except Exception as e:
+                db.rollback()
+                self._dead_letter(op, e)
+                # Settled even if the checkpoint commit below fails: a replay
+                # may dead-letter it again, the live queue will not
+                batch.pop(0)
+                self._commit(db, [], checkpoint)
+                continue
+            batch.pop(0)
+
+    def _truncate_if_drained(self) -> None:
+        """Empty the journal once nothing is queued or in flight."""
+        with self._cond:
+            if not self._pending and not self._risk and self._journal is not None:
+                self._journal.truncate(0)
+                self._journal.seek(0)
+
+    def _dead_letter(self, op: _Op, error: Exception) -> None:
+        self.dead_lettered += 1
+        logger.error("Write-behind op %d (%s) cannot be committed; dead-lettered%s: %s",
+                     op.seq, op.kind,
+                     f" to {self._dead_letter_path}" if self._dead_letter_path else "", error)
+        if self._dead_letter_path is None:
+            return
+        try:
+            with open(self._dead_letter_path, "a", encoding="utf-8") as f:
+                f.write(dumps({"seq": op.seq, "kind": op.kind, "data": op.data,
+                               "error": str(error), "at": datetime.utcnow()}) + "\n")
+        except OSError as e:
+            logger.error("Could not write dead-letter file %s: %s", self._dead_letter_path, e)
+
+    def _commit(self, db: Session, ops: list[_Op], upto: int) -> None:
+        started = time.perf_counter()
+        new_refs: dict[int, int] = {}
+        for op in ops:
+            if op.kind == CREATE_TRADE:
+                record = TradeRecord(**op.data)
+                db.add(record)
+                db.flush()
+                new_refs[op.seq] = record.id
+            elif op.kind == CLOSE_TRADE:
+                self._apply_close(db, op.data, new_refs)
+            elif op.kind == RISK_STATE:
+                fields = dict(op.data)
+                row = db.get(RiskStateRecord, fields["trading_date"])
+                if row is None:
+                    row = RiskStateRecord(trading_date=fields["trading_date"])
+                    db.add(row)
+                for key, value in fields.items():
+                    setattr(row, key, value)
+            elif op.kind == AUDIT:
+                db.add(AuditLogRecord(**op.data))
+        checkpoint = db.get(WriteBehindCheckpointRecord, self._name)
+        if checkpoint is None:
+            checkpoint = WriteBehindCheckpointRecord(name=self._name)
+            db.add(checkpoint)
+        checkpoint.seq = upto
+        db.commit()
+
+        elapsed = time.perf_counter() - started
+        metrics.db_commit_seconds.observe(elapsed)
+        elapsed_ms = elapsed * 1000.0
+        with self._cond:
+            self._refs.update(new_refs)
+            self.durable_seq = max(self.durable_seq, upto)
+            self.committed += len(ops)
+            self.batches += 1
+            self.max_batch_ms = max(self.max_batch_ms, elapsed_ms)
+            self._cond.notify_all()
+
+    def _apply_close(self, db: Session, data: dict[str, Any], new_refs: dict[int, int]) -> None:
+        ticket = data["ticket"]
+        trade_id = new_refs.get(ticket) or self._refs.get(ticket)
+        record = db.get(TradeRecord, trade_id) if trade_id is not None else None
+        if record is None and data.get("entry_time") is not None:
+            record = db.scalars(
+                select(TradeRecord).where(
+                    TradeRecord.session_id == data.get("session_id"),
+                    TradeRecord.entry_time == data["entry_time"],
+                )
+            ).first()
+        if record is None:
+            logger.error("Write-behind close for unknown trade (ticket %d) dropped", ticket)
+            return
+        record.exit_price = data["exit_price"]
+        record.pnl = data["pnl"]
+        record.exit_time = data["exit_time"]
+        record.exit_reason = data["exit_reason"]
+        if data.get("option_exit_premium") is not None:
+            record.option_exit_premium = data["option_exit_premium"]
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._cond:
+            queued = len(self._pending) + len(self._risk)
+        return {
+            "running": self.is_running,
+            "queued": queued,
+            "committed": self.committed,
+            "batches": self.batches,
+            "coalesced": self.coalesced,
+            "replayed": self.replayed,
+            "errors": self.errors,
+            "dead_lettered": self.dead_lettered,
+            "max_batch_ms": round(self.max_batch_ms, 2),
+        }
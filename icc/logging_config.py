@@ -1,59 +1,170 @@
-"""Logging configuration: rotating file handlers for icc.log, trades.log, errors.log."""
+"""Logging configuration: queued, structured logging to icc.log, trades.log, errors.log.
+
+Callers on the trading thread only enqueue records. A ``QueueHandler`` on
+the ``icc`` logger hands each record to a ``QueueListener`` thread, which
+owns the console and rotating file handlers, so formatting beyond the
+message itself and all disk I/O happen off the trading thread.
+
+File logs are JSON lines (one object per record) unless ``json_files`` is
+off. Fields passed through ``extra=`` become top-level keys, which is how
+the trader tags entries and exits (``event``, ``price``, ``pnl``, ...)
+for post-session analysis. The console stays human-readable.
+"""
 
 from __future__ import annotations
 
+import atexit
+import copy
 import logging
-import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Any, Optional
+
+from icc import serialization
+
+TRADE_LOGGERS = ("icc.core.trader", "icc.oms")
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 5
+
+# Attributes every LogRecord has; anything else on a record came from ``extra=``
+_RESERVED = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, msg, extras, exc."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        out: dict[str, Any] = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                out[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            out["exc"] = record.exc_text
+        try:
+            return serialization.dumps(out)
+        except TypeError:
+            return serialization.dumps({k: v if isinstance(v, (str, int, float, bool, type(None)))
+                                        else repr(v) for k, v in out.items()})
+
+
+class _StructuredQueueHandler(QueueHandler):
+    """QueueHandler that keeps extras and the traceback as separate fields.
+
+    The stock ``prepare`` formats the record into a single string; here
+    only the message is merged with its args (already gated by level),
+    and the traceback is rendered to ``exc_text`` while the frames are
+    still alive.
+    """
 
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
-def setup_logging(log_dir: str = "logs", level: str = "INFO") -> None:
-    """Configure rotating file handlers and console output.
+
+class _NameFilter(logging.Filter):
+    """Pass records from any of ``names`` or their children."""
+
+    def __init__(self, names: tuple[str, ...]) -> None:
+        super().__init__()
+        self._names = names
+        self._prefixes = tuple(f"{n}." for n in names)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.name in self._names or record.name.startswith(self._prefixes)
+
+
+def setup_logging(log_dir: str = "logs", level: str = "INFO", json_files: bool = True) -> QueueListener:
+    """Configure queued console and rotating file output for the ``icc`` loggers.
 
     Creates three log files:
     - icc.log: all messages (5MB, 5 backups)
     - trades.log: only trade-related messages (icc.core.trader, icc.oms)
     - errors.log: WARNING and above
+
+    Calling it again replaces the previous configuration. The listener is
+    stopped (and the queue flushed) at interpreter exit, or by
+    ``shutdown_logging``.
     """
+    global _listener, _queue_handler
+    shutdown_logging()
+
     log_path = Path(log_dir)
     log_path.mkdir(parents=True, exist_ok=True)
 
     root = logging.getLogger("icc")
     root.setLevel(getattr(logging, level.upper(), logging.INFO))
 
-    fmt = logging.Formatter(
+    text = logging.Formatter(
         "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
+    file_fmt = JsonFormatter() if json_files else text
 
     # Console handler
     console = logging.StreamHandler()
     console.setLevel(logging.INFO)
-    console.setFormatter(fmt)
-    root.addHandler(console)
+    console.setFormatter(text)
 
     # Main log — all messages
     main_handler = RotatingFileHandler(
-        log_path / "icc.log", maxBytes=5 * 1024 * 1024, backupCount=5
+        log_path / "icc.log", maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT
     )
     main_handler.setLevel(logging.DEBUG)
-    main_handler.setFormatter(fmt)
-    root.addHandler(main_handler)
+    main_handler.setFormatter(file_fmt)
 
     # Trades log — filtered to trader/oms loggers
     trades_handler = RotatingFileHandler(
-        log_path / "trades.log", maxBytes=5 * 1024 * 1024, backupCount=5
+        log_path / "trades.log", maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT
     )
     trades_handler.setLevel(logging.INFO)
-    trades_handler.setFormatter(fmt)
-    for name in ("icc.core.trader", "icc.oms"):
-        logging.getLogger(name).addHandler(trades_handler)
+    trades_handler.setFormatter(file_fmt)
+    trades_handler.addFilter(_NameFilter(TRADE_LOGGERS))
 
     # Errors log — WARNING+
     error_handler = RotatingFileHandler(
-        log_path / "errors.log", maxBytes=5 * 1024 * 1024, backupCount=5
+        log_path / "errors.log", maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT
     )
     error_handler.setLevel(logging.WARNING)
-    error_handler.setFormatter(fmt)
-    root.addHandler(error_handler)
+    error_handler.setFormatter(file_fmt)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = _StructuredQueueHandler(log_queue)
+    root.addHandler(_queue_handler)
+    _listener = QueueListener(
+        log_queue, console, main_handler, trades_handler, error_handler,
+        respect_handler_level=True,
+    )
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Detach the queue handler, drain the queue and close the handlers."""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger("icc").removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,95 @@
+"""BarAggregator — builds 1-min Candles from ticks or sub-minute bars."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from icc.market.candle import Candle
+
+logger = logging.getLogger(__name__)
+
+BAR_SECONDS = 60
+
+
+@dataclass(frozen=True, slots=True)
+class Tick:
+    timestamp: datetime
+    price: float
+    size: int = 0
+    symbol: str = "MES"
+
+
+def minute_floor(ts: datetime) -> datetime:
+    return ts.replace(second=0, microsecond=0)
+
+
+class BarAggregator:
+    """Aggregates a time-ordered stream into bars on exact minute boundaries.
+
+    ``add_tick`` / ``add_bar`` return the completed Candle when the input
+    belongs to a later minute than the bar in progress, otherwise None.
+    ``partial`` is the bar in progress so far. ``flush(now)`` closes the
+    current bar once the clock has passed its end, for quiet markets where
+    no next tick arrives to close it. Minutes with no trades produce no bar.
+    """
+
+    def __init__(self, symbol: str = "MES") -> None:
+        self.symbol = symbol
+        self._start: datetime | None = None
+        self._open = self._high = self._low = self._close = 0.0
+        self._volume = 0
+        self.late_ticks = 0
+
+    @property
+    def partial(self) -> Candle | None:
+        if self._start is None:
+            return None
+        return Candle(
+            timestamp=self._start,
+            open=self._open, high=self._high, low=self._low, close=self._close,
+            volume=self._volume, symbol=self.symbol,
+        )
+
+    def add_tick(self, tick: Tick) -> Candle | None:
+        return self._add(tick.timestamp, tick.price, tick.price, tick.price,
+                         tick.price, tick.size)
+
+    def add_bar(self, bar: Candle) -> Candle | None:
+        """Merge a sub-minute bar (e.g. IB 5-second realtime bar)."""
+        return self._add(bar.timestamp, bar.open, bar.high, bar.low,
+                         bar.close, bar.volume)
+
+    def flush(self, now: datetime | None = None) -> Candle | None:
+        """Close the bar in progress if ``now`` is past its end (always if None)."""
+        if self._start is None:
+            return None
+        if now is not None and now < self._start + timedelta(seconds=BAR_SECONDS):
+            return None
+        done = self.partial
+        self._start = None
+        return done
+
+    def _add(self, ts: datetime, o: float, h: float, l: float, c: float,
+             volume: int) -> Candle | None:
+        start = minute_floor(ts)
+        done: Candle | None = None
+        if self._start is not None:
+            if start < self._start:
+                self.late_ticks += 1
+                logger.debug("Dropping late tick at %s (bar %s)", ts, self._start)
+                return None
+            if start > self._start:
+                done = self.flush()
+
+        if self._start is None:
+            self._start = start
+            self._open, self._high, self._low, self._close = o, h, l, c
+            self._volume = volume
+        else:
+            self._high = max(self._high, h)
+            self._low = min(self._low, l)
+            self._close = c
+            self._volume += volume
+        return done
@@ -0,0 +1,173 @@
+"""BarFetcher — concurrent, incremental 1-min bar fetching for many tickers.
+
+The multi-ticker Lumibot loop used to download each ticker's whole day of
+1-min bars serially and keep only the last row. BarFetcher instead:
+
+- fetches all tickers on a bounded thread pool (I/O bound, so threads
+  overlap the HTTP round trips),
+- asks only for bars since the last timestamp it has seen per ticker,
+- returns every new completed bar in order (so a slow iteration doesn't
+  drop bars); the newest bar yfinance returns is still forming, so it is
+  held back until a later bar shows up,
+- records per-ticker fetch latency.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional, Sequence
+
+from icc.market.candle import Candle
+
+logger = logging.getLogger(__name__)
+
+# (ticker, since) -> bars ascending by timestamp. since=None means "today".
+HistoryFn = Callable[[str, Optional[datetime]], list[Candle]]
+
+
+def yf_history(ticker: str, since: datetime | None) -> list[Candle]:
+    """1-min bars from yfinance: today's session, or from ``since`` onward."""
+    from icc.broker.option_chain import _yf_get_ticker
+    yf_ticker = _yf_get_ticker(ticker)
+    if since is None:
+        df = yf_ticker.history(period="1d", interval="1m")
+    else:
+        df = yf_ticker.history(start=since, interval="1m")
+    if df.empty:
+        return []
+    return [
+        Candle(
+            timestamp=ts.to_pydatetime(),
+            open=float(row["Open"]),
+            high=float(row["High"]),
+            low=float(row["Low"]),
+            close=float(row["Close"]),
+            volume=int(row.get("Volume", 0)),
+            symbol=ticker,
+        )
+        for ts, row in df.iterrows()
+    ]
+
+
+@dataclass
+class FetchStats:
+    last_ms: float = 0.0
+    max_ms: float = 0.0
+    total_ms: float = 0.0
+    fetches: int = 0
+    errors: int = 0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.fetches if self.fetches else 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        self.last_ms = elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.total_ms += elapsed_ms
+        self.fetches += 1
+
+
+class BarFetcher:
+    """Fetch new 1-min bars for a set of tickers in parallel."""
+
+    def __init__(self, history_fn: HistoryFn = yf_history, max_workers: int = 4,
+                 timeout_sec: float = 20.0) -> None:
+        self._history_fn = history_fn
+        self._max_workers = max(1, max_workers)
+        self._timeout_sec = timeout_sec
+        self._pool: ThreadPoolExecutor | None = None
+        self._last_seen: dict[str, datetime] = {}
+        self.stats: dict[str, FetchStats] = {}
+
+    def fetch(self, tickers: Sequence[str]) -> dict[str, list[Candle]]:
+        """New bars per ticker since the previous fetch.
+
+        The first fetch for a ticker returns only its latest completed bar
+        (the live loop should not replay the morning). A ticker whose request fails or
+        times out maps to an empty list and is retried from the same point
+        next time.
+        """
+        if not tickers:
+            return {}
+        since = {t: self._last_seen.get(t) for t in tickers}
+        if len(tickers) == 1:
+            ticker = tickers[0]
+            return {ticker: self._accept(ticker, since[ticker],
+                                         self._download(ticker, since[ticker]))}
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="bar-fetch",
+            )
+        futures = {t: self._pool.submit(self._download, t, since[t]) for t in tickers}
+        deadline = time.monotonic() + self._timeout_sec
+        result: dict[str, list[Candle]] = {}
+        for ticker, future in futures.items():
+            try:
+                bars = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                logger.warning("Bar fetch for %s timed out after %.0fs", ticker, self._timeout_sec)
+                self._stats(ticker).errors += 1
+                bars = []
+            result[ticker] = self._accept(ticker, since[ticker], bars)
+        return result
+
+    def _download(self, ticker: str, since: datetime | None) -> list[Candle]:
+        """Run on a worker thread: call history_fn and time it."""
+        stats = self._stats(ticker)
+        start = time.perf_counter()
+        try:
+            bars = self._history_fn(ticker, since)
+        except Exception as e:
+            logger.debug("Bar fetch for %s failed: %s", ticker, e)
+            stats.errors += 1
+            bars = []
+        stats.record((time.perf_counter() - start) * 1000.0)
+        return bars
+
+    def _accept(self, ticker: str, since: datetime | None,
+                bars: list[Candle]) -> list[Candle]:
+        """Keep completed bars newer than ``since`` and advance the ticker's cursor.
+
+        The last bar is dropped: it is still forming, and once the cursor
+        passed it its final version would never be delivered.
+        """
+        bars = bars[:-1]
+        if since is None:
+            bars = bars[-1:]
+        else:
+            bars = [b for b in bars if b.timestamp > since]
+        if bars:
+            self._last_seen[ticker] = bars[-1].timestamp
+        return bars
+
+    def _stats(self, ticker: str) -> FetchStats:
+        stats = self.stats.get(ticker)
+        if stats is None:
+            stats = self.stats[ticker] = FetchStats()
+        return stats
+
+    def last_seen(self, ticker: str) -> datetime | None:
+        return self._last_seen.get(ticker)
+
+    def get_latency_stats(self) -> dict[str, dict]:
+        return {
+            ticker: {
+                "last_ms": round(s.last_ms, 1),
+                "avg_ms": round(s.avg_ms, 1),
+                "max_ms": round(s.max_ms, 1),
+                "fetches": s.fetches,
+                "errors": s.errors,
+            }
+            for ticker, s in self.stats.items()
+        }
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
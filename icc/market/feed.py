@@ -1,11 +1,16 @@
-"""MarketFeed ABC, ReplayFeed, LiveFeed, SimulatedLiveFeed."""
+"""MarketFeed ABC, ReplayFeed, LiveFeed, SimulatedLiveFeed, TickReplaySource."""
 
 from __future__ import annotations
 
+import queue
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, Optional, Protocol, Sequence
 
+from icc.market.aggregator import BarAggregator, Tick
 from icc.market.candle import Candle
 
 
@@ -45,20 +50,119 @@ class ReplayFeed(MarketFeed):
         self.stop()
 
 
-class LiveFeed(MarketFeed):
-    """Placeholder for live market data feed."""
+@dataclass(frozen=True, slots=True)
+class BarUpdate:
+    candle: Candle
+    final: bool  # False = bar still in progress
+
+
+class TickSource(Protocol):
+    def start(self, feed: LiveFeed) -> None: ...
+    def stop(self) -> None: ...
 
-    def __init__(self) -> None:
+
+class LiveFeed(MarketFeed):
+    """Streams 1-min candles aggregated from live ticks or sub-minute bars.
+
+    Data arrives through ``push_tick`` / ``push_bar`` from any thread: a
+    broker callback (e.g. IB realtime bars) calls them directly, or a
+    TickSource started with the feed does. ``close()`` ends the stream.
+
+    Iterating yields each candle the moment its minute closes. ``updates()``
+    also yields the bar in progress (``final=False``) at most once per
+    ``partial_interval_sec`` of tick time, so intra-bar stop/target checks
+    can run on the consumer thread. With a ``clock``, a bar also closes at
+    its minute boundary when no later tick arrives to close it.
+    """
+
+    def __init__(self, source: Optional[TickSource] = None, symbol: str = "MES",
+                 partial_interval_sec: Optional[float] = 1.0,
+                 clock: Optional[Callable[[], datetime]] = None,
+                 poll_sec: float = 0.25) -> None:
+        self._source = source
+        self._agg = BarAggregator(symbol)
+        self._lock = threading.Lock()
+        self._queue: queue.Queue[BarUpdate | None] = queue.Queue()
+        self._partial_interval = (
+            None if partial_interval_sec is None else timedelta(seconds=partial_interval_sec)
+        )
+        self._last_partial_at: datetime | None = None
+        self._clock = clock
+        self._poll_sec = poll_sec
         self._running = False
 
     def start(self) -> None:
+        if self._running:
+            return
         self._running = True
+        if self._source is not None:
+            self._source.start(self)
 
     def stop(self) -> None:
         self._running = False
+        if self._source is not None:
+            self._source.stop()
+        self._queue.put(None)
+
+    def close(self) -> None:
+        """End of stream: emit the bar in progress as final, then end iteration."""
+        with self._lock:
+            done = self._agg.flush()
+            if done is not None:
+                self._queue.put(BarUpdate(done, True))
+            self._queue.put(None)
+
+    @property
+    def partial(self) -> Candle | None:
+        with self._lock:
+            return self._agg.partial
+
+    @property
+    def late_ticks(self) -> int:
+        return self._agg.late_ticks
+
+    def push_tick(self, tick: Tick) -> None:
+        self._push(self._agg.add_tick, tick, tick.timestamp)
+
+    def push_bar(self, bar: Candle) -> None:
+        self._push(self._agg.add_bar, bar, bar.timestamp)
+
+    def _push(self, add, item, ts: datetime) -> None:
+        with self._lock:
+            done = add(item)
+            if done is not None:
+                self._queue.put(BarUpdate(done, True))
+            if self._partial_interval is None:
+                return
+            if (done is not None or self._last_partial_at is None
+                    or ts - self._last_partial_at >= self._partial_interval):
+                self._last_partial_at = ts
+                self._queue.put(BarUpdate(self._agg.partial, False))
+
+    def updates(self) -> Iterator[BarUpdate]:
+        """Yield completed and in-progress bars in arrival order."""
+        self.start()
+        try:
+            while self._running:
+                try:
+                    update = self._queue.get(timeout=self._poll_sec)
+                except queue.Empty:
+                    if self._clock is not None:
+                        with self._lock:
+                            done = self._agg.flush(self._clock())
+                            if done is not None:
+                                self._queue.put(BarUpdate(done, True))
+                    continue
+                if update is None:
+                    break
+                yield update
+        finally:
+            self._running = False
 
     def __iter__(self) -> Iterator[Candle]:
-        raise NotImplementedError("LiveFeed requires broker integration")
+        for update in self.updates():
+            if update.final:
+                yield update.candle
 
 
 class SimulatedLiveFeed(MarketFeed):
@@ -83,3 +187,54 @@ class SimulatedLiveFeed(MarketFeed):
             time.sleep(self._delay)
             yield candle
         self.stop()
+
+
+def ticks_from_candles(candles: Sequence[Candle]) -> list[Tick]:
+    """Four ticks per candle along its O -> extreme -> extreme -> C path.
+
+    Bullish bars visit the low first, bearish bars the high; volume lands on
+    the close tick. Re-aggregating the ticks reproduces the candles.
+    """
+    ticks: list[Tick] = []
+    for c in candles:
+        first, second = (c.low, c.high) if c.is_bullish else (c.high, c.low)
+        path = ((0, c.open, 0), (15, first, 0), (30, second, 0), (45, c.close, c.volume))
+        for sec, price, size in path:
+            ticks.append(Tick(
+                timestamp=c.timestamp + timedelta(seconds=sec),
+                price=price, size=size, symbol=c.symbol,
+            ))
+    return ticks
+
+
+class TickReplaySource:
+    """TickSource that replays recorded ticks or sub-minute bars on a thread.
+
+    Stand-in for a broker's realtime stream in tests and demos.
+    """
+
+    def __init__(self, items: Sequence[Tick | Candle], delay: float = 0.0) -> None:
+        self._items = items
+        self._delay = delay
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, feed: LiveFeed) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, args=(feed,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self, feed: LiveFeed) -> None:
+        for item in self._items:
+            if self._stopped.is_set():
+                return
+            if isinstance(item, Tick):
+                feed.push_tick(item)
+            else:
+                feed.push_bar(item)
+            if self._delay:
+                time.sleep(self._delay)
+        feed.close()
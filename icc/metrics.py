@@ -0,0 +1,272 @@
+"""Metrics — in-process registry rendered in the Prometheus text format.
+
+Served at ``/metrics``. No client library is needed; the registry
+implements the counter, gauge and histogram types of exposition format
+0.0.4.
+
+Label values are passed as a tuple of strings. The trading thread never
+takes a lock to record: counters and histograms keep one shard per
+recording thread (a ``threading.local`` dict) that only that thread
+writes, and a scrape sums the shards, copying each dict in one GIL-held
+step. The only lock is taken the first time a thread touches a metric,
+to register its shard. Values owned by other components (EventBus depth,
+WebSocket lag) are gauges read through callbacks at scrape time, so they
+cost nothing between scrapes.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from bisect import bisect_left
+from typing import Callable, Iterable, Optional, Sequence
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+
+_WORD = re.compile(r"[a-z]+")
+
+LabelKey = tuple[str, ...]
+Sample = tuple[str, LabelKey, float]
+
+
+def reason_label(reason: str) -> str:
+    """Low-cardinality label for a free-form veto/failure reason.
+
+    Drops anything after ``:`` or ``(`` and keeps the alphabetic words, so
+    ``"Max trades (3) reached"`` and ``"Max trades (5) reached"`` share
+    ``max_trades``.
+    """
+    head = re.split(r"[:(]", reason, maxsplit=1)[0].lower()
+    return "_".join(_WORD.findall(head))[:64] or "other"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _check(self, key: LabelKey) -> None:
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for name, key, value in self.samples():
+            lines.append(f"{name}{self._labels(key)} {_format_value(value)}")
+        return lines
+
+    def _labels(self, key: LabelKey, extra: str = "") -> str:
+        names = self.labelnames + (("le",) if extra else ())
+        values = key + ((extra,) if extra else ())
+        if not names:
+            return ""
+        return "{" + ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)) + "}"
+
+
+class _Sharded(_Metric):
+    """Per-thread value shards, summed at scrape."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            with self._lock:
+                self._shards.append(values)
+            return values
+
+    def _snapshots(self) -> list[dict]:
+        with self._lock:
+            shards = list(self._shards)
+        return [dict(shard) for shard in shards]
+
+
+class Counter(_Sharded):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, labels: LabelKey = ()) -> None:
+        shard = self._shard()
+        value = shard.get(labels)
+        if value is None:
+            self._check(labels)
+            value = 0.0
+        shard[labels] = value + amount
+
+    def value(self, labels: LabelKey = ()) -> float:
+        return sum(shard.get(labels, 0.0) for shard in self._snapshots())
+
+    def samples(self) -> Iterable[Sample]:
+        totals: dict[LabelKey, float] = {}
+        for shard in self._snapshots():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0.0) + value
+        for key in sorted(totals):
+            yield self.name, key, totals[key]
+
+
+class Histogram(_Sharded):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: LabelKey = ()) -> None:
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            self._check(labels)
+            # [per-bucket counts..., +Inf count, sum]
+            state = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def count(self, labels: LabelKey = ()) -> int:
+        return sum(sum(s[labels][:-1]) for s in self._snapshots() if labels in s)
+
+    def samples(self) -> Iterable[Sample]:
+        merged: dict[LabelKey, list] = {}
+        for shard in self._snapshots():
+            for key, state in shard.items():
+                state = list(state)
+                total = merged.get(key)
+                merged[key] = state if total is None else [a + b for a, b in zip(total, state)]
+        for key in sorted(merged):
+            state = merged[key]
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), state[:-1]):
+                cumulative += n
+                yield f"{self.name}_bucket", key + (_format_value(bound),), cumulative
+            yield f"{self.name}_sum", key, state[-1]
+            yield f"{self.name}_count", key, cumulative
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        n = len(self.labelnames)
+        for name, key, value in self.samples():
+            if name.endswith("_bucket"):
+                labels = self._labels(key[:n], extra=key[n])
+            else:
+                labels = self._labels(key)
+            lines.append(f"{name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """A value set directly, or read from ``fn`` at scrape time.
+
+    ``fn`` returns either a number (unlabelled) or ``{label_values: number}``.
+    A callback over a total kept elsewhere is exposed with ``kind="counter"``.
+    """
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 fn: Optional[Callable[[], object]] = None, kind: str = "gauge") -> None:
+        super().__init__(name, help, labelnames)
+        self.kind = kind
+        self._fn = fn
+        self._values: dict[LabelKey, float] = {}
+
+    def set(self, value: float, labels: LabelKey = ()) -> None:
+        self._check(labels)
+        self._values[labels] = value
+
+    def samples(self) -> Iterable[Sample]:
+        values = dict(self._values)
+        if self._fn is not None:
+            result = self._fn()
+            if isinstance(result, dict):
+                values.update({
+                    (k if isinstance(k, tuple) else (k,)): float(x) for k, x in result.items()
+                })
+            elif result is not None:
+                values[()] = float(result)
+        for key in sorted(values):
+            yield self.name, key, values[key]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add ``metric``, replacing any metric already registered under its name."""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))  # type: ignore[return-value]
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = (),
+              fn: Optional[Callable[[], object]] = None, kind: str = "gauge") -> Gauge:
+        return self.register(Gauge(name, help, labelnames, fn, kind))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# --- Trading-process metrics -------------------------------------------------
+
+candles_total = REGISTRY.counter(
+    "icc_candles_total", "Completed candles processed by Trader.", ("underlying",))
+signals_total = REGISTRY.counter(
+    "icc_signals_total", "Strategy signals other than none, by action.", ("action",))
+fsm_transitions_total = REGISTRY.counter(
+    "icc_fsm_transitions_total", "FSM transitions, by action and new state.",
+    ("action", "state"))
+risk_vetoes_total = REGISTRY.counter(
+    "icc_risk_vetoes_total", "Entries blocked by risk or portfolio checks, by reason.",
+    ("reason",))
+order_submit_seconds = REGISTRY.histogram(
+    "icc_order_submit_seconds", "OrderManager.submit duration including retries, by outcome.",
+    ("outcome",))
+option_resolve_seconds = REGISTRY.histogram(
+    "icc_option_resolve_seconds", "Option contract resolution duration.")
+option_resolve_failures_total = REGISTRY.counter(
+    "icc_option_resolve_failures_total", "Option contract resolution failures, by reason.",
+    ("reason",))
+db_commit_seconds = REGISTRY.histogram(
+    "icc_db_commit_seconds", "Write-behind batch commit duration.")
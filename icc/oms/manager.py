@@ -7,6 +7,7 @@ import time
 import uuid
 from typing import TYPE_CHECKING
 
+from icc import metrics
 from icc.constants import OrderStatus
 from icc.oms.orders import Fill, Order
 
@@ -20,11 +21,21 @@ RETRY_BACKOFF_SEC = 2.0
 
 
 class OrderManager:
-    def __init__(self, broker: BrokerAdapter):
+    def __init__(self, broker: BrokerAdapter, retry_backoff_sec: float = RETRY_BACKOFF_SEC):
         self.broker = broker
         self.orders: dict[str, Order] = {}
+        self.retry_backoff_sec = retry_backoff_sec
 
     def submit(self, order: Order) -> Order:
+        started = time.perf_counter()
+        try:
+            return self._submit(order)
+        finally:
+            metrics.order_submit_seconds.observe(
+                time.perf_counter() - started, labels=(order.status.value.lower(),),
+            )
+
+    def _submit(self, order: Order) -> Order:
         order.order_id = str(uuid.uuid4())[:8]
         order.status = OrderStatus.SUBMITTED
         self.orders[order.order_id] = order
@@ -33,10 +44,19 @@ class OrderManager:
             try:
                 fill = self.broker.submit_order(order)
                 if fill is not None:
-                    order.status = OrderStatus.FILLED
                     order.filled_price = fill.price
+                    order.filled_quantity = fill.quantity
                     order.filled_at = fill.timestamp
-                    logger.info("Order %s filled at %.2f", order.order_id, fill.price)
+                    if fill.quantity < order.quantity:
+                        # Unfilled remainder is not worked further (IOC semantics)
+                        order.status = OrderStatus.PARTIALLY_FILLED
+                        logger.info(
+                            "Order %s partially filled %d/%d at %.2f",
+                            order.order_id, fill.quantity, order.quantity, fill.price,
+                        )
+                    else:
+                        order.status = OrderStatus.FILLED
+                        logger.info("Order %s filled at %.2f", order.order_id, fill.price)
                     return order
                 else:
                     order.status = OrderStatus.REJECTED
@@ -44,8 +64,8 @@ class OrderManager:
             except Exception as e:
                 logger.error("Order %s error (attempt %d): %s", order.order_id, attempt, e)
 
-            if attempt < MAX_RETRIES:
-                time.sleep(RETRY_BACKOFF_SEC * attempt)
+            if attempt < MAX_RETRIES and self.retry_backoff_sec > 0:
+                time.sleep(self.retry_backoff_sec * attempt)
 
         order.status = OrderStatus.REJECTED
         logger.error("Order %s failed after %d retries", order.order_id, MAX_RETRIES)
@@ -19,6 +19,7 @@ class Order:
     broker_order_id: str = ""
     created_at: datetime = field(default_factory=datetime.utcnow)
     filled_price: float | None = None
+    filled_quantity: int = 0
     filled_at: datetime | None = None
     asset_info: dict | None = None  # Option contract details when instrument_type=OPTIONS
 
@@ -33,6 +34,24 @@ class Fill:
     commission: float = 0.0
 
 
+@dataclass
+class Lot:
+    """One fill that makes up part of a Position (scale-in adds lots)."""
+    entry_price: float
+    quantity: int
+    entry_time: datetime = field(default_factory=datetime.utcnow)
+    entry_premium: float | None = None
+
+
+@dataclass
+class ClosedLot:
+    """Realized slice of a lot (scale-out or final close)."""
+    entry_price: float
+    exit_price: float
+    quantity: int
+    pnl: float
+
+
 @dataclass
 class Position:
     side: OrderSide
@@ -47,6 +66,12 @@ class Position:
     original_stop_price: float = 0.0
     breakeven_triggered: bool = False
     trailing_active: bool = False
+    lots: list[Lot] = field(default_factory=list)
+    closed_lots: list[ClosedLot] = field(default_factory=list)
+    realized_pnl: float = 0.0  # P&L already booked by scale-outs
+    scale_out_price: float | None = None  # Target 1 — partial exit level
+    scale_out_quantity: int = 0
+    scaled_out: bool = False
 
     @property
     def is_long(self) -> bool:
@@ -56,6 +81,26 @@ class Position:
     def is_option(self) -> bool:
         return self.entry_premium is not None
 
+    def unit_pnl(self, entry: float, current_price: float) -> float:
+        """P&L of one contract entered at ``entry`` (entry premium for options)."""
+        if self.is_option:
+            return (current_price - entry) * (self.multiplier or 5.0)
+        from icc.constants import MES_POINT_VALUE
+        if self.is_long:
+            return (current_price - entry) * MES_POINT_VALUE
+        return (entry - current_price) * MES_POINT_VALUE
+
+    def lot_pnls(self, current_price: float) -> list[float]:
+        """Unrealized P&L of each open lot."""
+        return [
+            self.unit_pnl(
+                lot.entry_premium if self.is_option and lot.entry_premium is not None
+                else lot.entry_price,
+                current_price,
+            ) * lot.quantity
+            for lot in self.lots
+        ]
+
     def unrealized_pnl(self, current_price: float) -> float:
         """Compute unrealized P&L.
 
@@ -1,19 +1,75 @@
-"""PositionTracker — real-time P&L."""
+"""PositionTracker — real-time P&L; PositionBook — positions keyed by instrument."""
 
 from __future__ import annotations
 
 import logging
+from typing import Optional
 
 from icc.constants import MES_POINT_VALUE, OrderSide
-from icc.oms.orders import Position
+from icc.oms.orders import ClosedLot, Lot, Position
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_INSTRUMENT = "default"
+
+
+class PositionBook:
+    """Positions across instruments with O(1) aggregate P&L.
+
+    Each instrument gets its own PositionTracker (see ``tracker``). Trackers
+    push deltas into the book on open/close/mark, so aggregate open count,
+    realized and unrealized P&L never iterate positions or lots.
+    """
 
-class PositionTracker:
     def __init__(self) -> None:
+        self._trackers: dict[str, PositionTracker] = {}
+        self.open_position_count: int = 0
+        self.closed_pnl: float = 0.0
+        self.unrealized_pnl: float = 0.0
+
+    def tracker(self, instrument: str) -> PositionTracker:
+        """Return the tracker for ``instrument``, creating it on first use."""
+        tracker = self._trackers.get(instrument)
+        if tracker is None:
+            tracker = PositionTracker(instrument=instrument, book=self)
+            self._trackers[instrument] = tracker
+        return tracker
+
+    @property
+    def instruments(self) -> list[str]:
+        return list(self._trackers)
+
+    @property
+    def positions(self) -> dict[str, Position]:
+        """Open positions keyed by instrument."""
+        return {
+            name: t.position for name, t in self._trackers.items()
+            if t.position is not None
+        }
+
+    @property
+    def total_pnl(self) -> float:
+        return self.closed_pnl + self.unrealized_pnl
+
+    def is_open(self, instrument: str) -> bool:
+        tracker = self._trackers.get(instrument)
+        return tracker is not None and tracker.position is not None
+
+
+class PositionTracker:
+    """One instrument's position, built from lots (scale in/out).
+
+    ``open_position_count`` reports the whole book when the tracker belongs
+    to a PositionBook, so a shared RiskEngine sees every open position.
+    """
+
+    def __init__(self, instrument: str = DEFAULT_INSTRUMENT,
+                 book: Optional[PositionBook] = None) -> None:
+        self.instrument = instrument
         self.position: Position | None = None
         self.closed_pnl: float = 0.0
+        self._book = book
+        self._mark: float = 0.0  # last unrealized P&L pushed to the book
 
     @property
     def is_flat(self) -> bool:
@@ -21,6 +77,8 @@ class PositionTracker:
 
     @property
     def open_position_count(self) -> int:
+        if self._book is not None:
+            return self._book.open_position_count
         return 0 if self.position is None else 1
 
     def open_position(self, side: OrderSide, entry_price: float,
@@ -39,22 +97,120 @@ class PositionTracker:
             multiplier=multiplier,
             entry_premium=entry_premium,
             original_stop_price=stop_price,
+            lots=[Lot(entry_price=entry_price, quantity=quantity,
+                      entry_premium=entry_premium)],
         )
+        if self._book is not None:
+            self._book.open_position_count += 1
         logger.info("Opened %s position at %.2f", side.value, entry_price)
         return self.position
 
+    def scale_in(self, entry_price: float, quantity: int,
+                 entry_premium: float | None = None) -> Position:
+        """Add a lot to the open position; entry price becomes the average."""
+        pos = self.position
+        if pos is None:
+            raise RuntimeError("No position to scale into")
+        total = pos.quantity + quantity
+        pos.entry_price = (pos.entry_price * pos.quantity + entry_price * quantity) / total
+        if pos.entry_premium is not None and entry_premium is not None:
+            pos.entry_premium = (
+                pos.entry_premium * pos.quantity + entry_premium * quantity
+            ) / total
+        pos.quantity = total
+        pos.lots.append(Lot(entry_price=entry_price, quantity=quantity,
+                            entry_premium=entry_premium))
+        logger.info("Scaled in %d at %.2f (qty=%d, avg=%.2f)",
+                    quantity, entry_price, total, pos.entry_price)
+        return pos
+
+    def scale_out(self, exit_price: float, quantity: int,
+                  commission: float = 0.0) -> float:
+        """Exit ``quantity`` contracts FIFO across lots. Returns realized P&L.
+
+        Exiting the full quantity closes the position (same as close_position).
+        """
+        pos = self.position
+        if pos is None:
+            raise RuntimeError("No position to scale out of")
+        if quantity >= pos.quantity:
+            return self.close_position(exit_price, commission)
+
+        pnl = self._realize_lots(pos, exit_price, quantity) - commission
+        pos.quantity -= quantity
+        pos.realized_pnl += pnl
+        self._reprice(pos)
+        self.closed_pnl += pnl
+        if self._book is not None:
+            self._book.closed_pnl += pnl
+        self.mark(exit_price)
+        logger.info("Scaled out %d at %.2f, PnL=%.2f (remaining qty=%d)",
+                    quantity, exit_price, pnl, pos.quantity)
+        return pnl
+
     def close_position(self, exit_price: float, commission: float = 0.0) -> float:
+        """Close the rest of the position. Returns whole-trade P&L (incl. scale-outs)."""
         if self.position is None:
             raise RuntimeError("No position to close")
-        pnl = self.position.unrealized_pnl(exit_price) - commission
+        pos = self.position
+        pnl = pos.unrealized_pnl(exit_price) - commission
+        self._realize_lots(pos, exit_price, pos.quantity)
         logger.info(
             "Closed position at %.2f, PnL=%.2f (commission=%.2f)",
             exit_price, pnl, commission,
         )
         self.closed_pnl += pnl
+        if self._book is not None:
+            self._book.closed_pnl += pnl
+            self._book.unrealized_pnl -= self._mark
+            self._book.open_position_count -= 1
+        self._mark = 0.0
         self.position = None
+        return pnl + pos.realized_pnl
+
+    def mark(self, current_price: float) -> float:
+        """Mark the position to ``current_price`` and update the book in O(1)."""
+        pnl = self.unrealized_pnl(current_price)
+        if self._book is not None:
+            self._book.unrealized_pnl += pnl - self._mark
+        self._mark = pnl
         return pnl
 
+    @staticmethod
+    def _realize_lots(pos: Position, exit_price: float, quantity: int) -> float:
+        """Consume ``quantity`` from the oldest lots, recording per-lot P&L."""
+        remaining = quantity
+        total = 0.0
+        while remaining > 0 and pos.lots:
+            lot = pos.lots[0]
+            take = min(remaining, lot.quantity)
+            entry = (lot.entry_premium if pos.is_option and lot.entry_premium is not None
+                     else lot.entry_price)
+            lot_pnl = pos.unit_pnl(entry, exit_price) * take
+            pos.closed_lots.append(ClosedLot(
+                entry_price=lot.entry_price, exit_price=exit_price,
+                quantity=take, pnl=lot_pnl,
+            ))
+            total += lot_pnl
+            lot.quantity -= take
+            remaining -= take
+            if lot.quantity == 0:
+                pos.lots.pop(0)
+        return total
+
+    @staticmethod
+    def _reprice(pos: Position) -> None:
+        """Recompute average entry from remaining lots after a FIFO scale-out."""
+        qty = sum(lot.quantity for lot in pos.lots)
+        if qty == 0:
+            return
+        pos.entry_price = sum(lot.entry_price * lot.quantity for lot in pos.lots) / qty
+        if pos.entry_premium is not None:
+            pos.entry_premium = sum(
+                (lot.entry_premium if lot.entry_premium is not None else pos.entry_premium)
+                * lot.quantity for lot in pos.lots
+            ) / qty
+
     def check_stop_target(self, candle_high: float, candle_low: float) -> str | None:
         """Check if stop or target hit. Returns 'stop_hit', 'target_hit', or None."""
         if self.position is None:
@@ -73,6 +229,17 @@ class PositionTracker:
                 return "target_hit"
         return None
 
+    def check_scale_out(self, candle_high: float, candle_low: float) -> bool:
+        """True if the bar reached target 1 and the position has not scaled out yet."""
+        pos = self.position
+        if pos is None or pos.scaled_out or pos.scale_out_price is None:
+            return False
+        if pos.scale_out_quantity <= 0 or pos.scale_out_quantity >= pos.quantity:
+            return False
+        if pos.is_long:
+            return candle_high >= pos.scale_out_price
+        return candle_low <= pos.scale_out_price
+
     def increment_bars(self) -> int:
         if self.position is not None:
             self.position.bars_held += 1
@@ -37,6 +37,16 @@ class ResearchAgent:
         self._regime = RegimeDetector(config) if config.enabled else None
         self._last_context: MarketContext | None = None
 
+    def observe(self, buffer: CandleBuffer) -> None:
+        """Fold the buffer's newest candle into the rolling regime state.
+
+        Called on every completed candle, so the regime covers the whole
+        session and not just the candles still in the buffer at the next
+        entry check.
+        """
+        if self._regime is not None:
+            self._regime.track(buffer)
+
     def assess_entry(
         self,
         buffer: CandleBuffer,
@@ -68,9 +78,7 @@ class ResearchAgent:
             now = datetime.now()
 
         # 1. Calendar check (hard veto)
-        cal_state = self._calendar.check(now) if self._calendar else CalendarState(
-            in_blackout=False
-        )
+        cal_state = self._calendar_state(now)
         if cal_state.in_blackout:
             reason = f"Economic calendar blackout: {cal_state.active_event}"
             self._last_context = MarketContext(
@@ -84,7 +92,7 @@ class ResearchAgent:
             return False, reason, 0.0
 
         # 2. Regime assessment (soft confidence)
-        regime_state = self._regime.assess(buffer, signal_direction, now) if self._regime else None
+        regime_state = self._regime_state(buffer, signal_direction, now)
         confidence = regime_state.confidence_mult if regime_state else 1.0
 
         # 2b. Apply win rate adjustment
@@ -116,6 +124,23 @@ class ResearchAgent:
         )
         return True, reason, confidence
 
+    def _calendar_state(self, now: datetime) -> CalendarState:
+        if self._calendar is None:
+            return CalendarState(in_blackout=False)
+        return self._calendar.check(now)
+
+    def _regime_state(self, buffer: CandleBuffer, signal_direction: str,
+                      now: datetime) -> RegimeState | None:
+        if self._regime is None:
+            return None
+        return self._regime.assess(buffer, signal_direction, now)
+
+    def next_blackout_start(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """When the next calendar blackout begins, so callers can pre-arm."""
+        if self._calendar is None:
+            return None
+        return self._calendar.next_blackout_start(now)
+
     def get_snapshot(self) -> dict:
         """Return current research state for dashboard/API."""
         if self._last_context is None:
@@ -135,6 +160,11 @@ class ResearchAgent:
                     if ctx.calendar.blackout_end
                     else None
                 ),
+                "next_blackout_start": (
+                    ctx.calendar.next_blackout_start.isoformat()
+                    if ctx.calendar.next_blackout_start
+                    else None
+                ),
             },
         }
         if ctx.regime is not None:
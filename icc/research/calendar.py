@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import logging
+from bisect import bisect_right
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -33,20 +34,38 @@ class CalendarEvent:
     impact: str = "high"  # high, medium, low
 
 
+@dataclass(frozen=True, slots=True)
+class BlackoutWindow:
+    start: datetime
+    end: datetime
+    event: CalendarEvent
+    order: int  # position in the calendar file; the earliest wins on overlap
+
+
 @dataclass
 class CalendarState:
     in_blackout: bool
     active_event: Optional[str] = None
     blackout_end: Optional[datetime] = None
     confidence_mult: float = 1.0
+    next_blackout_start: Optional[datetime] = None
 
 
 class EconomicCalendar:
-    """Loads economic events from JSON and checks for blackout windows."""
+    """Loads economic events from JSON and checks for blackout windows.
+
+    Blackout windows are built once at load time and kept sorted by start,
+    with a running maximum of their ends, so a point lookup is a bisect
+    followed by a short walk back over the windows that can still overlap.
+    """
 
     def __init__(self, calendar_file: str = "data/econ_calendar.json") -> None:
         self._events: list[CalendarEvent] = []
+        self._windows: list[BlackoutWindow] = []
+        self._starts: list[datetime] = []
+        self._max_ends: list[datetime] = []
         self._load(calendar_file)
+        self._index()
 
     def _load(self, path: str) -> None:
         """Load events from JSON file."""
@@ -71,27 +90,64 @@ class EconomicCalendar:
         except Exception as e:
             logger.error("Failed to load economic calendar: %s", e)
 
+    def _index(self) -> None:
+        """Precompute blackout windows sorted by start."""
+        windows = []
+        for order, event in enumerate(self._events):
+            before_min, after_min = EVENT_BLACKOUTS.get(
+                event.event_type, EVENT_BLACKOUTS["DEFAULT"]
+            )
+            windows.append(BlackoutWindow(
+                start=event.timestamp - timedelta(minutes=before_min),
+                end=event.timestamp + timedelta(minutes=after_min),
+                event=event,
+                order=order,
+            ))
+        windows.sort(key=lambda w: w.start)
+        self._windows = windows
+        self._starts = [w.start for w in windows]
+        self._max_ends = []
+        for w in windows:
+            prev = self._max_ends[-1] if self._max_ends else w.end
+            self._max_ends.append(max(prev, w.end))
+
+    def active_window(self, now: datetime) -> Optional[BlackoutWindow]:
+        """The blackout window containing `now`, if any."""
+        match: Optional[BlackoutWindow] = None
+        i = bisect_right(self._starts, now) - 1
+        # Windows before i that end before `now` can be skipped wholesale
+        while i >= 0 and self._max_ends[i] >= now:
+            window = self._windows[i]
+            if window.end >= now and (match is None or window.order < match.order):
+                match = window
+            i -= 1
+        return match
+
+    def next_blackout_start(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """Start of the first blackout window that begins after `now`."""
+        if now is None:
+            now = datetime.now()
+        i = bisect_right(self._starts, now)
+        return self._starts[i] if i < len(self._starts) else None
+
     def check(self, now: Optional[datetime] = None) -> CalendarState:
         """Check if `now` falls within any event's blackout window."""
         if now is None:
             now = datetime.now()
 
-        for event in self._events:
-            before_min, after_min = EVENT_BLACKOUTS.get(
-                event.event_type, EVENT_BLACKOUTS["DEFAULT"]
+        next_start = self.next_blackout_start(now)
+        window = self.active_window(now)
+        if window is not None:
+            return CalendarState(
+                in_blackout=True,
+                active_event=f"{window.event.event_type}: {window.event.name}",
+                blackout_end=window.end,
+                confidence_mult=0.0,
+                next_blackout_start=next_start,
             )
-            blackout_start = event.timestamp - timedelta(minutes=before_min)
-            blackout_end = event.timestamp + timedelta(minutes=after_min)
-
-            if blackout_start <= now <= blackout_end:
-                return CalendarState(
-                    in_blackout=True,
-                    active_event=f"{event.event_type}: {event.name}",
-                    blackout_end=blackout_end,
-                    confidence_mult=0.0,
-                )
-
-        return CalendarState(in_blackout=False, confidence_mult=1.0)
+
+        return CalendarState(in_blackout=False, confidence_mult=1.0,
+                             next_blackout_start=next_start)
 
     @property
     def event_count(self) -> int:
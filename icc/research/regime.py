@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import logging
+import weakref
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, time
 from typing import Optional
 
-from icc.market.candle import CandleBuffer
+from icc.market.candle import Candle, CandleBuffer
 from icc.research.config import ResearchConfig
 
 logger = logging.getLogger(__name__)
@@ -16,6 +19,14 @@ logger = logging.getLogger(__name__)
 SESSION_OPEN = time(9, 30)
 SESSION_CLOSE = time(16, 0)
 
+ATR_PERIOD = 14
+MIN_VWAP_CANDLES = 10
+
+
+def _session_key(ts: datetime) -> tuple:
+    """VWAP anchor: the RTH session (from the open) or the pre-open period of a date."""
+    return ts.date(), ts.time() >= SESSION_OPEN
+
 
 @dataclass
 class RegimeState:
@@ -28,11 +39,134 @@ class RegimeState:
     details: dict
 
 
+class RollingRegime:
+    """Per-series rolling state behind RegimeDetector, updated once per candle.
+
+    True ranges live in a ring of ``atr_lookback`` values mirrored in a
+    sorted list, so the ATR percentile rank is a bisect; the 14-period ATR
+    and its rank are recomputed on update. VWAP sums are anchored at the
+    session open and reset there.
+    """
+
+    def __init__(self, config: ResearchConfig) -> None:
+        self.config = config
+        self.reset()
+
+    def reset(self) -> None:
+        self._trs: deque[float] = deque(maxlen=max(1, self.config.atr_lookback))
+        self._sorted_trs: list[float] = []
+        self._recent_trs: deque[float] = deque(maxlen=ATR_PERIOD)
+        self._tr_count = 0
+        self._prev_close: Optional[float] = None
+        self.last_ts: Optional[datetime] = None
+        self.atr_percentile: Optional[float] = None  # None until ATR_PERIOD TRs
+        self._session: Optional[tuple] = None
+        self._session_pv = 0.0
+        self._session_vol = 0
+        self._session_count = 0
+        self._last_close = 0.0
+
+    def update(self, candle: Candle) -> None:
+        """Fold one completed candle into the rolling state."""
+        if self._prev_close is not None:
+            tr = max(candle.high - candle.low, abs(candle.high - self._prev_close),
+                     abs(candle.low - self._prev_close))
+            self._add_tr(tr)
+        self._prev_close = candle.close
+        self.last_ts = candle.timestamp
+
+        session = _session_key(candle.timestamp)
+        if session != self._session:
+            self._session = session
+            self._session_pv = 0.0
+            self._session_vol = 0
+            self._session_count = 0
+        self._session_pv += (candle.high + candle.low + candle.close) / 3 * candle.volume
+        self._session_vol += candle.volume
+        self._session_count += 1
+        self._last_close = candle.close
+
+    def sync(self, buffer: CandleBuffer) -> None:
+        """Update with the candles in ``buffer`` newer than the last one seen.
+
+        If the buffer no longer holds the candle after the last one seen
+        (more than ``maxlen`` candles went by between syncs), the skipped
+        candles cannot be folded in, so the state is rebuilt from the
+        buffer instead of chaining true ranges across the gap.
+        """
+        last = buffer.last
+        if last is None or last.timestamp == self.last_ts:
+            return
+        if (self.last_ts is None or last.timestamp < self.last_ts
+                or buffer[0].timestamp > self.last_ts):
+            # Rewound buffer (e.g. a new replay) or a gap: rebuild from scratch
+            if self.last_ts is not None and last.timestamp > self.last_ts:
+                logger.debug("Regime state missed candles after %s; rebuilding", self.last_ts)
+            self.reset()
+            for candle in buffer.candles():
+                self.update(candle)
+            return
+        new: list[Candle] = []
+        for i in range(1, len(buffer) + 1):
+            candle = buffer[-i]
+            if candle.timestamp <= self.last_ts:
+                break
+            new.append(candle)
+        for candle in reversed(new):
+            self.update(candle)
+
+    def _add_tr(self, tr: float) -> None:
+        if len(self._trs) == self._trs.maxlen:
+            evicted = self._trs[0]
+            del self._sorted_trs[bisect_left(self._sorted_trs, evicted)]
+        self._trs.append(tr)
+        insort(self._sorted_trs, tr)
+        self._recent_trs.append(tr)
+        self._tr_count += 1
+        self.atr_percentile = self._percentile()
+
+    def _percentile(self) -> Optional[float]:
+        """Percentile rank of the 14-period ATR in the lookback window."""
+        if self._tr_count < ATR_PERIOD:
+            return None
+        current_atr = sum(self._recent_trs) / len(self._recent_trs)
+        return bisect_right(self._sorted_trs, current_atr) / len(self._sorted_trs)
+
+    @property
+    def vwap(self) -> Optional[float]:
+        """Session VWAP, or None until MIN_VWAP_CANDLES candles with volume."""
+        if self._session_count < MIN_VWAP_CANDLES or self._session_vol == 0:
+            return None
+        return self._session_pv / self._session_vol
+
+    @property
+    def last_close(self) -> float:
+        return self._last_close
+
+
 class RegimeDetector:
-    """Assesses market regime from candle buffer data."""
+    """Assesses market regime from candle buffer data.
+
+    Keeps a RollingRegime per buffer (one per ticker when a research agent
+    is shared), synced with the candles the buffer gained since the last
+    call, so ``assess`` costs O(log n) per new candle and O(1) otherwise.
+    Live callers ``track`` the buffer on every candle so the session VWAP
+    and ATR chain cover candles older than the buffer.
+    """
 
     def __init__(self, config: ResearchConfig) -> None:
         self.config = config
+        self._tracks: weakref.WeakKeyDictionary[CandleBuffer, RollingRegime] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def track(self, buffer: CandleBuffer) -> RollingRegime:
+        """Rolling state for ``buffer``, brought up to date."""
+        track = self._tracks.get(buffer)
+        if track is None:
+            track = self._tracks[buffer] = RollingRegime(self.config)
+        track.sync(buffer)
+        return track
 
     def assess(self, buffer: CandleBuffer, signal_direction: str,
                now: Optional[datetime] = None) -> RegimeState:
@@ -48,12 +182,22 @@ class RegimeDetector:
         """
         if now is None:
             now = datetime.now()
+        track = self.track(buffer)
+        return self.combine(track.atr_percentile, track.vwap, track.last_close,
+                            signal_direction, now)
 
+    def combine(self, atr_percentile: Optional[float], vwap: Optional[float],
+                last_close: float, signal_direction: str, now: datetime) -> RegimeState:
+        """Build the RegimeState from raw series values and the current config.
+
+        Only this step reads the thresholds and multipliers, so callers that
+        precompute the raw values (backtests) can re-apply other configs.
+        """
         mult = 1.0
         details: dict = {}
 
         # 1. ATR percentile
-        atr_pct, atr_regime, atr_mult = self._assess_atr(buffer)
+        atr_pct, atr_regime, atr_mult = self._classify_atr(atr_percentile)
         mult *= atr_mult
         details["atr_percentile"] = round(atr_pct, 3)
         details["atr_regime"] = atr_regime
@@ -66,7 +210,7 @@ class RegimeDetector:
         details["phase_mult"] = phase_mult
 
         # 3. VWAP alignment
-        vwap_aligned, vwap_mult = self._assess_vwap(buffer, signal_direction)
+        vwap_aligned, vwap_mult = self._assess_vwap(vwap, last_close, signal_direction)
         mult *= vwap_mult
         details["vwap_aligned"] = vwap_aligned
         details["vwap_mult"] = vwap_mult
@@ -80,48 +224,6 @@ class RegimeDetector:
             details=details,
         )
 
-    def _assess_atr(self, buffer: CandleBuffer) -> tuple[float, str, float]:
-        """Compute ATR percentile and regime.
-
-        Returns (percentile, regime_name, multiplier).
-        """
-        candles = list(buffer)
-        if len(candles) < 15:
-            return 0.5, "normal", 1.0
-
-        # Compute ATR values (true range) for available candles
-        trs = []
-        for i in range(1, len(candles)):
-            high = candles[i].high
-            low = candles[i].low
-            prev_close = candles[i - 1].close
-            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
-            trs.append(tr)
-
-        if not trs:
-            return 0.5, "normal", 1.0
-
-        # Current ATR (14-period average of most recent TRs)
-        period = min(14, len(trs))
-        current_atr = sum(trs[-period:]) / period
-
-        # Rank against lookback window
-        lookback = min(self.config.atr_lookback, len(trs))
-        lookback_trs = trs[-lookback:]
-        sorted_trs = sorted(lookback_trs)
-        # Percentile rank of current ATR
-        rank = sum(1 for x in sorted_trs if x <= current_atr)
-        percentile = rank / len(sorted_trs)
-
-        if percentile >= self.config.atr_extreme_pct:
-            return percentile, "extreme", self.config.extreme_vol_mult
-        elif percentile >= 0.75:
-            return percentile, "high", self.config.high_vol_mult
-        elif percentile <= self.config.atr_low_pct:
-            return percentile, "low", self.config.low_vol_mult
-        else:
-            return percentile, "normal", 1.0
-
     def _assess_session_phase(self, now: datetime) -> tuple[str, float]:
         """Determine session phase and multiplier."""
         current_time = now.time()
@@ -149,32 +251,32 @@ class RegimeDetector:
 
         return "mid", 1.0
 
-    def _assess_vwap(self, buffer: CandleBuffer,
+    def _classify_atr(self, percentile: Optional[float]) -> tuple[float, str, float]:
+        """Classify an ATR percentile.
+
+        Returns (percentile, regime_name, multiplier).
+        """
+        if percentile is None:
+            return 0.5, "normal", 1.0
+        if percentile >= self.config.atr_extreme_pct:
+            return percentile, "extreme", self.config.extreme_vol_mult
+        elif percentile >= 0.75:
+            return percentile, "high", self.config.high_vol_mult
+        elif percentile <= self.config.atr_low_pct:
+            return percentile, "low", self.config.low_vol_mult
+        else:
+            return percentile, "normal", 1.0
+
+    def _assess_vwap(self, vwap: Optional[float], last_close: float,
                      signal_direction: str) -> tuple[bool, float]:
-        """Check if signal direction aligns with VWAP.
+        """Check if signal direction aligns with the session VWAP.
 
-        Simple VWAP: volume-weighted average price from buffer.
         If price is above VWAP and signal is long → aligned.
         If price is below VWAP and signal is short → aligned.
         """
-        candles = list(buffer)
-        if len(candles) < 10:
-            return True, 1.0
-
-        # Compute VWAP
-        total_pv = 0.0
-        total_vol = 0
-        for c in candles:
-            typical = (c.high + c.low + c.close) / 3
-            total_pv += typical * c.volume
-            total_vol += c.volume
-
-        if total_vol == 0:
+        if vwap is None:
             return True, 1.0
 
-        vwap = total_pv / total_vol
-        last_close = candles[-1].close
-
         if signal_direction == "long":
             aligned = last_close >= vwap
         elif signal_direction == "short":
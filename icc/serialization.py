@@ -0,0 +1,97 @@
+"""JSON serialization for the web and event paths.
+
+Uses orjson, then msgspec, when installed, and falls back to the stdlib
+``json`` module. ``ICC_JSON_BACKEND`` (orjson | msgspec | stdlib) forces a
+backend. All backends encode datetimes as ISO 8601, enums by value and
+dataclasses as objects, and produce compact output.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import os
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("orjson", "msgspec", "stdlib")
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for types the backend doesn't encode natively."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _make_orjson() -> tuple[Callable[[Any], bytes], Callable[[Any], Any]]:
+    import orjson
+
+    option = orjson.OPT_NON_STR_KEYS
+
+    def encode(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_default, option=option)
+
+    return encode, orjson.loads
+
+
+def _make_msgspec() -> tuple[Callable[[Any], bytes], Callable[[Any], Any]]:
+    import msgspec
+
+    encoder = msgspec.json.Encoder(enc_hook=_default)
+    decoder = msgspec.json.Decoder()
+    return encoder.encode, decoder.decode
+
+
+def _make_stdlib() -> tuple[Callable[[Any], bytes], Callable[[Any], Any]]:
+    def encode(obj: Any) -> bytes:
+        return json.dumps(obj, default=_default, separators=(",", ":")).encode()
+
+    return encode, json.loads
+
+
+_FACTORIES = {"orjson": _make_orjson, "msgspec": _make_msgspec, "stdlib": _make_stdlib}
+
+BACKEND: str = "stdlib"
+_encode, _decode = _make_stdlib()
+
+
+def set_backend(name: str | None = None) -> str:
+    """Select a backend by name, or the fastest installed one. Returns its name."""
+    global BACKEND, _encode, _decode
+    candidates = (name,) if name else BACKENDS
+    for candidate in candidates:
+        try:
+            _encode, _decode = _FACTORIES[candidate]()
+        except (ImportError, KeyError):
+            if name:
+                logger.warning("JSON backend %s not available, using stdlib", name)
+            continue
+        BACKEND = candidate
+        return BACKEND
+    _encode, _decode = _make_stdlib()
+    BACKEND = "stdlib"
+    return BACKEND
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    return _encode(obj)
+
+
+def dumps(obj: Any) -> str:
+    return _encode(obj).decode()
+
+
+def loads(data: str | bytes) -> Any:
+    return _decode(data)
+
+
+set_backend(os.environ.get("ICC_JSON_BACKEND") or None)
@@ -5,20 +5,38 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import time
 from datetime import datetime, timedelta, timezone
 
-from fastapi import FastAPI, Header, Query, WebSocket, WebSocketDisconnect
+from fastapi import Body, FastAPI, Header, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from jose import JWTError, jwt
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 
+from icc import metrics
 from icc.core.events import EventBus
+from icc.core.latency import profiler as latency_profiler
+from icc.db.executor import db_executor
+from icc.serialization import dumps_bytes
+from icc.web.binary_protocol import binary_frames, json_frames
+from icc.web.state_sync import SnapshotStream
+from icc.web.trade_history import TradeHistory, known_db_urls
 from icc.web.trading_session import TradingSession
 from icc.web.ws_manager import ConnectionManager
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="ICC MES AutoTrader", version="0.1.0")
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with icc.serialization (orjson when installed)."""
+
+    def render(self, content) -> bytes:
+        return dumps_bytes(content)
+
+
+app = FastAPI(
+    title="ICC MES AutoTrader", version="0.1.0", default_response_class=FastJSONResponse,
+)
 
 # CORS — allow Next.js frontend (dev + production)
 app.add_middleware(
@@ -51,11 +69,39 @@ class LoginRequest(BaseModel):
 event_bus = EventBus()
 ws_manager = ConnectionManager()
 session = TradingSession(event_bus)
+snapshot_stream = SnapshotStream()
+trade_history = TradeHistory()
 _scheduler = None  # Optional: set by init_shared_state in auto mode
 _db_url: str | None = None  # Set by init_shared_state for correct DB
 
-# Background task for event relay
+# Scrape-time gauges; the lambdas read the module globals, so they follow
+# init_shared_state swapping in the CLI's event bus
+metrics.REGISTRY.gauge(
+    "icc_event_bus_pending", "Events queued for the relay.",
+    fn=lambda: event_bus.get_stats()["pending"])
+metrics.REGISTRY.gauge(
+    "icc_event_bus_dropped_total", "Events dropped on a full queue, by type.", ("type",),
+    fn=lambda: event_bus.get_stats()["dropped_by_type"], kind="counter")
+metrics.REGISTRY.gauge(
+    "icc_ws_clients", "Connected WebSocket clients.", fn=lambda: ws_manager.client_count)
+metrics.REGISTRY.gauge(
+    "icc_ws_client_lag_seconds", "Age of the oldest undelivered frame, per client.", ("client",),
+    fn=lambda: {str(c["id"]): c["lag_ms"] / 1000.0 for c in ws_manager.get_client_stats()})
+metrics.REGISTRY.gauge(
+    "icc_ws_lag_disconnects_total", "Clients dropped for falling too far behind.",
+    fn=lambda: ws_manager.lag_disconnects, kind="counter")
+
+# Background tasks for event relay and snapshot pushes
 _relay_task: asyncio.Task | None = None
+_snapshot_task: asyncio.Task | None = None
+
+# Snapshots are rebuilt at most once per interval, and only when an event
+# marked them dirty (or the idle interval passed, for time-driven fields).
+SNAPSHOT_INTERVAL_SEC = 0.25
+SNAPSHOT_IDLE_SEC = 5.0
+_snapshot_dirty = True
+_snapshot_built = 0.0
+_snapshot_lock: asyncio.Lock | None = None
 
 
 def init_shared_state(
@@ -73,32 +119,109 @@ def init_shared_state(
 
 
 async def _event_relay() -> None:
-    """Relay events from the sync EventBus to WebSocket clients, feed watchdog."""
+    """Relay events from the EventBus to WebSocket clients, feed watchdog.
+
+    Wakes as soon as events are emitted; a burst goes out as one "batch" frame.
+    A failure while handling one burst is logged and the loop keeps running,
+    so one bad event or snapshot never cuts every client off.
+    """
+    while True:
+        events = await event_bus.get_batch()
+        try:
+            await _relay_batch(events)
+        except Exception:
+            logger.exception("Event relay failed for %d event(s)", len(events))
+
+
+async def _relay_batch(events: list) -> None:
     from icc.core.events import EventType
 
+    if any(ev.event_type == EventType.CANDLE for ev in events):
+        session.notify_candle()
+    if any(ev.event_type in (EventType.ENTRY, EventType.EXIT) for ev in events):
+        trade_history.invalidate()
+    # Each event's JSON frame is encoded once; binary clients get packed frames
+    text, key = json_frames(events)
+    binary = binary_frames(events) if ws_manager.binary_client_count else None
+    await ws_manager.broadcast_text(text, key, binary)
+    _mark_snapshot_dirty()
+
+
+def _mark_snapshot_dirty() -> None:
+    global _snapshot_dirty
+    _snapshot_dirty = True
+
+
+async def _snapshot_pusher() -> None:
+    """Push snapshot deltas on a fixed cadence instead of once per relay batch."""
     while True:
-        events = event_bus.drain()
-        for ev in events:
-            await ws_manager.broadcast({
-                "type": ev.event_type.value,
-                "data": ev.data,
-                "ts": ev.timestamp,
-            })
-            if ev.event_type == EventType.CANDLE:
-                session.notify_candle()
-        await asyncio.sleep(0.1)
+        await asyncio.sleep(SNAPSHOT_INTERVAL_SEC)
+        if not _snapshot_dirty and time.monotonic() - _snapshot_built < SNAPSHOT_IDLE_SEC:
+            continue
+        try:
+            await _refresh_snapshot()
+        except Exception:
+            logger.exception("Snapshot refresh failed")
+
+
+async def _refresh_snapshot() -> None:
+    """Diff the current snapshot and push the changed fields to every client.
+
+    The snapshot is built in a worker thread, where each trader is read
+    under its own lock, so the event loop never blocks on a candle in
+    progress. A clean stream is left as is.
+    """
+    global _snapshot_dirty, _snapshot_built, _snapshot_lock
+    if _snapshot_lock is None:
+        _snapshot_lock = asyncio.Lock()
+    async with _snapshot_lock:
+        if not (_snapshot_dirty or snapshot_stream.seq == 0):
+            return
+        _snapshot_dirty = False  # events arriving during the build re-mark it
+        try:
+            snapshot = await asyncio.to_thread(session.get_snapshot)
+        except BaseException:
+            _snapshot_dirty = True
+            raise
+        _snapshot_built = time.monotonic()
+        delta = snapshot_stream.update(snapshot)
+    if delta is not None:
+        await ws_manager.broadcast({"type": "snapshot_delta", "data": delta})
+
+
+async def _current_snapshot() -> dict:
+    """The latest dashboard snapshot, rebuilt first if events have dirtied it."""
+    await _refresh_snapshot()
+    return snapshot_stream.full()["state"]
+
+
+async def _send_full_snapshot(websocket: WebSocket) -> None:
+    await _refresh_snapshot()
+    full = snapshot_stream.full()
+    await ws_manager.send(websocket, {
+        "type": "snapshot",
+        "data": full["state"],
+        "seq": full["seq"],
+    })
 
 
 @app.on_event("startup")
 async def startup() -> None:
-    global _relay_task
+    global _relay_task, _snapshot_task
+    event_bus.attach_loop(asyncio.get_running_loop())
     _relay_task = asyncio.create_task(_event_relay())
+    _snapshot_task = asyncio.create_task(_snapshot_pusher())
+    trade_history.open(known_db_urls(_db_url))
 
 
 @app.on_event("shutdown")
 async def shutdown() -> None:
     if _relay_task:
         _relay_task.cancel()
+    if _snapshot_task:
+        _snapshot_task.cancel()
+    event_bus.detach_loop()
+    db_executor.shutdown()
     if session.is_running:
         session.stop()
 
@@ -120,6 +243,8 @@ async def api_auth_login(body: LoginRequest):
     if body.username != _ADMIN_USER or body.password != _ADMIN_PASS:
         from fastapi.responses import JSONResponse
         return JSONResponse(status_code=401, content={"error": "Invalid credentials"})
+    from jose import jwt
+
     expire = datetime.now(timezone.utc) + timedelta(hours=_JWT_EXPIRE_HOURS)
     token = jwt.encode(
         {"sub": body.username, "exp": expire},
@@ -134,6 +259,8 @@ async def api_auth_verify(authorization: str = Header(default="")):
     if not authorization.startswith("Bearer "):
         from fastapi.responses import JSONResponse
         return JSONResponse(status_code=401, content={"valid": False})
+    from jose import JWTError, jwt
+
     token = authorization[7:]
     try:
         payload = jwt.decode(token, _JWT_SECRET, algorithms=[_JWT_ALGORITHM])
@@ -198,11 +325,22 @@ async def api_kill_session():
 
 
 @app.get("/api/session/status")
-async def api_session_status():
+async def api_session_status(since: int | None = Query(default=None, ge=0)):
+    """Session state. With ``since`` (a snapshot seq), returns only the changes."""
+    await _refresh_snapshot()
+    full = snapshot_stream.full()
+    delta = snapshot_stream.since(since) if since is not None else None
+    state = {"snapshot_delta": delta} if delta is not None else {"snapshot": full["state"]}
     return {
         "running": session.is_running,
-        "snapshot": session.get_snapshot(),
+        "seq": full["seq"],
+        **state,
         "ws_clients": ws_manager.client_count,
+        "ws_client_stats": ws_manager.get_client_stats(),
+        "ws_lag_disconnects": ws_manager.lag_disconnects,
+        "trade_cache": trade_history.get_stats(),
+        "db_executor": db_executor.get_stats(),
+        "event_bus": event_bus.get_stats(),
     }
 
 
@@ -218,98 +356,45 @@ async def api_trades(limit: int = Query(default=50, ge=1, le=500)):
     """Return recent trade history from the database.
 
     Queries all known DB files and merges results so trades from
-    live, paper, and simulated sessions all appear.
+    live, paper, and simulated sessions all appear. Cached until the
+    next entry/exit event (see TradeHistory).
     """
-    from icc.db.engine import get_session, init_db
-    from icc.db.models import TradeRecord
-
-    all_trades: list[dict] = []
-
-    # Query all known DB files to surface all historical trades
-    db_urls = set()
-    if _db_url:
-        db_urls.add(_db_url)
-    # Always include known DBs (use relative paths — CWD is project root)
-    import os
-    for db_file in ("icc_live.db", "icc_trades.db", "icc_paper.db"):
-        if os.path.exists(db_file):
-            db_urls.add(f"sqlite:///{db_file}")
-
-    seen_ids: set[tuple[str, str]] = set()  # (session_id, entry_time) to dedupe
-
-    for url in db_urls:
-        try:
-            init_db(url)
-            db = get_session(url)
-            trades = (
-                db.query(TradeRecord)
-                .order_by(TradeRecord.entry_time.desc())
-                .limit(limit)
-                .all()
-            )
-            for t in trades:
-                key = (t.session_id, t.entry_time.isoformat() if t.entry_time else "")
-                if key in seen_ids:
-                    continue
-                seen_ids.add(key)
-                inst_type = getattr(t, "instrument_type", None) or "FUTURES"
-                is_option = inst_type == "OPTIONS"
-                trade_dict = {
-                    "id": t.id,
-                    "session_id": t.session_id,
-                    "side": t.side,
-                    "entry_price": t.entry_price,
-                    "exit_price": t.exit_price,
-                    "stop_price": None if is_option else t.stop_price,
-                    "target_price": None if is_option else t.target_price,
-                    "quantity": t.quantity,
-                    "pnl": t.pnl,
-                    "gross_pnl": (t.pnl + t.commission) if t.pnl is not None else None,
-                    "commission": t.commission,
-                    "entry_time": t.entry_time.isoformat() if t.entry_time else None,
-                    "exit_time": t.exit_time.isoformat() if t.exit_time else None,
-                    "exit_reason": t.exit_reason,
-                    "instrument_type": inst_type,
-                    "option_underlying": getattr(t, "option_underlying", None),
-                    "option_right": getattr(t, "option_right", None),
-                    "option_strike": getattr(t, "option_strike", None),
-                    "option_expiration": getattr(t, "option_expiration", None),
-                    "option_entry_premium": getattr(t, "option_entry_premium", None),
-                    "option_exit_premium": getattr(t, "option_exit_premium", None),
-                    "underlying_stop": t.stop_price if is_option else None,
-                    "underlying_target": t.target_price if is_option else None,
-                }
-                all_trades.append(trade_dict)
-            db.close()
-        except Exception as e:
-            logger.debug("Skipping DB %s: %s", url, e)
-
-    # Sort by entry_time descending, limit
-    all_trades.sort(key=lambda x: x.get("entry_time") or "", reverse=True)
-    return all_trades[:limit]
+    return await trade_history.recent(known_db_urls(_db_url), limit)
 
 
 @app.get("/api/settlement")
 async def api_settlement():
     """Return current settlement/funding tranche state."""
-    snapshot = session.get_snapshot()
+    snapshot = await _current_snapshot()
     return snapshot.get("settlement", {"status": "not_available"})
 
 
 @app.get("/api/win-rate")
 async def api_win_rate():
     """Return current win rate tracker state."""
-    snapshot = session.get_snapshot()
+    snapshot = await _current_snapshot()
     return snapshot.get("win_rate", {"status": "not_available"})
 
 
 @app.get("/api/research/status")
 async def api_research_status():
     """Return current research agent state."""
-    snapshot = session.get_snapshot()
+    snapshot = await _current_snapshot()
     return snapshot.get("research", {"status": "not_available"})
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus text exposition of the in-process registry."""
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/api/metrics")
+async def api_metrics():
+    """Per-stage on_candle latency summaries (empty unless metrics.latency is on)."""
+    return {"latency": latency_profiler.snapshot()}
+
+
 @app.get("/api/config")
 async def api_config():
     """Return merged application configuration as JSON."""
@@ -323,27 +408,49 @@ async def api_config():
     return dump
 
 
+@app.get("/api/params")
+async def api_params():
+    """Live-updatable parameters of the running session, with version and history."""
+    params = session.params
+    if params is None:
+        return JSONResponse(status_code=409, content={"error": "No running session"})
+    return {
+        "version": params.version,
+        "params": params.current(),
+        "history": [change.to_dict() for change in params.history],
+    }
+
+
+@app.put("/api/params")
+async def api_update_params(patch: dict = Body(...)):
+    """Apply a partial update, e.g. ``{"orb": {"min_range_pct": 0.25}}``, between candles."""
+    try:
+        version, change = await asyncio.to_thread(session.update_params, patch, "api")
+    except RuntimeError as e:
+        return JSONResponse(status_code=409, content={"error": str(e)})
+    except ValueError as e:
+        return JSONResponse(status_code=422, content={"error": str(e)})
+    if change is None:
+        return {"version": version, "changes": {}}
+    return change.to_dict()
+
+
 # --- WebSocket ---
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await ws_manager.connect(websocket)
     try:
-        # Send initial snapshot
-        await websocket.send_json({
-            "type": "snapshot",
-            "data": session.get_snapshot(),
-        })
+        # Send initial snapshot (via the client's queue, ordered with broadcasts)
+        await _send_full_snapshot(websocket)
         # Keep connection alive, listen for client messages
         while True:
             data = await websocket.receive_text()
             if data == "ping":
-                await websocket.send_json({"type": "pong"})
+                await ws_manager.send(websocket, {"type": "pong"})
             elif data == "snapshot":
-                await websocket.send_json({
-                    "type": "snapshot",
-                    "data": session.get_snapshot(),
-                })
+                # Full resync (sent by clients that missed a delta)
+                await _send_full_snapshot(websocket)
     except WebSocketDisconnect:
         ws_manager.disconnect(websocket)
     except Exception:
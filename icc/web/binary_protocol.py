@@ -0,0 +1,226 @@
+"""Binary WebSocket subprotocol ("icc.bin.v1") for high-rate event streams.
+
+Clients that offer the subprotocol get candle, entry and exit events as
+struct-packed binary frames. Every other event, and the snapshot frames,
+stay JSON text. Decoding a binary frame gives the same message dict the
+JSON frame would. The frontend decoder is ``frontend/lib/binaryProtocol.ts``.
+
+All values are little-endian. Every frame starts with a header::
+
+    B version (1)   B kind   d event ts (epoch seconds; 0 for batches)
+
+and then a body that depends on ``kind``::
+
+    BATCH   H count, then per message: H length + frame
+    CANDLE  q wall-clock seconds since 1970-01-01, h UTC offset minutes
+            (NAIVE_TZ for naive timestamps), 4d open/high/low/close,
+            I volume, str symbol
+    ENTRY   str side, 3d entry/stop/target price (NaN = null)
+    EXIT    str side, 4d entry/exit price, pnl, daily pnl, str reason
+
+``str`` is a B length followed by that many UTF-8 bytes, cut at a
+character boundary. An entry or exit that carries option details, or a
+candle whose volume does not fit the I field, is not packed; it goes out
+as JSON text.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Union
+
+from icc.core.events import CandlePayload, EntryPayload, ExitPayload, TradingEvent
+from icc.web.ws_manager import batch_key, coalesce_key
+
+VERSION = 1
+
+KIND_BATCH = 0
+KIND_CANDLE = 1
+KIND_ENTRY = 2
+KIND_EXIT = 3
+
+NAIVE_TZ = 0x7FFF
+
+_HEADER = struct.Struct("<BBd")
+_COUNT = struct.Struct("<H")
+_CANDLE = struct.Struct("<qh4dI")
+_ENTRY = struct.Struct("<3d")
+_EXIT = struct.Struct("<4d")
+
+_EPOCH = datetime(1970, 1, 1)
+_KINDS = {KIND_CANDLE: "candle", KIND_ENTRY: "entry", KIND_EXIT: "exit"}
+
+Frame = Union[bytes, str]
+
+
+def _pack_str(value: str) -> bytes:
+    raw = value.encode()
+    if len(raw) > 255:
+        raw = raw[:255].decode("utf-8", "ignore").encode()
+    return bytes((len(raw),)) + raw
+
+
+def _unpack_str(buf: bytes, offset: int) -> tuple[str, int]:
+    n = buf[offset]
+    end = offset + 1 + n
+    return buf[offset + 1:end].decode(), end
+
+
+def _opt(value: float | None) -> float:
+    return math.nan if value is None else value
+
+
+def _from_opt(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+
+def _pack_timestamp(ts: datetime) -> tuple[int, int]:
+    offset = ts.utcoffset()
+    wall = ts.replace(tzinfo=None)
+    seconds = int((wall - _EPOCH).total_seconds())
+    if offset is None:
+        return seconds, NAIVE_TZ
+    return seconds, int(offset.total_seconds() // 60)
+
+
+def _unpack_timestamp(seconds: int, offset_min: int) -> datetime:
+    wall = _EPOCH + timedelta(seconds=seconds)
+    if offset_min == NAIVE_TZ:
+        return wall
+    return wall.replace(tzinfo=timezone(timedelta(minutes=offset_min)))
+
+
+def encode_event(event: TradingEvent) -> bytes | None:
+    """Pack one event, or None if it has no binary layout."""
+    data = event.data
+    if isinstance(data, CandlePayload):
+        seconds, offset = _pack_timestamp(data.timestamp)
+        try:
+            body = _CANDLE.pack(seconds, offset, data.open, data.high, data.low,
+                                data.close, int(data.volume))
+        except (struct.error, ValueError, OverflowError):
+            return None  # e.g. volume outside uint32: send the JSON frame
+        return (
+            _HEADER.pack(VERSION, KIND_CANDLE, event.timestamp)
+            + body
+            + _pack_str(data.symbol)
+        )
+    if isinstance(data, EntryPayload) and data.option is None:
+        return (
+            _HEADER.pack(VERSION, KIND_ENTRY, event.timestamp)
+            + _pack_str(data.side)
+            + _ENTRY.pack(data.entry_price, _opt(data.stop_price), _opt(data.target_price))
+        )
+    if isinstance(data, ExitPayload) and data.option is None:
+        return (
+            _HEADER.pack(VERSION, KIND_EXIT, event.timestamp)
+            + _pack_str(data.side)
+            + _EXIT.pack(data.entry_price, data.exit_price, data.pnl, data.daily_pnl)
+            + _pack_str(data.reason)
+        )
+    return None
+
+
+def encode_batch(frames: list[bytes]) -> bytes:
+    parts = [_HEADER.pack(VERSION, KIND_BATCH, 0.0), _COUNT.pack(len(frames))]
+    for frame in frames:
+        parts.append(_COUNT.pack(len(frame)))
+        parts.append(frame)
+    return b"".join(parts)
+
+
+def _coalesce_key(events: list[TradingEvent]) -> str | None:
+    return batch_key(coalesce_key(ev.event_type.value, ev.data) for ev in events)
+
+
+def json_frames(events: list[TradingEvent]) -> tuple[str, str | None]:
+    """The JSON text frame for a burst of events, and its coalesce key."""
+    frames = [ev.encode() for ev in events]
+    if len(frames) == 1:
+        return frames[0], _coalesce_key(events)
+    return '{"type":"batch","data":[' + ",".join(frames) + "]}", _coalesce_key(events)
+
+
+def binary_frames(events: Iterable[TradingEvent]) -> list[tuple[Frame, str | None]]:
+    """Frames for a binary client, in event order.
+
+    Consecutive packable events share one binary (batch) frame. Runs of other
+    events share one JSON text frame.
+    """
+    out: list[tuple[Frame, str | None]] = []
+    packed: list[tuple[TradingEvent, bytes]] = []
+    text: list[TradingEvent] = []
+
+    def flush_packed() -> None:
+        if packed:
+            frames = [frame for _, frame in packed]
+            body = frames[0] if len(frames) == 1 else encode_batch(frames)
+            out.append((body, _coalesce_key([ev for ev, _ in packed])))
+            packed.clear()
+
+    def flush_text() -> None:
+        if text:
+            out.append(json_frames(text))
+            text.clear()
+
+    for event in events:
+        frame = encode_event(event)
+        if frame is None:
+            flush_packed()
+            text.append(event)
+        else:
+            flush_text()
+            packed.append((event, frame))
+    flush_packed()
+    flush_text()
+    return out
+
+
+def decode(buf: bytes) -> dict[str, Any]:
+    """Decode a frame into the message dict its JSON form would carry."""
+    version, kind, ts = _HEADER.unpack_from(buf, 0)
+    if version != VERSION:
+        raise ValueError(f"Unsupported binary frame version {version}")
+    offset = _HEADER.size
+    if kind == KIND_BATCH:
+        (count,) = _COUNT.unpack_from(buf, offset)
+        offset += _COUNT.size
+        messages = []
+        for _ in range(count):
+            (length,) = _COUNT.unpack_from(buf, offset)
+            offset += _COUNT.size
+            messages.append(decode(buf[offset:offset + length]))
+            offset += length
+        return {"type": "batch", "data": messages}
+
+    data: dict[str, Any]
+    if kind == KIND_CANDLE:
+        seconds, tz, o, h, l, c, volume = _CANDLE.unpack_from(buf, offset)
+        symbol, _ = _unpack_str(buf, offset + _CANDLE.size)
+        data = {
+            "timestamp": _unpack_timestamp(seconds, tz).isoformat(),
+            "open": o, "high": h, "low": l, "close": c,
+            "volume": volume, "symbol": symbol,
+        }
+    elif kind == KIND_ENTRY:
+        side, offset = _unpack_str(buf, offset)
+        entry, stop, target = _ENTRY.unpack_from(buf, offset)
+        data = {
+            "side": side, "entry_price": entry,
+            "stop_price": _from_opt(stop), "target_price": _from_opt(target),
+            "option": None,
+        }
+    elif kind == KIND_EXIT:
+        side, offset = _unpack_str(buf, offset)
+        entry, exit_price, pnl, daily_pnl = _EXIT.unpack_from(buf, offset)
+        reason, _ = _unpack_str(buf, offset + _EXIT.size)
+        data = {
+            "side": side, "entry_price": entry, "exit_price": exit_price,
+            "pnl": pnl, "reason": reason, "daily_pnl": daily_pnl, "option": None,
+        }
+    else:
+        raise ValueError(f"Unknown binary frame kind {kind}")
+    return {"type": _KINDS[kind], "data": data, "ts": ts}
+
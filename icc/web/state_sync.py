@@ -0,0 +1,95 @@
+"""SnapshotStream — versioned dashboard state pushed as JSON-patch deltas.
+
+Each ``update`` diffs a fresh snapshot against the last one and, if
+anything changed, bumps the sequence number and records the ops
+(RFC 6902 add/replace/remove; lists are replaced whole). Clients apply
+deltas in sequence order and request a full resync when they see a gap.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections import deque
+from typing import Any
+
+HISTORY = 64
+
+
+def _escape(key: str) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff(old: Any, new: Any, path: str = "") -> list[dict[str, Any]]:
+    """JSON-patch ops turning ``old`` into ``new``."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: list[dict[str, Any]] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            elif old[key] != value:
+                ops.extend(diff(old[key], value, child))
+        return ops
+    if old == new and type(old) is type(new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(doc: Any, ops: list[dict[str, Any]]) -> Any:
+    """Apply ops produced by ``diff`` (returns a new document)."""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        if op["path"] == "":
+            doc = copy.deepcopy(op["value"])
+            continue
+        *parents, last = [_unescape(t) for t in op["path"].split("/")[1:]]
+        target = doc
+        for token in parents:
+            target = target[token]
+        if op["op"] == "remove":
+            del target[last]
+        else:
+            target[last] = copy.deepcopy(op["value"])
+    return doc
+
+
+class SnapshotStream:
+    """Tracks the last pushed snapshot and the recent deltas by sequence.
+
+    Snapshots are built fresh by get_snapshot(), so the stream keeps a
+    reference rather than a copy; callers must not mutate them afterwards.
+    """
+
+    def __init__(self, history: int = HISTORY) -> None:
+        self.seq = 0
+        self._state: dict[str, Any] = {}
+        self._history: deque[tuple[int, list[dict[str, Any]]]] = deque(maxlen=history)
+
+    def update(self, snapshot: dict[str, Any]) -> dict[str, Any] | None:
+        """Diff ``snapshot`` against the last state; returns the delta frame or None."""
+        ops = diff(self._state, snapshot)
+        if not ops:
+            return None
+        self.seq += 1
+        self._state = snapshot
+        self._history.append((self.seq, ops))
+        return {"seq": self.seq, "base": self.seq - 1, "ops": ops}
+
+    def full(self) -> dict[str, Any]:
+        return {"seq": self.seq, "state": self._state}
+
+    def since(self, seq: int) -> dict[str, Any] | None:
+        """Combined delta from ``seq`` to now, or None if it fell out of history."""
+        if seq == self.seq:
+            return {"seq": self.seq, "base": seq, "ops": []}
+        if seq > self.seq or not self._history or self._history[0][0] > seq + 1:
+            return None
+        ops = [op for s, delta in self._history if s > seq for op in delta]
+        return {"seq": self.seq, "base": seq, "ops": ops}
@@ -0,0 +1,138 @@
+"""TradeHistory — merged, cached trade list for /api/trades.
+
+Trades can live in several SQLite files (live, paper, simulated). Each DB
+is read through a pooled read-only engine; the per-DB queries select only
+the columns the API returns and run concurrently on the DB executor. Their
+results, each already newest-first, are k-way merged with ``heapq.merge``
+and deduplicated on (session_id, entry_time).
+
+The merged list is cached. ``invalidate`` is called when an entry or exit
+event arrives on the EventBus. Trades are written just after their event
+is emitted, so ``max_age_sec`` also bounds how long a read that raced the
+write can be served.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Iterable
+
+from icc.db.engine import get_read_engine
+from icc.db.executor import DBExecutor, db_executor
+from icc.db.repo import recent_trade_rows
+
+logger = logging.getLogger(__name__)
+
+KNOWN_DB_FILES = ("icc_live.db", "icc_trades.db", "icc_paper.db")
+
+
+def known_db_urls(primary: str | None = None) -> list[str]:
+    """The session's DB plus any known DB files in the working directory."""
+    urls = [primary] if primary else []
+    for db_file in KNOWN_DB_FILES:
+        url = f"sqlite:///{db_file}"
+        if os.path.exists(db_file) and url not in urls:
+            urls.append(url)
+    return urls
+
+
+def _sort_key(row: Any) -> datetime:
+    return row.entry_time or datetime.min
+
+
+def _to_dict(t: Any) -> dict[str, Any]:
+    inst_type = t.instrument_type or "FUTURES"
+    is_option = inst_type == "OPTIONS"
+    return {
+        "id": t.id,
+        "session_id": t.session_id,
+        "side": t.side,
+        "entry_price": t.entry_price,
+        "exit_price": t.exit_price,
+        "stop_price": None if is_option else t.stop_price,
+        "target_price": None if is_option else t.target_price,
+        "quantity": t.quantity,
+        "pnl": t.pnl,
+        "gross_pnl": (t.pnl + t.commission) if t.pnl is not None else None,
+        "commission": t.commission,
+        "entry_time": t.entry_time.isoformat() if t.entry_time else None,
+        "exit_time": t.exit_time.isoformat() if t.exit_time else None,
+        "exit_reason": t.exit_reason,
+        "instrument_type": inst_type,
+        "option_underlying": t.option_underlying,
+        "option_right": t.option_right,
+        "option_strike": t.option_strike,
+        "option_expiration": t.option_expiration,
+        "option_entry_premium": t.option_entry_premium,
+        "option_exit_premium": t.option_exit_premium,
+        "underlying_stop": t.stop_price if is_option else None,
+        "underlying_target": t.target_price if is_option else None,
+    }
+
+
+def merge_trades(per_db: Iterable[list[Any]], limit: int) -> list[dict[str, Any]]:
+    """Merge newest-first row lists into one deduplicated list of API dicts."""
+    out: list[dict[str, Any]] = []
+    seen: set[tuple[str, datetime | None]] = set()
+    for row in heapq.merge(*per_db, key=_sort_key, reverse=True):
+        key = (row.session_id, row.entry_time)
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(_to_dict(row))
+        if len(out) >= limit:
+            break
+    return out
+
+
+class TradeHistory:
+    """Recent trades across all known DBs, cached until the next entry/exit."""
+
+    def __init__(self, max_age_sec: float = 10.0, executor: DBExecutor | None = None) -> None:
+        self._max_age = max_age_sec
+        self._executor = executor or db_executor
+        self._cache: list[dict[str, Any]] | None = None
+        self._cache_limit = 0
+        self._cached_at = 0.0
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def open(self, db_urls: Iterable[str]) -> None:
+        """Create the pooled engines up front (e.g. at app startup)."""
+        for url in db_urls:
+            get_read_engine(url)
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._cache = None
+
+    async def recent(self, db_urls: list[str], limit: int) -> list[dict[str, Any]]:
+        cache = self._cache
+        if (cache is not None and limit <= self._cache_limit
+                and time.monotonic() - self._cached_at < self._max_age):
+            self.hits += 1
+            return cache[:limit]
+        self.misses += 1
+        version = self._version
+        per_db = await asyncio.gather(*(self._query(url, limit) for url in db_urls))
+        trades = merge_trades(per_db, limit)
+        if version == self._version:  # no entry/exit arrived mid-query
+            self._cache, self._cache_limit = trades, limit
+            self._cached_at = time.monotonic()
+        return trades
+
+    async def _query(self, url: str, limit: int) -> list[Any]:
+        try:
+            return await self._executor.read(url, recent_trade_rows, limit)
+        except Exception as e:
+            logger.debug("Skipping DB %s: %s", url, e)
+            return []
+
+    def get_stats(self) -> dict[str, Any]:
+        return {"cached": self._cache is not None, "hits": self.hits, "misses": self.misses}
@@ -11,9 +11,10 @@ from icc.alerts.ws_alert import WebSocketAlertChannel
 from icc.broker.backtest import BacktestBrokerAdapter
 from icc.config import AppSettings, load_config
 from icc.core.events import EventBus, EventType
+from icc.core.latency import profiler as latency_profiler
 from icc.core.trader import Trader
 from icc.market.candle import Candle
-from icc.market.feed import SimulatedLiveFeed
+from icc.market.feed import LiveFeed, MarketFeed, SimulatedLiveFeed
 from icc.oms.manager import OrderManager
 
 logger = logging.getLogger(__name__)
@@ -60,21 +61,29 @@ class TradingSession:
         self.event_bus = event_bus
         self._thread: Optional[threading.Thread] = None
         self._trader: Optional[Trader] = None
-        self._feed: Optional[SimulatedLiveFeed] = None
+        self._feed: Optional[MarketFeed] = None
         self._running = False
         self._config: Optional[AppSettings] = None
         self._mode: str = "simulated"
         self._lumi_trader = None
         self._lumi_strategy = None
         self._watchdog = None
+        self._persistence = None  # WriteBehindQueue for the simulated session
+        self._config_watcher = None  # ConfigWatcher when hot_reload is enabled
+        self._params = None  # LiveParams for the simulated session's trader
 
     @property
     def is_running(self) -> bool:
         return self._running and self._thread is not None and self._thread.is_alive()
 
     def start(self, data_file: Optional[str] = None, delay: float = 1.0,
-              instrument_type: str = "FUTURES", strategy_name: str = "ICC") -> None:
-        """Start the trading session in a background thread."""
+              instrument_type: str = "FUTURES", strategy_name: str = "ICC",
+              feed: Optional[MarketFeed] = None) -> None:
+        """Start the trading session in a background thread.
+
+        ``feed`` overrides the simulated candle replay, e.g. a LiveFeed
+        aggregating a realtime tick stream.
+        """
         if self.is_running:
             raise RuntimeError("Session already running")
 
@@ -83,14 +92,16 @@ class TradingSession:
         self._config.options.instrument_type = instrument_type
         self._config.strategy_name = strategy_name
 
-        # Load candles
-        if data_file:
-            from icc.backtest.data_loader import load_candles_csv
-            candles = load_candles_csv(data_file)
+        if feed is not None:
+            self._feed = feed
         else:
-            candles = _generate_sample_candles()
-
-        self._feed = SimulatedLiveFeed(candles, delay=delay)
+            # Load candles
+            if data_file:
+                from icc.backtest.data_loader import load_candles_csv
+                candles = load_candles_csv(data_file)
+            else:
+                candles = _generate_sample_candles()
+            self._feed = SimulatedLiveFeed(candles, delay=delay)
 
         # Set up broker + OMS
         broker = BacktestBrokerAdapter()
@@ -106,6 +117,8 @@ class TradingSession:
         init_db(self._config.db_url)
         db_session = get_db_session(self._config.db_url)
         session_id = "sim-" + uuid4().hex[:8]
+        from icc.db.write_behind import start_write_behind
+        self._persistence = start_write_behind(self._config.db_url, self._config.persistence)
 
         # Settlement tracker
         settlement_tracker = None
@@ -135,8 +148,19 @@ class TradingSession:
             session_id=session_id,
             settlement_tracker=settlement_tracker,
             research_agent=research_agent,
+            persistence=self._persistence,
         )
 
+        from icc.core.live_params import LiveParams
+        traders = {"sim": self._trader}
+        self._params = LiveParams(traders, persistence=self._persistence, session_id=session_id)
+        if self._config.hot_reload.enabled:
+            from icc.core.config_watcher import ConfigWatcher
+            self._config_watcher = ConfigWatcher(
+                "paper", traders, self._config.hot_reload.interval_sec, params=self._params,
+            )
+            self._config_watcher.start()
+
         self._running = True
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
@@ -146,14 +170,30 @@ class TradingSession:
     def _run_loop(self) -> None:
         """Main trading loop (runs in background thread)."""
         try:
-            for candle in self._feed:
-                if not self._running:
-                    break
-                self._trader.on_candle(candle)
+            if isinstance(self._feed, LiveFeed):
+                # Closed bars drive the pipeline; partial bars only check exits
+                for update in self._feed.updates():
+                    if not self._running:
+                        break
+                    if update.final:
+                        self._trader.on_candle(update.candle)
+                    else:
+                        self._trader.on_partial_candle(update.candle)
+            else:
+                for candle in self._feed:
+                    if not self._running:
+                        break
+                    self._trader.on_candle(candle)
         except Exception as e:
             logger.exception("Trading loop error: %s", e)
         finally:
             self._running = False
+            if self._config_watcher is not None:
+                self._config_watcher.stop()
+                self._config_watcher = None
+            if self._persistence is not None:
+                self._persistence.stop()  # commit queued trade writes
+                self._persistence = None
             self.event_bus.emit(EventType.SESSION_STOPPED)
             logger.info("Trading session stopped")
 
@@ -243,11 +283,33 @@ class TradingSession:
             except Exception as e:
                 logger.error("Error stopping Lumibot trader: %s", e)
             self._lumi_trader = None
+        self._lumi_strategy = None
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=5.0)
         self._mode = "simulated"
+        latency_profiler.log_summary(logger)
         logger.info("Trading session stop requested")
 
+    @property
+    def params(self):
+        """LiveParams of the running session (simulated or Lumibot), if any."""
+        if self._lumi_strategy is not None:
+            return getattr(self._lumi_strategy, "params", None)
+        return self._params if self.is_running else None
+
+    def update_params(self, patch: dict, source: str = "api"):
+        """Apply a partial strategy/orb/risk/options update to the running traders.
+
+        Returns (version, change): the parameter version after the update and
+        the recorded ParamChange, or None if nothing changed. Raises
+        RuntimeError when no session is running, ValueError on a bad patch.
+        """
+        params = self.params
+        if params is None:
+            raise RuntimeError("No running session")
+        change = params.apply(patch, source=source)
+        return params.version if change is None else change.version, change
+
     def flatten_and_stop(self) -> None:
         """End-of-session: flatten all positions, log summary, then stop."""
         logger.info("flatten_and_stop called — flattening positions")
@@ -273,11 +335,8 @@ class TradingSession:
         trader = self._trader
         if trader is None and self._lumi_strategy is not None:
             trader = getattr(self._lumi_strategy, "icc_trader", None)
-        if trader and not trader.positions.is_flat:
-            last = trader.buffer.last
-            if last:
-                trader._exit_position(last.close, "session_flatten")
-                logger.info("ICC internal position flattened")
+        if trader and trader.flatten(None, "session_flatten"):
+            logger.info("ICC internal position flattened")
 
         # Lumibot broker-level flatten
         if self._lumi_strategy is not None:
@@ -1,46 +1,225 @@
-"""WebSocket connection manager."""
+"""WebSocket connection manager.
+
+Each connection gets a bounded outgoing queue drained by its own writer task,
+so ``broadcast`` never waits on a client. A slow client's queued candle and
+snapshot frames are coalesced (only the newest is kept), and a client whose
+oldest queued frame is older than ``max_lag_sec`` — or whose queue fills —
+is disconnected. Coalescing is per instrument: a newer SPY candle never
+replaces a pending QQQ candle.
+
+Clients that offer the ``icc.bin.v1`` subprotocol are marked ``binary`` and
+are sent the packed frames from icc.web.binary_protocol where a broadcast
+provides them.
+"""
 
 from __future__ import annotations
 
-import json
+import asyncio
+import itertools
 import logging
-from typing import Any
+import time
+from collections import deque
+from typing import Any, Iterable, Sequence, Union
 
 from fastapi import WebSocket
 
+from icc.serialization import dumps
+
 logger = logging.getLogger(__name__)
 
+MAX_QUEUE = 256
+MAX_LAG_SEC = 15.0
+COALESCED_TYPES = ("candle", "snapshot")
+BINARY_PROTOCOL = "icc.bin.v1"
+
+_client_ids = itertools.count(1)
+
+Frame = Union[str, bytes]
+
+
+def coalesce_key(msg_type: str | None, data: Any) -> str | None:
+    """Key of one message that a newer message with the same key makes stale.
+
+    Kind plus instrument (``symbol``, ``underlying`` or ``ticker`` of the
+    payload, dict or dataclass), so different instruments never coalesce.
+    """
+    if msg_type not in COALESCED_TYPES:
+        return None
+    if isinstance(data, dict):
+        symbol = data.get("symbol") or data.get("underlying") or data.get("ticker")
+    else:
+        symbol = getattr(data, "symbol", None)
+    return f"{msg_type}:{symbol}" if symbol else msg_type
+
+
+def batch_key(keys: Iterable[str | None]) -> str | None:
+    """Key of a batch: the shared key of its messages, if they all have one."""
+    distinct = set(keys)
+    return distinct.pop() if len(distinct) == 1 else None
+
+
+def _coalesce_key(data: dict[str, Any]) -> str | None:
+    msg_type = data.get("type")
+    if msg_type == "batch":
+        return batch_key(coalesce_key(m.get("type"), m.get("data"))
+                         for m in data.get("data", ()))
+    return coalesce_key(msg_type, data.get("data"))
+
+
+class _Client:
+    """One connection's outgoing queue and delivery stats."""
+
+    def __init__(self, websocket: WebSocket, binary: bool = False) -> None:
+        self.id = next(_client_ids)
+        self.websocket = websocket
+        self.binary = binary
+        self.pending: deque[tuple[float, str | None, Frame]] = deque()  # (enqueued_at, key, frame)
+        self.wakeup = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self.connected_at = time.monotonic()
+        self.sent = 0
+        self.coalesced = 0
+        self.last_delivery_ms = 0.0
+        self.max_delivery_ms = 0.0
+
+    @property
+    def lag_sec(self) -> float:
+        """Age of the oldest frame still waiting to be sent."""
+        if not self.pending:
+            return 0.0
+        return time.monotonic() - self.pending[0][0]
+
+    def enqueue(self, text: Frame, key: str | None) -> None:
+        if key is not None:
+            for i, (_, queued_key, _) in enumerate(self.pending):
+                if queued_key == key:
+                    del self.pending[i]
+                    self.coalesced += 1
+                    break
+        self.pending.append((time.monotonic(), key, text))
+        self.wakeup.set()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "protocol": BINARY_PROTOCOL if self.binary else "json",
+            "queue_depth": len(self.pending),
+            "lag_ms": round(self.lag_sec * 1000.0, 1),
+            "last_delivery_ms": round(self.last_delivery_ms, 1),
+            "max_delivery_ms": round(self.max_delivery_ms, 1),
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "connected_sec": round(time.monotonic() - self.connected_at, 1),
+        }
+
 
 class ConnectionManager:
     """Manages active WebSocket connections and broadcasts events."""
 
-    def __init__(self) -> None:
-        self._connections: list[WebSocket] = []
+    def __init__(self, max_queue: int = MAX_QUEUE, max_lag_sec: float = MAX_LAG_SEC) -> None:
+        self._clients: dict[WebSocket, _Client] = {}
+        self._max_queue = max_queue
+        self._max_lag_sec = max_lag_sec
+        self.lag_disconnects = 0
 
     async def connect(self, websocket: WebSocket) -> None:
-        await websocket.accept()
-        self._connections.append(websocket)
-        logger.info("WebSocket client connected (%d total)", len(self._connections))
+        binary = BINARY_PROTOCOL in websocket.scope.get("subprotocols", ())
+        if binary:
+            await websocket.accept(subprotocol=BINARY_PROTOCOL)
+        else:
+            await websocket.accept()
+        client = _Client(websocket, binary=binary)
+        client.task = asyncio.create_task(self._writer(client))
+        self._clients[websocket] = client
+        logger.info("WebSocket client connected (%d total)", len(self._clients))
 
     def disconnect(self, websocket: WebSocket) -> None:
-        if websocket in self._connections:
-            self._connections.remove(websocket)
-        logger.info("WebSocket client disconnected (%d total)", len(self._connections))
+        client = self._clients.pop(websocket, None)
+        if client is not None and client.task is not None:
+            if client.task is not asyncio.current_task():
+                client.task.cancel()
+        logger.info("WebSocket client disconnected (%d total)", len(self._clients))
 
     async def broadcast(self, data: dict[str, Any]) -> None:
-        """Send JSON data to all connected clients."""
-        if not self._connections:
+        """Queue JSON data for all connected clients (never waits on a client)."""
+        if self._clients:
+            await self.broadcast_text(dumps(data), _coalesce_key(data))
+
+    async def broadcast_text(
+        self, message: str, key: str | None = None,
+        binary: Sequence[tuple[Frame, str | None]] | None = None,
+    ) -> None:
+        """Queue an already-encoded frame; ``key`` marks it coalescable (see ``coalesce_key``).
+
+        ``binary`` is the same content as (frame, key) pairs for binary clients;
+        without it they get ``message`` like everyone else.
+        """
+        for client in list(self._clients.values()):
+            if client.binary and binary is not None:
+                for frame, frame_key in binary:
+                    self._enqueue(client, frame, frame_key)
+                    if client.websocket not in self._clients:
+                        break  # dropped as too slow
+            else:
+                self._enqueue(client, message, key)
+
+    async def send(self, websocket: WebSocket, data: dict[str, Any]) -> None:
+        """Queue JSON data for one client, in order with broadcasts."""
+        client = self._clients.get(websocket)
+        if client is not None:
+            self._enqueue(client, dumps(data), _coalesce_key(data))
+
+    def _enqueue(self, client: _Client, message: Frame, key: str | None) -> None:
+        if client.lag_sec > self._max_lag_sec or len(client.pending) >= self._max_queue:
+            self._drop_slow(client)
             return
-        message = json.dumps(data)
-        dead: list[WebSocket] = []
-        for ws in self._connections:
-            try:
-                await ws.send_text(message)
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
-            self.disconnect(ws)
+        client.enqueue(message, key)
+
+    def _drop_slow(self, client: _Client) -> None:
+        logger.warning(
+            "WebSocket client %d lagging (%.1fs, %d queued) — disconnecting",
+            client.id, client.lag_sec, len(client.pending),
+        )
+        self.lag_disconnects += 1
+        self.disconnect(client.websocket)
+        asyncio.create_task(self._close(client.websocket))
+
+    @staticmethod
+    async def _close(websocket: WebSocket) -> None:
+        try:
+            await websocket.close(code=1013)  # Try again later
+        except Exception:
+            pass
+
+    async def _writer(self, client: _Client) -> None:
+        """Per-connection sender: drains the client's queue in order."""
+        try:
+            while True:
+                await client.wakeup.wait()
+                client.wakeup.clear()
+                while client.pending:
+                    enqueued_at, _, frame = client.pending.popleft()
+                    if isinstance(frame, bytes):
+                        await client.websocket.send_bytes(frame)
+                    else:
+                        await client.websocket.send_text(frame)
+                    delivery_ms = (time.monotonic() - enqueued_at) * 1000.0
+                    client.sent += 1
+                    client.last_delivery_ms = delivery_ms
+                    client.max_delivery_ms = max(client.max_delivery_ms, delivery_ms)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug("WebSocket client %d send failed: %s", client.id, e)
+            self.disconnect(client.websocket)
+
+    def get_client_stats(self) -> list[dict[str, Any]]:
+        return [client.stats() for client in self._clients.values()]
 
     @property
     def client_count(self) -> int:
-        return len(self._connections)
+        return len(self._clients)
+
+    @property
+    def binary_client_count(self) -> int:
+        return sum(1 for client in self._clients.values() if client.binary)
@@ -0,0 +1,70 @@
+"""Compare JSON backends on the hot web paths.
+
+Usage: python scripts/bench_serialization.py [iterations]
+
+Measures encoding a burst of candle events as one WebSocket batch frame
+and a 500-row /api/trades response, for each installed backend.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from datetime import datetime, timedelta
+
+from icc import serialization
+from icc.core.events import CandlePayload, EventType, TradingEvent
+
+
+def _candle_events(n: int = 50) -> list[TradingEvent]:
+    start = datetime(2026, 3, 2, 9, 30)
+    return [
+        TradingEvent(EventType.CANDLE, CandlePayload(
+            start + timedelta(minutes=i), 5000.0 + i, 5001.5 + i, 4999.25 + i,
+            5000.75 + i, 1200 + i,
+        ))
+        for i in range(n)
+    ]
+
+
+def _trades(n: int = 500) -> list[dict]:
+    start = datetime(2026, 3, 2, 9, 30)
+    return [
+        {
+            "id": i, "ticker": "MES", "side": "long" if i % 2 else "short",
+            "entry_time": (start + timedelta(minutes=i)).isoformat(),
+            "exit_time": (start + timedelta(minutes=i + 7)).isoformat(),
+            "entry_price": 5000.25 + i, "exit_price": 5003.5 + i,
+            "quantity": 1, "pnl": 16.25, "exit_reason": "target", "mode": "paper",
+        }
+        for i in range(n)
+    ]
+
+
+def _time(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(iterations: int = 2000) -> None:
+    trades = _trades()
+    print(f"{'backend':<10} {'batch (us)':>12} {'trades (us)':>12}")
+    for name in serialization.BACKENDS:
+        if serialization.set_backend(name) != name:
+            continue
+
+        def batch() -> str:
+            # Fresh events each time so the per-event frame cache doesn't hide encoding
+            frames = [ev.encode() for ev in _candle_events()]
+            return '{"type":"batch","data":[' + ",".join(frames) + "]}"
+
+        batch_us = _time(batch, iterations // 10)
+        trades_us = _time(lambda: serialization.dumps_bytes(trades), iterations // 10)
+        print(f"{name:<10} {batch_us:>12.1f} {trades_us:>12.1f}")
+    serialization.set_backend()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,107 @@
+"""Concurrent read/write throughput on trades and risk_state, default vs tuned SQLite.
+
+Usage: python scripts/bench_sqlite.py [seconds] [readers]
+
+One writer thread alternates a trade insert and a risk_state upsert, each
+committed on its own, like the trading thread. Reader threads run the
+/api/trades query (repo.recent_trade_rows) in a loop. "default" uses a
+plain create_engine (rollback journal, synchronous=FULL); "tuned" uses
+icc.db.engine's pooled WAL engines.
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from icc.db import engine as db_engine
+from icc.db.models import Base, RiskStateRecord, TradeRecord
+from icc.db.repo import recent_trade_rows
+
+
+def _run(write_engine, read_engine, seconds: float, readers: int) -> dict[str, float]:
+    stop = threading.Event()
+    counts = {"writes": 0, "reads": 0, "read_errors": 0}
+    read_ms: list[float] = []
+    lock = threading.Lock()
+
+    def writer() -> None:
+        with Session(write_engine) as db:
+            i = 0
+            while not stop.is_set():
+                i += 1
+                db.add(TradeRecord(session_id="bench", side="BUY", entry_price=5000.0 + i,
+                                   stop_price=4990.0, target_price=5010.0))
+                db.commit()
+                row = db.get(RiskStateRecord, "2026-03-02")
+                if row is None:
+                    row = RiskStateRecord(trading_date="2026-03-02")
+                    db.add(row)
+                row.daily_pnl = float(i)
+                row.trade_count = i
+                db.commit()
+                counts["writes"] += 2
+
+    def reader() -> None:
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with read_engine.connect() as conn:
+                    recent_trade_rows(conn, 50)
+            except Exception:
+                with lock:
+                    counts["read_errors"] += 1
+                continue
+            with lock:
+                counts["reads"] += 1
+                read_ms.append((time.perf_counter() - started) * 1000.0)
+
+    threads = [threading.Thread(target=writer)] + [
+        threading.Thread(target=reader) for _ in range(readers)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    read_ms.sort()
+    return {
+        "writes/s": counts["writes"] / seconds,
+        "reads/s": counts["reads"] / seconds,
+        "read p95 ms": read_ms[int(len(read_ms) * 0.95)] if read_ms else float("nan"),
+        "read errors": counts["read_errors"],
+    }
+
+
+def main(seconds: float = 3.0, readers: int = 4) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+
+        url = f"sqlite:///{Path(tmp) / 'default.db'}"
+        plain = create_engine(url)
+        Base.metadata.create_all(plain)
+        results["default"] = _run(plain, plain, seconds, readers)
+        plain.dispose()
+
+        url = f"sqlite:///{Path(tmp) / 'tuned.db'}"
+        db_engine.init_db(url)
+        results["tuned"] = _run(db_engine.get_engine(url), db_engine.get_read_engine(url),
+                                seconds, readers)
+        db_engine.reset_engine()
+
+    columns = list(results["default"])
+    print(f"{'profile':<10}" + "".join(f"{c:>14}" for c in columns))
+    for name, row in results.items():
+        print(f"{name:<10}" + "".join(f"{row[c]:>14.1f}" for c in columns))
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 3.0,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 4)
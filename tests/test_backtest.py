@@ -64,3 +64,70 @@ class TestBacktestEngine:
         result = engine.run()
         assert isinstance(result, BacktestResult)
         assert len(result.equity_curve) == 50
+
+
+def _session_candles(n: int = 400) -> list[Candle]:
+    base = datetime(2024, 1, 2, 9, 30)
+    candles = []
+    for i in range(n):
+        price = 100.0 + (i % 40) * 0.2 - (i % 7) * 0.15
+        spread = 0.2 + (i % 11) * 0.1
+        candles.append(Candle(
+            timestamp=base + timedelta(minutes=i),
+            open=price - 0.05, high=price + spread, low=price - spread,
+            close=price, volume=1000 + (i % 5) * 100,
+        ))
+    return candles
+
+
+class TestBacktestResearch:
+    def test_series_matches_live_agent(self, tmp_path):
+        import json
+
+        from icc.backtest.research import BacktestResearchAgent, ResearchSeries
+        from icc.market.candle import CandleBuffer
+        from icc.research.agent import ResearchAgent
+        from icc.research.config import ResearchConfig
+
+        calendar = tmp_path / "calendar.json"
+        calendar.write_text(json.dumps({"events": [
+            {"name": "CPI Release", "type": "CPI", "timestamp": "2024-01-02T12:00:00"},
+        ]}))
+        config = ResearchConfig(calendar_file=str(calendar), atr_lookback=50,
+                                min_confidence=0.5)
+        candles = _session_candles()
+        series = ResearchSeries.build(candles, config)
+        backtest_agent = BacktestResearchAgent(config, series)
+        live_agent = ResearchAgent(config)
+
+        buf = CandleBuffer(maxlen=100)
+        vetoes = 0
+        for candle in candles:
+            buf.append(candle)
+            for direction in ("long", "short"):
+                expected = live_agent.assess_entry(buf, direction, now=candle.timestamp)
+                assert backtest_agent.assess_entry(buf, direction) == expected
+                vetoes += not expected[0]
+        assert 0 < vetoes < len(candles) * 2
+
+    def test_engine_reuses_series_across_sweep(self):
+        candles = _session_candles(120)
+        config = AppSettings()
+        config.backtest.research_gate = True
+        engine = BacktestEngine(config, candles)
+        engine.run()
+        series = engine.research_series
+        assert series is not None and len(series) == len(candles)
+
+        swept = AppSettings()
+        swept.backtest.research_gate = True
+        swept.research.min_confidence = 0.9
+        swept.research.counter_vwap_mult = 0.5
+        engine = BacktestEngine(swept, candles, research_series=series)
+        engine.run()
+        assert engine.research_series is series
+
+        swept.research.atr_lookback = 50
+        engine = BacktestEngine(swept, candles, research_series=series)
+        engine.run()
+        assert engine.research_series is not series
@@ -0,0 +1,115 @@
+"""Tests for concurrent, incremental bar fetching."""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from icc.market.bar_fetcher import BarFetcher
+from icc.market.candle import Candle
+
+T0 = datetime(2024, 1, 2, 9, 30)
+
+
+def _bars(symbol, minutes):
+    return [
+        Candle(timestamp=T0 + timedelta(minutes=m), open=100, high=101,
+               low=99, close=100, volume=100, symbol=symbol)
+        for m in minutes
+    ]
+
+
+class FakeHistory:
+    """history_fn stand-in: serves bars up to ``self.now`` minutes."""
+
+    def __init__(self, delay=0.0):
+        self.now = 5
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker, since):
+        with self._lock:
+            self.calls.append((ticker, since))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        start = 0 if since is None else int((since - T0).total_seconds() // 60)
+        return _bars(ticker, range(start, self.now + 1))
+
+
+class TestBarFetcher:
+    def test_first_fetch_returns_latest_completed_bar_only(self):
+        fetcher = BarFetcher(FakeHistory())
+        bars = fetcher.fetch(["SPY"])
+        assert [b.timestamp for b in bars["SPY"]] == [T0 + timedelta(minutes=4)]
+
+    def test_incremental_since_last_seen(self):
+        history = FakeHistory()
+        fetcher = BarFetcher(history)
+        fetcher.fetch(["SPY"])
+        history.now = 8
+        bars = fetcher.fetch(["SPY"])
+        assert [b.timestamp.minute for b in bars["SPY"]] == [35, 36, 37]
+        assert history.calls[-1] == ("SPY", T0 + timedelta(minutes=4))
+        # Nothing new -> empty, cursor unchanged
+        assert fetcher.fetch(["SPY"])["SPY"] == []
+        assert fetcher.last_seen("SPY") == T0 + timedelta(minutes=7)
+
+    def test_forming_bar_delivered_once_complete(self):
+        forming = _bars("SPY", [0, 1])
+        final = _bars("SPY", [0, 1, 2])
+        final[1] = Candle(timestamp=final[1].timestamp, open=100, high=103,
+                          low=99, close=102, volume=900, symbol="SPY")
+        responses = iter([forming, final])
+        fetcher = BarFetcher(lambda ticker, since: next(responses))
+        assert [b.timestamp.minute for b in fetcher.fetch(["SPY"])["SPY"]] == [30]
+        (bar,) = fetcher.fetch(["SPY"])["SPY"]
+        assert (bar.timestamp.minute, bar.close, bar.volume) == (31, 102, 900)
+
+    def test_fetches_run_concurrently(self):
+        history = FakeHistory(delay=0.05)
+        fetcher = BarFetcher(history, max_workers=4)
+        tickers = ["SPY", "QQQ", "NVDA", "AAPL"]
+        start = time.perf_counter()
+        bars = fetcher.fetch(tickers)
+        elapsed = time.perf_counter() - start
+        assert set(bars) == set(tickers)
+        assert history.peak > 1
+        assert elapsed < 0.05 * len(tickers)
+        fetcher.close()
+
+    def test_concurrency_is_bounded(self):
+        history = FakeHistory(delay=0.02)
+        fetcher = BarFetcher(history, max_workers=2)
+        fetcher.fetch(["A", "B", "C", "D", "E"])
+        assert history.peak <= 2
+        fetcher.close()
+
+    def test_failure_isolated_and_counted(self):
+        def history(ticker, since):
+            if ticker == "BAD":
+                raise RuntimeError("boom")
+            return _bars(ticker, [0, 1])
+
+        fetcher = BarFetcher(history)
+        bars = fetcher.fetch(["SPY", "BAD"])
+        assert len(bars["SPY"]) == 1
+        assert bars["BAD"] == []
+        assert fetcher.last_seen("BAD") is None
+        stats = fetcher.get_latency_stats()
+        assert stats["BAD"]["errors"] == 1
+        assert stats["SPY"]["fetches"] == 1
+        fetcher.close()
+
+    def test_timeout_does_not_advance_cursor(self):
+        history = FakeHistory(delay=0.2)
+        fetcher = BarFetcher(history, timeout_sec=0.01)
+        bars = fetcher.fetch(["SPY", "QQQ"])
+        assert bars == {"SPY": [], "QQQ": []}
+        assert fetcher.last_seen("SPY") is None
+        assert fetcher.get_latency_stats()["SPY"]["errors"] == 1
+        fetcher.close()
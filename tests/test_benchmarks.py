@@ -0,0 +1,47 @@
+"""Tests for the benchmark harness (timing and regression compare)."""
+
+from benchmarks.harness import Case, compare, format_ns, run, run_case
+
+
+def _report(**times: float) -> dict:
+    return {"meta": {}, "results": {
+        name: {"min_ns": ns, "median_ns": ns, "mean_ns": ns} for name, ns in times.items()
+    }}
+
+
+class TestCompare:
+    def test_statuses(self):
+        rows = compare(_report(a=100.0, b=100.0, c=100.0, gone=5.0),
+                       _report(a=130.0, b=70.0, c=110.0, fresh=5.0), threshold=0.2)
+        status = {row["name"]: row["status"] for row in rows}
+        assert status == {"a": "regression", "b": "improved", "c": "ok",
+                          "gone": "missing", "fresh": "new"}
+        assert next(r for r in rows if r["name"] == "a")["ratio"] == 1.3
+
+    def test_threshold_is_exclusive(self):
+        rows = compare(_report(a=100.0), _report(a=120.0), threshold=0.2)
+        assert rows[0]["status"] == "ok"
+
+
+class TestRunCase:
+    def test_fixed_number_and_rounds(self):
+        calls = []
+        case = Case(name="t", group="g", setup=lambda: lambda: calls.append(1),
+                    rounds=3, number=7)
+        row = run_case(case)
+        assert len(calls) == 21
+        assert row["number"] == 7 and row["rounds"] == 3
+        assert row["min_ns"] <= row["median_ns"]
+
+    def test_run_report_shape(self):
+        case = Case(name="t", group="g", setup=lambda: lambda: None, rounds=1, number=10)
+        report = run([case], log=lambda line: None)
+        assert set(report) == {"meta", "results"}
+        assert report["results"]["t"]["group"] == "g"
+
+
+def test_format_ns():
+    assert format_ns(850) == "850 ns"
+    assert format_ns(2_500) == "2.50 us"
+    assert format_ns(3_000_000) == "3.00 ms"
+    assert format_ns(1.5e9) == "1.50 s"
@@ -0,0 +1,125 @@
+"""Tests for the packed binary WebSocket frames."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from icc.core.events import (
+    CandlePayload,
+    EntryPayload,
+    EventType,
+    ExitPayload,
+    TradingEvent,
+)
+from icc.web.binary_protocol import (
+    binary_frames,
+    decode,
+    encode_batch,
+    encode_event,
+    json_frames,
+)
+
+
+def _candle(minute: int = 0, ts: datetime | None = None, symbol: str = "SPY") -> TradingEvent:
+    ts = ts or datetime(2026, 3, 2, 9, 30 + minute)
+    return TradingEvent(
+        EventType.CANDLE, CandlePayload(ts, 5000.25, 5001.5, 4999.0, 5000.75, 1200 + minute, symbol),
+        timestamp=1772443800.5,
+    )
+
+
+def _entry(stop: float | None = 4995.0) -> TradingEvent:
+    return TradingEvent(EventType.ENTRY, EntryPayload("BUY", 5000.0, stop, None), timestamp=1.0)
+
+
+def _exit(option: dict | None = None) -> TradingEvent:
+    return TradingEvent(
+        EventType.EXIT, ExitPayload("BUY", 5000.0, 5004.0, 20.0, "target", 35.5, option),
+        timestamp=2.0,
+    )
+
+
+def _as_json(event: TradingEvent) -> dict:
+    return json.loads(event.encode())
+
+
+class TestEncodeDecode:
+    @pytest.mark.parametrize("make", [_candle, _entry, _exit])
+    def test_matches_json_frame(self, make):
+        event = make()
+        assert decode(encode_event(event)) == _as_json(event)
+
+    def test_null_prices_round_trip(self):
+        decoded = decode(encode_event(_entry(stop=None)))
+        assert decoded["data"]["stop_price"] is None
+        assert decoded["data"]["target_price"] is None
+
+    def test_aware_timestamp(self):
+        et = timezone(timedelta(hours=-5))
+        event = _candle(ts=datetime(2026, 3, 2, 9, 30, tzinfo=et))
+        assert decode(encode_event(event))["data"]["timestamp"] == "2026-03-02T09:30:00-05:00"
+
+    def test_candle_frame_smaller_than_json(self):
+        event = _candle()
+        assert len(encode_event(event)) < len(event.encode()) / 2
+
+    def test_unpackable_events(self):
+        assert encode_event(TradingEvent(EventType.ALERT, {"message": "hi"})) is None
+        assert encode_event(_exit(option={"symbol": "SPY260302C500"})) is None
+
+    def test_long_string_cut_on_character_boundary(self):
+        event = TradingEvent(
+            EventType.EXIT, ExitPayload("BUY", 1.0, 2.0, 1.0, "a" + "é" * 200, 1.0, None),
+            timestamp=2.0,
+        )
+        reason = decode(encode_event(event))["data"]["reason"]
+        assert reason == "a" + "é" * 127
+
+    def test_oversized_volume_falls_back_to_json(self):
+        ts = datetime(2026, 3, 2, 9, 30)
+        big = TradingEvent(EventType.CANDLE,
+                           CandlePayload(ts, 1.0, 1.0, 1.0, 1.0, 2 ** 32, "SPY"))
+        assert encode_event(big) is None
+        (frame, key), = binary_frames([big])
+        assert json.loads(frame)["data"]["volume"] == 2 ** 32 and key == "candle:SPY"
+
+    def test_batch(self):
+        events = [_candle(i) for i in range(3)]
+        decoded = decode(encode_batch([encode_event(ev) for ev in events]))
+        assert decoded == {"type": "batch", "data": [_as_json(ev) for ev in events]}
+
+    def test_bad_version(self):
+        frame = bytearray(encode_event(_candle()))
+        frame[0] = 9
+        with pytest.raises(ValueError):
+            decode(bytes(frame))
+
+
+class TestFrames:
+    def test_json_frames(self):
+        text, key = json_frames([_candle(0), _candle(1)])
+        assert key == "candle:SPY"
+        assert json.loads(text)["type"] == "batch"
+        text, key = json_frames([_entry()])
+        assert key is None
+        assert json.loads(text)["type"] == "entry"
+
+    def test_mixed_symbols_do_not_coalesce(self):
+        events = [_candle(0), _candle(0, symbol="QQQ")]
+        assert json_frames(events)[1] is None
+        assert [k for _, k in binary_frames(events)] == [None]
+        assert json_frames([_candle(0, symbol="QQQ")])[1] == "candle:QQQ"
+
+    def test_runs_keep_event_order(self):
+        alert = TradingEvent(EventType.ALERT, {"message": "hi"})
+        events = [_candle(0), _candle(1), alert, _exit(), _exit(option={"symbol": "X"})]
+        frames = binary_frames(events)
+        assert [(type(f), k) for f, k in frames] == [
+            (bytes, "candle:SPY"), (str, None), (bytes, None), (str, None),
+        ]
+        flat = []
+        for frame, _ in frames:
+            msg = decode(frame) if isinstance(frame, bytes) else json.loads(frame)
+            flat.extend(msg["data"] if msg["type"] == "batch" else [msg])
+        assert flat == [_as_json(ev) for ev in events]
@@ -0,0 +1,180 @@
+"""Tests for config loading: caching, compiled snapshots and hot reload."""
+
+import os
+import shutil
+
+import pytest
+
+from icc import config as config_module
+from icc.broker.backtest import BacktestBrokerAdapter
+from icc.config import (
+    AppSettings,
+    ORBConfig,
+    RiskConfig,
+    clear_config_cache,
+    compile_config,
+    load_config,
+)
+from icc.constants import OrderSide
+from icc.core.config_watcher import ConfigWatcher
+from icc.core.trader import Trader
+from icc.oms.manager import OrderManager
+
+
+@pytest.fixture
+def configs(tmp_path, monkeypatch):
+    """A private copy of configs/, so tests can edit files and write snapshots."""
+    root = tmp_path / "configs"
+    shutil.copytree(config_module.CONFIGS_DIR, root, ignore=shutil.ignore_patterns(".compiled"))
+    monkeypatch.setattr(config_module, "CONFIGS_DIR", root)
+    monkeypatch.setattr(config_module, "SNAPSHOT_DIR", root / ".compiled")
+    monkeypatch.chdir(tmp_path)
+    clear_config_cache()
+    yield root
+    clear_config_cache()
+
+
+def _count_yaml_reads(monkeypatch) -> list:
+    reads = []
+    real = config_module._load_yaml
+    monkeypatch.setattr(config_module, "_load_yaml", lambda p: reads.append(p) or real(p))
+    return reads
+
+
+def _edit(path, old: str, new: str) -> None:
+    """Rewrite ``path`` and push its mtime forward (coarse filesystem clocks)."""
+    stat = path.stat()
+    path.write_text(path.read_text().replace(old, new))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _trader(strategy_name: str = "ICC") -> Trader:
+    config = AppSettings()
+    config.strategy_name = strategy_name
+    return Trader(config, OrderManager(BacktestBrokerAdapter()))
+
+
+class TestLoadConfigCache:
+    def test_yaml_is_read_once_per_env(self, configs, monkeypatch):
+        reads = _count_yaml_reads(monkeypatch)
+        load_config("live")
+        n = len(reads)
+        load_config("live")
+        assert len(reads) == n
+        load_config("paper")
+        assert len(reads) > n
+
+    def test_returns_independent_copies(self, configs):
+        a = load_config("live")
+        a.risk.max_trades_per_session = 99
+        b = load_config("live")
+        assert b is not a
+        assert b.risk.max_trades_per_session != 99
+        assert b.options is not a.options
+
+    def test_icc_environment_variables_are_part_of_the_key(self, configs, monkeypatch):
+        monkeypatch.delenv("ICC_LOG_DIR", raising=False)
+        assert load_config("live").log_dir == "logs"
+        monkeypatch.setenv("ICC_LOG_DIR", "/tmp/icc-logs")
+        assert load_config("live").log_dir == "/tmp/icc-logs"
+
+    def test_clear_forces_reload(self, configs, monkeypatch):
+        load_config("live")
+        reads = _count_yaml_reads(monkeypatch)
+        clear_config_cache()
+        load_config("live")
+        assert reads
+
+    def test_edited_file_invalidates_entry(self, configs):
+        assert load_config("live").orb.range_minutes == 15
+        _edit(configs / "orb_default.yaml", "range_minutes: 15", "range_minutes: 20")
+        assert load_config("live").orb.range_minutes == 20
+
+
+class TestSnapshot:
+    def test_snapshot_replaces_yaml_parse(self, configs, monkeypatch):
+        expected = load_config("live")
+        path = compile_config("live")
+        assert path.stat().st_mode & 0o077 == 0
+        clear_config_cache()
+        reads = _count_yaml_reads(monkeypatch)
+        assert load_config("live") == expected
+        assert reads == []
+
+    def test_stale_snapshot_is_ignored(self, configs):
+        compile_config("live")
+        _edit(configs / "risk_default.yaml", "max_trades_per_session: 8",
+              "max_trades_per_session: 3")
+        clear_config_cache()
+        assert load_config("live").risk.max_trades_per_session == 3
+
+    def test_snapshot_tied_to_environment_variables(self, configs, monkeypatch):
+        monkeypatch.delenv("ICC_LOG_DIR", raising=False)
+        compile_config("live")
+        monkeypatch.setenv("ICC_LOG_DIR", "/tmp/icc-logs")
+        clear_config_cache()
+        assert load_config("live").log_dir == "/tmp/icc-logs"
+
+    def test_corrupt_snapshot_falls_back(self, configs):
+        path = compile_config("live")
+        path.write_text("{not json")
+        clear_config_cache()
+        assert load_config("live").env.value == "live"
+
+
+class TestTraderUpdateConfig:
+    def test_orb_swap_keeps_range_state(self):
+        trader = _trader("ORB")
+        trader.strategy._range_high, trader.strategy._range_low = 101.0, 99.0
+        new_orb = ORBConfig(min_range_pct=0.1)
+        assert trader.update_config(orb=new_orb) == ["orb"]
+        assert trader.strategy.config is new_orb
+        assert trader.config.orb is new_orb
+        assert trader.strategy._range_high == 101.0
+
+    def test_risk_swap_recomputes_caps_and_keeps_pnl(self):
+        trader = _trader()
+        trader.risk.update_pnl(-50.0)
+        trader.update_config(risk=RiskConfig(account_size=200.0, daily_loss_kill_pct=0.2))
+        assert trader.risk.state.daily_pnl == -50.0
+        assert trader.risk.check_kill_switch()
+
+    def test_unchanged_sections_are_skipped(self):
+        trader = _trader()
+        before = trader.config
+        assert trader.update_config(strategy=before.strategy.model_copy()) == []
+        assert trader.config is before
+
+    def test_open_position_survives(self):
+        trader = _trader()
+        trader.positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0)
+        trader.update_config(risk=RiskConfig(max_trades_per_session=1))
+        assert not trader.positions.is_flat
+
+
+class TestConfigWatcher:
+    def test_pushes_changed_sections(self, configs):
+        trader = _trader("ORB")
+        watcher = ConfigWatcher("live", {"SPY": trader})
+        assert watcher.check_once() == []
+        _edit(configs / "orb_default.yaml", "range_minutes: 15", "range_minutes: 30")
+        assert watcher.check_once() == ["orb"]
+        assert trader.strategy.config.range_minutes == 30
+        assert trader.config.strategy_name == "ORB"
+        assert watcher.reloads == 1
+
+    def test_invalid_yaml_keeps_parameters(self, configs):
+        trader = _trader()
+        watcher = ConfigWatcher("live", {"MES": trader})
+        before = trader.config.risk
+        _edit(configs / "risk_default.yaml", "account_size: 661.0", "account_size: [oops")
+        assert watcher.check_once() == []
+        assert watcher.errors == 1
+        assert trader.config.risk is before
+
+    def test_thread_lifecycle(self, configs):
+        watcher = ConfigWatcher("live", {}, interval_sec=0.01)
+        watcher.start()
+        assert watcher.is_running
+        watcher.stop()
+        assert not watcher.is_running
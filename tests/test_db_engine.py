@@ -0,0 +1,86 @@
+"""Tests for the SQLite engine profile."""
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+from sqlalchemy import text
+
+from icc.db import engine as engine_module
+
+from icc.db.engine import get_engine, get_read_engine, init_db, reset_engine
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    reset_engine()
+    url = f"sqlite:///{tmp_path / 'icc.db'}"
+    init_db(url)
+    yield url
+    reset_engine()
+
+
+def _pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestSQLiteProfile:
+    def test_writer_pragmas(self, db_url):
+        engine = get_engine(db_url)
+        assert _pragma(engine, "journal_mode") == "wal"
+        assert _pragma(engine, "synchronous") == 1  # NORMAL
+        assert _pragma(engine, "busy_timeout") == 5000
+        assert _pragma(engine, "cache_size") == -65536
+        assert engine.pool.size() == 5
+        assert not engine.pool._pre_ping  # local file: no SELECT 1 per checkout
+
+    def test_concurrent_first_use_shares_one_engine(self, tmp_path):
+        reset_engine()
+        url = f"sqlite:///{tmp_path / 'race.db'}"
+        real = engine_module._create_engine
+        barrier = threading.Barrier(8)
+        created = []
+
+        def slow_create(*args, **kwargs):
+            created.append(args[0])
+            time.sleep(0.02)  # widen the check-then-insert window
+            return real(*args, **kwargs)
+
+        engines = []
+
+        def worker():
+            barrier.wait()
+            engines.append(get_engine(url))
+            engines.append(get_read_engine(url))
+
+        with mock.patch.object(engine_module, "_create_engine", side_effect=slow_create):
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        assert len(created) == 2  # one writer, one read-only engine
+        assert len({id(e) for e in engines}) == 2
+        reset_engine()
+
+    def test_reader_sees_uncheckpointed_writes(self, db_url):
+        writer = get_engine(db_url)
+        with writer.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO risk_state (trading_date, daily_pnl, trade_count, consecutive_losses,"
+                " killed, pre_kill_triggered, updated_at)"
+                " VALUES ('2026-03-02', -5.0, 1, 0, 0, 0, '2026-03-02 09:30:00')"
+            ))
+        reader = get_read_engine(db_url)
+        assert _pragma(reader, "journal_mode") == "wal"
+        with reader.connect() as conn:
+            assert conn.execute(text("SELECT daily_pnl FROM risk_state")).scalar() == -5.0
+
+    def test_memory_db_not_wal(self):
+        reset_engine()
+        engine = get_engine("sqlite://")
+        assert _pragma(engine, "journal_mode") == "memory"
+        assert _pragma(engine, "busy_timeout") == 5000
+        reset_engine()
@@ -0,0 +1,77 @@
+"""Tests for running DB reads off the event loop."""
+
+import asyncio
+import time
+
+import pytest
+
+from icc.db.engine import get_session, init_db, reset_engine
+from icc.db.executor import DBExecutor
+from icc.db.repo import create_trade, recent_trade_rows
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    reset_engine()
+    url = f"sqlite:///{tmp_path / 'trades.db'}"
+    init_db(url)
+    yield url
+    reset_engine()
+
+
+class TestDBExecutor:
+    def test_slow_read_does_not_block_loop(self):
+        executor = DBExecutor(max_workers=1)
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.005)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            result = await executor.run(lambda: time.sleep(0.1) or "done")
+            task.cancel()
+            return result, ticks
+
+        result, ticks = asyncio.run(run())
+        executor.shutdown()
+        assert result == "done"
+        assert ticks >= 5
+
+    def test_read_uses_connection(self, db_url):
+        db = get_session(db_url)
+        create_trade(db, session_id="s", side="BUY", entry_price=5000.0,
+                     stop_price=4990.0, target_price=5010.0)
+        db.close()
+        executor = DBExecutor()
+        rows = asyncio.run(executor.read(db_url, recent_trade_rows, 10))
+        executor.shutdown()
+        assert [(r.session_id, r.entry_price) for r in rows] == [("s", 5000.0)]
+
+    def test_stats_and_failures(self):
+        executor = DBExecutor(max_workers=2)
+
+        def boom():
+            raise RuntimeError("db gone")
+
+        async def run():
+            await executor.run(lambda: 1)
+            with pytest.raises(RuntimeError):
+                await executor.run(boom)
+
+        asyncio.run(run())
+        stats = executor.get_stats()
+        assert stats["completed"] == 1
+        assert stats["failed"] == 1
+        assert stats["in_flight"] == 0
+
+    def test_usable_after_shutdown(self):
+        executor = DBExecutor()
+        assert asyncio.run(executor.run(lambda: 1)) == 1
+        executor.shutdown()
+        assert asyncio.run(executor.run(lambda: 2)) == 2
+        executor.shutdown()
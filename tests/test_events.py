@@ -0,0 +1,103 @@
+"""Tests for EventBus sync/async delivery and drop accounting."""
+
+import asyncio
+import threading
+import time
+
+from icc.core.events import EventBus, EventType
+
+
+class TestSyncMode:
+    def test_drain(self):
+        bus = EventBus()
+        bus.emit(EventType.CANDLE, {"close": 1.0})
+        bus.emit(EventType.ENTRY)
+        events = bus.drain()
+        assert [e.event_type for e in events] == [EventType.CANDLE, EventType.ENTRY]
+        assert bus.get_stats()["mode"] == "sync"
+
+    def test_drops_counted_per_type(self):
+        bus = EventBus(maxsize=2)
+        for _ in range(3):
+            bus.emit(EventType.CANDLE)
+        bus.emit(EventType.EXIT)
+        stats = bus.get_stats()
+        assert stats["emitted"] == 4
+        assert stats["dropped"] == 2
+        assert stats["dropped_by_type"] == {"candle": 1, "exit": 1}
+
+    def test_emitted_counted_across_threads(self):
+        bus = EventBus(maxsize=1)
+
+        def emit_many():
+            for _ in range(2000):
+                bus.emit(EventType.CANDLE)
+
+        threads = [threading.Thread(target=emit_many) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = bus.get_stats()
+        assert stats["emitted"] == 8000
+        assert stats["dropped"] == 7999
+
+
+class TestAsyncMode:
+    def test_consumer_wakes_on_emit_from_thread(self):
+        async def run():
+            bus = EventBus()
+            bus.attach_loop(asyncio.get_running_loop())
+            started = time.perf_counter()
+            threading.Timer(0.01, bus.emit, args=(EventType.ENTRY, {"price": 1.0})).start()
+            events = await asyncio.wait_for(bus.get_batch(), timeout=1.0)
+            return events, time.perf_counter() - started
+
+        events, elapsed = asyncio.run(run())
+        assert [e.event_type for e in events] == [EventType.ENTRY]
+        assert elapsed < 0.09  # well under the old 100ms poll
+
+    def test_burst_batched(self):
+        async def run():
+            bus = EventBus()
+            bus.attach_loop(asyncio.get_running_loop())
+            for i in range(5):
+                bus.emit(EventType.CANDLE, {"i": i})
+            await asyncio.sleep(0)
+            return await bus.get_batch(max_events=3), await bus.get_batch()
+
+        first, second = asyncio.run(run())
+        assert [e.data["i"] for e in first] == [0, 1, 2]
+        assert [e.data["i"] for e in second] == [3, 4]
+
+    def test_events_before_attach_are_handed_over(self):
+        async def run(bus):
+            bus.attach_loop(asyncio.get_running_loop())
+            return await bus.get_batch()
+
+        bus = EventBus()
+        bus.emit(EventType.SESSION_STARTED)
+        events = asyncio.run(run(bus))
+        assert events[0].event_type == EventType.SESSION_STARTED
+        assert bus.drain() == []
+
+    def test_async_queue_full_counts_drop(self):
+        async def run():
+            bus = EventBus(maxsize=1)
+            bus.attach_loop(asyncio.get_running_loop())
+            bus.emit(EventType.CANDLE)
+            bus.emit(EventType.CANDLE)
+            await asyncio.sleep(0)
+            return bus
+
+        bus = asyncio.run(run())
+        assert bus.dropped == 1
+        assert bus.get_stats()["mode"] == "async"
+
+    def test_closed_loop_falls_back_to_sync(self):
+        bus = EventBus()
+        loop = asyncio.new_event_loop()
+        bus.attach_loop(loop)
+        loop.close()
+        bus.emit(EventType.EXIT)
+        assert [e.event_type for e in bus.drain()] == [EventType.EXIT]
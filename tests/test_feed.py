@@ -0,0 +1,111 @@
+"""Tests for tick aggregation and the streaming LiveFeed."""
+
+from datetime import datetime, timedelta
+
+from icc.broker.backtest import BacktestBrokerAdapter
+from icc.config import AppSettings
+from icc.constants import OrderSide
+from icc.core.trader import Trader
+from icc.market.aggregator import BarAggregator, Tick
+from icc.market.candle import Candle
+from icc.market.feed import LiveFeed, TickReplaySource, ticks_from_candles
+from icc.oms.manager import OrderManager
+
+T0 = datetime(2024, 1, 2, 9, 30)
+
+
+def _candle(close: float, ts: datetime = T0, volume: int = 1000) -> Candle:
+    return Candle(timestamp=ts, open=close - 0.5, high=close + 1.0,
+                  low=close - 1.0, close=close, volume=volume)
+
+
+def _series(closes: list[float]) -> list[Candle]:
+    return [_candle(c, T0 + timedelta(minutes=i)) for i, c in enumerate(closes)]
+
+
+def _tick(sec: float, price: float, size: int = 1) -> Tick:
+    return Tick(timestamp=T0 + timedelta(seconds=sec), price=price, size=size)
+
+
+class TestBarAggregator:
+    def test_builds_candle_on_minute_boundary(self):
+        agg = BarAggregator()
+        assert agg.add_tick(_tick(0.5, 100.0)) is None
+        assert agg.add_tick(_tick(20, 102.0)) is None
+        assert agg.add_tick(_tick(40, 99.0)) is None
+        assert agg.add_tick(_tick(59.9, 101.0)) is None
+        done = agg.add_tick(_tick(60, 101.5))
+        assert done.timestamp == T0
+        assert (done.open, done.high, done.low, done.close, done.volume) == (100.0, 102.0, 99.0, 101.0, 4)
+        assert agg.partial.timestamp == T0 + timedelta(minutes=1)
+        assert agg.partial.open == 101.5
+
+    def test_late_tick_dropped(self):
+        agg = BarAggregator()
+        agg.add_tick(_tick(65, 100.0))
+        assert agg.add_tick(_tick(30, 50.0)) is None
+        assert agg.late_ticks == 1
+        assert agg.partial.low == 100.0
+
+    def test_flush_waits_for_bar_end(self):
+        agg = BarAggregator()
+        agg.add_tick(_tick(10, 100.0))
+        assert agg.flush(T0 + timedelta(seconds=59)) is None
+        assert agg.flush(T0 + timedelta(seconds=60)).close == 100.0
+        assert agg.partial is None
+
+    def test_merges_sub_minute_bars(self):
+        agg = BarAggregator()
+        for i in range(12):
+            agg.add_bar(_candle(100.0 + i, T0 + timedelta(seconds=5 * i), volume=10))
+        done = agg.flush()
+        assert done.open == 99.5
+        assert done.high == 112.0
+        assert done.low == 99.0
+        assert done.close == 111.0
+        assert done.volume == 120
+
+
+class TestLiveFeed:
+    def test_replayed_ticks_reproduce_candles(self):
+        candles = _series([100.0, 101.0, 99.5, 102.0])
+        feed = LiveFeed(TickReplaySource(ticks_from_candles(candles)))
+        out = list(feed)
+        assert out == candles
+
+    def test_updates_include_partials_before_final(self):
+        candles = _series([100.0, 101.0])
+        feed = LiveFeed(TickReplaySource(ticks_from_candles(candles)),
+                        partial_interval_sec=0)
+        updates = list(feed.updates())
+        first_final = next(i for i, u in enumerate(updates) if u.final)
+        partials = [u for u in updates[:first_final] if not u.final]
+        assert len(partials) == 4
+        assert partials[-1].candle == candles[0]
+
+    def test_partials_throttled(self):
+        ticks = [_tick(s, 100.0) for s in range(0, 60, 5)]
+        feed = LiveFeed(TickReplaySource(ticks), partial_interval_sec=30)
+        partials = [u for u in feed.updates() if not u.final]
+        assert len(partials) == 2  # at :00 and :30
+
+    def test_clock_closes_quiet_bar(self):
+        now = [T0 + timedelta(seconds=30)]
+        feed = LiveFeed(clock=lambda: now[0], partial_interval_sec=None, poll_sec=0.01)
+        feed.start()
+        feed.push_tick(_tick(10, 100.0))
+        now[0] = T0 + timedelta(seconds=61)
+        candle = next(iter(feed))
+        assert candle.timestamp == T0
+        feed.stop()
+
+
+class TestPartialCandleExit:
+    def test_stop_hit_intra_bar(self):
+        trader = Trader(AppSettings(), OrderManager(BacktestBrokerAdapter()))
+        trader.positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0)
+        trader.on_partial_candle(_candle(99.5))  # low 98.5
+        assert not trader.positions.is_flat
+        trader.on_partial_candle(_candle(98.5))  # low 97.5
+        assert trader.positions.is_flat
+        assert len(trader.buffer) == 0
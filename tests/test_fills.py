@@ -0,0 +1,179 @@
+"""Tests for the intrabar fill model and its broker/backtest wiring."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from icc.backtest.engine import BacktestEngine
+from icc.backtest.fills import FillModel
+from icc.broker.backtest import BacktestBrokerAdapter
+from icc.config import AppSettings
+from icc.constants import IntrabarPath, OrderSide, OrderStatus, OrderType
+from icc.market.candle import Candle
+from icc.oms.manager import OrderManager
+from icc.oms.orders import Order
+
+
+def _bar(o, h, l, c, volume=1000, minute=0):
+    return Candle(
+        timestamp=datetime(2024, 1, 2, 9, 30) + timedelta(minutes=minute),
+        open=o, high=h, low=l, close=c, volume=volume,
+    )
+
+
+class TestIntrabarPath:
+    def test_ohlc_hits_target_first_for_long(self):
+        model = FillModel(IntrabarPath.OHLC, base_slippage_ticks=0)
+        result, price = model.resolve_exit(True, 98.0, 104.0, 1, _bar(100, 105, 97, 101))
+        assert result == "target_hit"
+        assert price == pytest.approx(104.0)
+
+    def test_olhc_hits_stop_first_for_long(self):
+        model = FillModel(IntrabarPath.OLHC, base_slippage_ticks=0)
+        result, price = model.resolve_exit(True, 98.0, 104.0, 1, _bar(100, 105, 97, 101))
+        assert result == "stop_hit"
+        assert price == pytest.approx(98.0)
+
+    def test_brownian_is_deterministic_per_bar(self):
+        bar = _bar(100, 105, 97, 101)
+        a = FillModel(IntrabarPath.BROWNIAN, seed=7).high_first(bar)
+        b = FillModel(IntrabarPath.BROWNIAN, seed=7).high_first(bar)
+        assert a == b
+
+    def test_brownian_path_depends_on_symbol(self):
+        model = FillModel(IntrabarPath.BROWNIAN, seed=7)
+        orders = set()
+        for symbol in ("SPY", "QQQ", "IWM", "DIA", "MES", "AAPL", "MSFT", "TSLA"):
+            bar = Candle(timestamp=datetime(2024, 1, 2, 9, 30), open=100, high=105,
+                         low=97, close=101, volume=1000, symbol=symbol)
+            orders.add(model.high_first(bar))
+        assert orders == {True, False}
+
+    def test_brownian_respects_open_at_extreme(self):
+        model = FillModel(IntrabarPath.BROWNIAN)
+        assert model.high_first(_bar(105, 105, 97, 101))
+        assert not model.high_first(_bar(97, 105, 97, 101, minute=1))
+
+    def test_neither_hit(self):
+        model = FillModel()
+        result, _ = model.resolve_exit(True, 98.0, 104.0, 1, _bar(100, 101, 99, 100.5))
+        assert result is None
+
+
+class TestGapThrough:
+    def test_long_stop_gap_fills_at_open(self):
+        model = FillModel(base_slippage_ticks=1, impact_ticks=0.0)
+        result, price = model.resolve_exit(True, 98.0, 104.0, 1, _bar(96, 97, 95, 96.5))
+        assert result == "stop_hit"
+        assert price == pytest.approx(96.0 - 0.25)
+
+    def test_short_target_gap_fills_at_open(self):
+        model = FillModel()
+        result, price = model.resolve_exit(False, 102.0, 96.0, 1, _bar(95, 96, 94, 95.5))
+        assert result == "target_hit"
+        assert price == pytest.approx(95.0)
+
+    def test_buy_stop_entry_gap_fills_at_open(self):
+        model = FillModel(base_slippage_ticks=0, impact_ticks=0.0)
+        price, qty = model.stop_fill(OrderSide.BUY, 100.0, 1, _bar(101, 102, 100.5, 101.5))
+        assert price == pytest.approx(101.0)
+        assert qty == 1
+
+    def test_stop_not_traded_returns_none(self):
+        model = FillModel()
+        assert model.stop_fill(OrderSide.BUY, 110.0, 1, _bar(100, 102, 99, 101)) is None
+        assert model.stop_fill(OrderSide.SELL, 90.0, 1, _bar(100, 102, 99, 101)) is None
+
+
+class TestLiquidity:
+    def test_thin_bar_costs_more_slippage(self):
+        model = FillModel(base_slippage_ticks=1, impact_ticks=2.0)
+        assert model.slippage(1, 10_000) == pytest.approx(0.25)
+        assert model.slippage(1, 1) > model.slippage(1, 10_000)
+
+    def test_slippage_capped(self):
+        model = FillModel(base_slippage_ticks=1, impact_ticks=100.0, max_slippage_ticks=4)
+        assert model.slippage(10, 1) == pytest.approx(4 * 0.25)
+
+    def test_partial_fill_capped_by_volume(self):
+        model = FillModel(max_participation=0.1)
+        price, qty = model.stop_fill(OrderSide.BUY, 100.0, 5, _bar(99, 101, 98, 100, volume=20))
+        assert qty == 2
+
+
+    def test_thin_bar_fills_one_contract(self):
+        model = FillModel(max_participation=0.10)
+        assert model.fillable_quantity(5, 4) == 1
+        assert model.fillable_quantity(5, 0) == 0
+        price, qty = model.stop_fill(OrderSide.BUY, 100.0, 3, _bar(99, 101, 98, 100, volume=5))
+        assert qty == 1
+
+
+class TestBatch:
+    def test_resolve_exits_matches_single(self):
+        model = FillModel(IntrabarPath.BROWNIAN, seed=3)
+        bars = [_bar(100, 100 + i % 5, 97 + i % 3, 100.5, minute=i) for i in range(50)]
+        stops = [98.0] * len(bars)
+        targets = [103.0] * len(bars)
+        batch = model.resolve_exits(bars, True, stops, targets)
+        single = [model.resolve_exit(True, 98.0, 103.0, 1, b) for b in bars]
+        assert batch == single
+
+
+class TestBrokerIntegration:
+    def test_stop_order_requires_bar_to_trade_through(self):
+        broker = BacktestBrokerAdapter(fill_model=FillModel())
+        oms = OrderManager(broker, retry_backoff_sec=0.0)
+        broker.set_bar(_bar(100, 101, 99, 100.5))
+        order = oms.submit(Order(order_type=OrderType.STOP, side=OrderSide.BUY, price=105.0))
+        assert order.status == OrderStatus.REJECTED
+        assert order.filled_price is None
+
+    def test_partial_fill_status(self):
+        broker = BacktestBrokerAdapter(fill_model=FillModel(max_participation=0.1))
+        oms = OrderManager(broker, retry_backoff_sec=0.0)
+        broker.set_bar(_bar(99, 101, 98, 100, volume=20))
+        order = oms.submit(Order(
+            order_type=OrderType.STOP, side=OrderSide.BUY, price=100.0, quantity=5,
+        ))
+        assert order.status == OrderStatus.PARTIALLY_FILLED
+        assert order.filled_quantity == 2
+
+    def test_trader_exit_without_target(self):
+        from icc.core.trader import Trader
+
+        trader = Trader(AppSettings(), OrderManager(BacktestBrokerAdapter()),
+                        fill_model=FillModel(base_slippage_ticks=0))
+        trader.positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0)
+        trader.positions.position.target_price = None
+        trader._check_exit(_bar(100, 110, 99, 109))
+        assert not trader.positions.is_flat
+        trader._check_exit(_bar(100, 101, 97, 99, minute=1))
+        assert trader.positions.is_flat
+
+    def test_engine_passes_fill_model_to_trader(self, monkeypatch):
+        from icc.core import trader as trader_module
+
+        seen = []
+        real = trader_module.Trader.__init__
+
+        def spy(self, *args, **kwargs):
+            seen.append(kwargs.get("fill_model"))
+            real(self, *args, **kwargs)
+
+        monkeypatch.setattr(trader_module.Trader, "__init__", spy)
+        config = AppSettings()
+        config.backtest.fill_model_enabled = True
+        BacktestEngine(config, [_bar(100, 101, 99, 100, minute=i) for i in range(5)]).run()
+        assert isinstance(seen[0], FillModel)
+
+    def test_backtest_runs_with_fill_model(self):
+        config = AppSettings()
+        config.backtest.fill_model_enabled = True
+        config.backtest.intrabar_path = "BROWNIAN"
+        candles = [
+            _bar(100 + i * 0.1, 100.5 + i * 0.1, 99.5 + i * 0.1, 100 + i * 0.1, minute=i)
+            for i in range(60)
+        ]
+        result = BacktestEngine(config, candles).run()
+        assert len(result.equity_curve) == 60
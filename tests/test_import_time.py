@@ -0,0 +1,49 @@
+"""Import-time audit: heavy dependencies stay out of the light entry points.
+
+Each check runs in a fresh interpreter with ``-X importtime``. The module
+lists are the real contract; the time budgets are loose (several times the
+measured cost) and only catch a heavy import sneaking back in.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ("fastapi", "starlette", "sqlalchemy", "pydantic_settings", "jose", "uvicorn",
+         "lumibot", "yfinance", "pytz", "rich", "yaml", "pandas", "numpy")
+
+# module -> (heavy modules it may import, cumulative import budget in ms)
+BUDGETS = {
+    "icc.cli": ((), 250),
+    "icc.broker.option_chain": ((), 150),
+    "icc.config": (("pydantic_settings",), 1000),
+    "icc.core.trader": (("pydantic_settings",), 1200),
+    "icc.backtest.engine": (("pydantic_settings",), 1200),
+}
+
+
+def _import_profile(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per module, for a fresh ``import module``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_budget(module):
+    allowed, budget_ms = BUDGETS[module]
+    times = _import_profile(module)
+    loaded = {name.split(".")[0] for name in times}
+    unexpected = sorted((set(HEAVY) - set(allowed)) & loaded)
+    assert not unexpected, f"import {module} pulls in {unexpected}"
+    assert times[module] / 1000 < budget_ms
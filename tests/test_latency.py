@@ -0,0 +1,78 @@
+"""Tests for the on_candle latency profiler."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from icc.backtest.engine import BacktestEngine
+from icc.config import AppSettings
+from icc.core.latency import LatencyHistogram, LatencyProfiler, _bucket, _bucket_upper, profiler
+from icc.market.candle import Candle
+
+
+def _candles(n: int = 60) -> list[Candle]:
+    base = datetime(2024, 1, 2, 9, 30)
+    return [
+        Candle(timestamp=base + timedelta(minutes=i), open=100.0 + i * 0.1 - 0.05,
+               high=100.0 + i * 0.1 + 0.5, low=100.0 + i * 0.1 - 0.5,
+               close=100.0 + i * 0.1, volume=1000)
+        for i in range(n)
+    ]
+
+
+class TestLatencyHistogram:
+    def test_buckets_are_monotonic_and_bounded(self):
+        prev = -1
+        for v in list(range(5000)) + [10**k + 7 for k in range(4, 12)]:
+            b = _bucket(v)
+            assert b >= prev
+            prev = b
+            upper = _bucket_upper(b)
+            assert v <= upper
+            assert (upper - v) <= max(1, v) * 0.035
+
+    def test_percentiles(self):
+        h = LatencyHistogram()
+        for ns in range(1, 10_001):
+            h.record(ns * 1000)  # 1us .. 10ms
+        assert h.count == 10_000
+        assert h.percentile(0.50) == pytest.approx(5_000_000, rel=0.035)
+        assert h.percentile(0.99) == pytest.approx(9_900_000, rel=0.035)
+        assert h.percentile(1.0) == 10_000_000
+        assert h.summary()["p50_us"] == pytest.approx(5000, rel=0.035)
+
+    def test_merge(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        for ns in (100, 200, 300):
+            a.record(ns)
+        b.record(5_000_000)
+        a.merge(b)
+        assert a.count == 4
+        assert a.min == 100
+        assert a.max == 5_000_000
+
+
+class TestLatencyProfiler:
+    def test_stage_records(self):
+        prof = LatencyProfiler()
+        with prof.stage("custom"):
+            sum(range(1000))
+        snap = prof.snapshot()
+        assert list(snap) == ["custom"]
+        assert snap["custom"]["count"] == 1
+        assert "custom" in prof.format_table()
+
+    def test_trader_stages_when_enabled(self):
+        profiler.reset()
+        config = AppSettings()
+        config.metrics.latency = True
+        BacktestEngine(config, _candles()).run()
+        snap = profiler.snapshot()
+        for stage in ("on_candle", "buffer_append", "emit", "risk_checks", "strategy_evaluate"):
+            assert snap[stage]["count"] == 60
+        profiler.reset()
+
+    def test_disabled_by_default(self):
+        profiler.reset()
+        BacktestEngine(AppSettings(), _candles()).run()
+        assert profiler.snapshot() == {}
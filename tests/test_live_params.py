@@ -0,0 +1,180 @@
+"""Tests for live, versioned parameter updates."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+import typer
+
+from icc.broker.backtest import BacktestBrokerAdapter
+from icc.cli import _parse_assignments
+from icc.config import AppSettings
+from icc.core.events import EventBus
+from icc.core.live_params import LiveParams
+from icc.core.risk import RiskEngine
+from icc.core.trader import Trader
+from icc.db.engine import get_session, reset_engine
+from icc.db.models import AuditLogRecord
+from icc.db.write_behind import WriteBehindQueue
+from icc.oms.manager import OrderManager
+from icc.web.trading_session import TradingSession
+
+
+def _traders(*tickers: str, strategy_name: str = "ORB") -> dict[str, Trader]:
+    config = AppSettings()
+    shared_risk = RiskEngine(config.risk)
+    traders = {}
+    for ticker in tickers:
+        ticker_config = AppSettings()
+        ticker_config.strategy_name = strategy_name
+        ticker_config.options.underlying = ticker
+        traders[ticker] = Trader(ticker_config, OrderManager(BacktestBrokerAdapter()),
+                                 shared_risk_engine=shared_risk)
+    return traders
+
+
+class TestValidate:
+    @pytest.mark.parametrize("patch, message", [
+        ({}, "empty"),
+        ({"broker": {"api_key": "x"}}, "not updatable"),
+        ({"orb": {"no_such_field": 1}}, "Unknown field orb.no_such_field"),
+        ({"options": {"underlying": "QQQ"}}, "fixed for the session"),
+        ({"orb": "min_range_pct=0.2"}, "mapping of fields"),
+    ])
+    def test_rejected(self, patch, message):
+        params = LiveParams(_traders("SPY"))
+        with pytest.raises(ValueError, match=message):
+            params.apply(patch)
+        assert params.version == 0
+
+    def test_type_errors_leave_every_trader_untouched(self):
+        traders = _traders("SPY", "QQQ")
+        before = {t: trader.config for t, trader in traders.items()}
+        params = LiveParams(traders)
+        with pytest.raises(ValueError):
+            params.apply({"orb": {"min_range_pct": 0.2}, "risk": {"cooldown_seconds": "soon"}})
+        assert all(traders[t].config is before[t] for t in traders)
+
+    def test_no_traders(self):
+        with pytest.raises(RuntimeError):
+            LiveParams({}).apply({"orb": {"min_range_pct": 0.2}})
+
+
+class TestApply:
+    def test_swaps_every_engine_and_versions(self):
+        traders = _traders("SPY", "QQQ")
+        params = LiveParams(traders)
+        change = params.apply({
+            "orb": {"min_range_pct": 0.25},
+            "options": {"premium_stop_pct": 0.3},
+            "risk": {"max_trades_per_session": 4},
+        }, source="test")
+        assert change.version == params.version == 1
+        assert change.changes["orb"]["min_range_pct"] == [0.3, 0.25]
+        assert change.changes["risk"]["max_trades_per_session"][1] == 4
+        for ticker, trader in traders.items():
+            assert trader.strategy.config.min_range_pct == 0.25
+            assert trader.config.options.premium_stop_pct == 0.3
+            assert trader.risk.config.max_trades_per_session == 4
+            # Session overrides outside the patched fields are kept per trader
+            assert trader.config.options.underlying == ticker
+        assert [c.version for c in params.history] == [1]
+
+    def test_icc_strategy_engine(self):
+        traders = _traders("MES", strategy_name="ICC")
+        LiveParams(traders).apply({"strategy": {"ema_period": 30}})
+        assert traders["MES"].strategy.config.ema_period == 30
+
+    def test_no_op_is_not_versioned(self):
+        traders = _traders("SPY")
+        params = LiveParams(traders)
+        current = traders["SPY"].config.orb.min_range_pct
+        assert params.apply({"orb": {"min_range_pct": current}}) is None
+        assert params.version == 0
+
+    def test_diffed_per_trader(self):
+        traders = _traders("SPY", "QQQ")
+        traders["QQQ"].update_config(orb=traders["QQQ"].config.orb.model_copy(
+            update={"min_range_pct": 0.25}))
+        qqq_config = traders["QQQ"].config
+        change = LiveParams(traders).apply({"orb": {"min_range_pct": 0.25}})
+        assert change.tickers == {"SPY": {"orb": {"min_range_pct": [0.3, 0.25]}}}
+        assert traders["QQQ"].config is qqq_config  # already there: left alone
+        assert change.to_dict()["tickers"] == change.tickers
+
+    def test_differing_old_values_audited_per_trader(self):
+        traders = _traders("SPY", "QQQ")
+        traders["QQQ"].update_config(orb=traders["QQQ"].config.orb.model_copy(
+            update={"min_range_pct": 0.4}))
+        change = LiveParams(traders).apply({"orb": {"min_range_pct": 0.25}})
+        assert change.tickers["SPY"]["orb"]["min_range_pct"] == [0.3, 0.25]
+        assert change.tickers["QQQ"]["orb"]["min_range_pct"] == [0.4, 0.25]
+
+    def test_current_reflects_update(self):
+        params = LiveParams(_traders("SPY"))
+        params.apply({"orb": {"confirmation_bars": 3}})
+        assert params.current()["orb"]["confirmation_bars"] == 3
+
+
+class TestAudit:
+    def test_db_session(self, db_session):
+        params = LiveParams(_traders("SPY"), db_session=db_session, session_id="s1")
+        params.apply({"orb": {"min_range_pct": 0.2}}, source="api")
+        (row,) = db_session.query(AuditLogRecord).all()
+        details = json.loads(row.details)
+        assert row.action == "config_update"
+        assert details["version"] == 1 and details["source"] == "api"
+        assert details["session_id"] == "s1"
+        assert details["changes"]["orb"]["min_range_pct"] == [0.3, 0.2]
+
+    def test_write_behind(self, tmp_path):
+        reset_engine()
+        url = f"sqlite:///{tmp_path / 'audit.db'}"
+        queue = WriteBehindQueue(url)
+        queue.start()
+        params = LiveParams(_traders("SPY"), persistence=queue)
+        params.apply({"risk": {"cooldown_seconds": 120}})
+        params.apply({"risk": {"cooldown_seconds": 60}})
+        queue.stop()
+        db = get_session(url)
+        try:
+            versions = [json.loads(r.details)["version"]
+                        for r in db.query(AuditLogRecord).order_by(AuditLogRecord.id)]
+        finally:
+            db.close()
+            reset_engine()
+        assert versions == [1, 2]
+
+
+def test_session_without_traders_rejects_updates():
+    with pytest.raises(RuntimeError):
+        TradingSession(EventBus()).update_params({"orb": {"min_range_pct": 0.2}})
+
+
+def test_session_no_op_update_returns_version():
+    session = TradingSession(EventBus())
+    session._lumi_strategy = SimpleNamespace(params=LiveParams(_traders("SPY")))
+    assert session.update_params({"orb": {"min_range_pct": 0.2}})[0] == 1
+    assert session.update_params({"orb": {"min_range_pct": 0.2}}) == (1, None)
+
+
+def test_session_stop_drops_lumibot_strategy():
+    session = TradingSession(EventBus())
+    session._lumi_strategy = SimpleNamespace(params=LiveParams(_traders("SPY")))
+    session.stop()
+    assert session._lumi_strategy is None
+    assert session.params is None
+
+
+class TestParseAssignments:
+    def test_values_are_typed(self):
+        assert _parse_assignments(["orb.min_range_pct=0.25", "orb.reentry_allowed=false",
+                                   "risk.max_trades_per_session=4"]) == {
+            "orb": {"min_range_pct": 0.25, "reentry_allowed": False},
+            "risk": {"max_trades_per_session": 4},
+        }
+
+    @pytest.mark.parametrize("item", ["orb", "min_range_pct=1", "orb.=1"])
+    def test_malformed(self, item):
+        with pytest.raises(typer.BadParameter):
+            _parse_assignments([item])
@@ -0,0 +1,72 @@
+"""Tests for the queued JSON logging pipeline."""
+
+import json
+import logging
+from logging.handlers import QueueHandler
+
+import pytest
+
+from icc.logging_config import setup_logging, shutdown_logging
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    icc_logger = logging.getLogger("icc")
+    level = icc_logger.level
+    setup_logging(log_dir=str(tmp_path), level="INFO")
+    yield tmp_path
+    shutdown_logging()
+    icc_logger.setLevel(level)
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestSetupLogging:
+    def test_only_a_queue_handler_on_the_trading_side(self, log_dir):
+        handlers = logging.getLogger("icc").handlers
+        assert len(handlers) == 1 and isinstance(handlers[0], QueueHandler)
+        # Reconfiguring replaces the handler instead of stacking another
+        setup_logging(log_dir=str(log_dir), level="INFO")
+        assert len(logging.getLogger("icc").handlers) == 1
+
+    def test_json_records_with_extras(self, log_dir):
+        logging.getLogger("icc.core.trader").info(
+            "Exit (%s): PnL=%.2f", "stop_hit", -12.5,
+            extra={"event": "exit", "pnl": -12.5},
+        )
+        shutdown_logging()
+        (record,) = _lines(log_dir / "icc.log")
+        assert record["msg"] == "Exit (stop_hit): PnL=-12.50"
+        assert record["level"] == "INFO"
+        assert record["logger"] == "icc.core.trader"
+        assert record["event"] == "exit" and record["pnl"] == -12.5
+        assert "ts" in record
+
+    def test_files_are_routed_by_logger_and_level(self, log_dir):
+        logging.getLogger("icc.oms.manager").info("order submitted")
+        logging.getLogger("icc.web.app").info("client connected")
+        logging.getLogger("icc.web.app").warning("client lagging")
+        logging.getLogger("icc.core.trader").debug("below level")
+        shutdown_logging()
+        assert [r["msg"] for r in _lines(log_dir / "icc.log")] == [
+            "order submitted", "client connected", "client lagging"]
+        assert [r["msg"] for r in _lines(log_dir / "trades.log")] == ["order submitted"]
+        assert [r["msg"] for r in _lines(log_dir / "errors.log")] == ["client lagging"]
+
+    def test_exception_kept_as_field(self, log_dir):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("icc.core.trader").exception("failed")
+        shutdown_logging()
+        (record,) = _lines(log_dir / "errors.log")
+        assert record["msg"] == "failed"
+        assert "ValueError: boom" in record["exc"]
+
+    def test_unserializable_extra_falls_back_to_repr(self, log_dir):
+        logging.getLogger("icc.core.trader").info("odd", extra={"obj": object()})
+        shutdown_logging()
+        (record,) = _lines(log_dir / "icc.log")
+        assert record["obj"].startswith("<object object")
@@ -0,0 +1,111 @@
+"""Tests for the Prometheus metrics registry."""
+
+import threading
+from datetime import datetime, timedelta
+
+from icc import metrics
+from icc.backtest.engine import BacktestEngine
+from icc.config import AppSettings
+from icc.market.candle import Candle
+from icc.metrics import Registry, reason_label
+
+
+class TestRegistry:
+    def test_counter_render(self):
+        reg = Registry()
+        c = reg.counter("x_total", "Things.", ("kind",))
+        c.inc(labels=("a",))
+        c.inc(2, labels=("b",))
+        c.inc(labels=("a",))
+        text = reg.render()
+        assert "# TYPE x_total counter" in text
+        assert 'x_total{kind="a"} 2' in text
+        assert 'x_total{kind="b"} 2' in text
+
+    def test_label_values_escaped(self):
+        reg = Registry()
+        reg.counter("y_total", "Y.", ("v",)).inc(labels=('a"b\\c\nd',))
+        assert 'y_total{v="a\\"b\\\\c\\nd"} 1' in reg.render()
+
+    def test_wrong_label_count_raises(self):
+        reg = Registry()
+        c = reg.counter("z_total", "Z.", ("a", "b"))
+        try:
+            c.inc(labels=("only",))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError")
+
+    def test_shards_sum_across_threads(self):
+        reg = Registry()
+        c = reg.counter("t_total", "T.")
+        h = reg.histogram("t_seconds", "T.", buckets=(0.1, 1.0))
+
+        def work():
+            for _ in range(1000):
+                c.inc()
+                h.observe(0.5)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert c.value() == 4000
+        assert h.count() == 4000
+
+    def test_histogram_buckets_cumulative(self):
+        reg = Registry()
+        h = reg.histogram("lat_seconds", "L.", ("op",), buckets=(0.01, 0.1))
+        for v in (0.005, 0.05, 0.05, 5.0):
+            h.observe(v, labels=("submit",))
+        lines = reg.render().splitlines()
+        assert 'lat_seconds_bucket{op="submit",le="0.01"} 1' in lines
+        assert 'lat_seconds_bucket{op="submit",le="0.1"} 3' in lines
+        assert 'lat_seconds_bucket{op="submit",le="+Inf"} 4' in lines
+        assert 'lat_seconds_count{op="submit"} 4' in lines
+        assert any(line.startswith('lat_seconds_sum{op="submit"} 5.10') for line in lines)
+
+    def test_callback_gauge(self):
+        reg = Registry()
+        reg.gauge("depth", "D.", fn=lambda: 7)
+        reg.gauge("drops_total", "D.", ("type",), fn=lambda: {"candle": 3}, kind="counter")
+        text = reg.render()
+        assert "depth 7" in text
+        assert "# TYPE drops_total counter" in text
+        assert 'drops_total{type="candle"} 3' in text
+
+    def test_nan_gauge_renders(self):
+        reg = Registry()
+        reg.gauge("lag_seconds", "L.", fn=lambda: float("nan"))
+        reg.gauge("up", "U.", fn=lambda: 1)
+        lines = reg.render().splitlines()
+        assert "lag_seconds NaN" in lines
+        assert "up 1" in lines
+
+
+class TestReasonLabel:
+    def test_numbers_collapse(self):
+        assert reason_label("Max trades (3) reached") == reason_label("Max trades (5) reached")
+        assert reason_label("Cooldown active (30s remaining)") == "cooldown_active"
+        assert reason_label("Gross exposure cap: $10.00 open") == "gross_exposure_cap"
+        assert reason_label("premium $0.10 < min $0.20 (too cheap)") == "premium_min"
+        assert reason_label("") == "other"
+
+
+class TestTradingMetrics:
+    def test_backtest_counts_candles_and_transitions(self):
+        base = datetime(2024, 1, 2, 9, 30)
+        candles = [
+            Candle(timestamp=base + timedelta(minutes=i), open=100.0 + i * 0.1 - 0.05,
+                   high=100.0 + i * 0.1 + 0.5, low=100.0 + i * 0.1 - 0.5,
+                   close=100.0 + i * 0.1, volume=1000)
+            for i in range(50)
+        ]
+        config = AppSettings()
+        labels = (config.options.underlying,)
+        before = metrics.candles_total.value(labels)
+        BacktestEngine(config, candles).run()
+        assert metrics.candles_total.value(labels) - before == 50
+        assert "icc_candles_total" in metrics.REGISTRY.render()
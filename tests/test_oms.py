@@ -5,7 +5,7 @@ from icc.constants import OrderSide, OrderStatus, OrderType
 from icc.broker.backtest import BacktestBrokerAdapter
 from icc.oms.manager import OrderManager
 from icc.oms.orders import Order, Position
-from icc.oms.position_tracker import PositionTracker
+from icc.oms.position_tracker import PositionBook, PositionTracker
 
 
 class TestOrderManager:
@@ -79,3 +79,70 @@ class TestPositionTracker:
         tracker.open_position(OrderSide.BUY, 100.0, 98.0, 104.0)
         assert tracker.increment_bars() == 1
         assert tracker.increment_bars() == 2
+
+
+class TestScaling:
+    def test_scale_in_averages_entry(self):
+        tracker = PositionTracker()
+        tracker.open_position(OrderSide.BUY, 100.0, 98.0, 104.0, quantity=1)
+        pos = tracker.scale_in(102.0, 1)
+        assert pos.quantity == 2
+        assert pos.entry_price == pytest.approx(101.0)
+        assert len(pos.lots) == 2
+
+    def test_scale_out_fifo_and_close_totals(self):
+        tracker = PositionTracker()
+        tracker.open_position(OrderSide.BUY, 100.0, 98.0, 104.0, quantity=1)
+        tracker.scale_in(102.0, 1)
+        # FIFO: first lot (100) exits at 103 -> 3 * 5.0
+        partial = tracker.scale_out(103.0, 1)
+        assert partial == pytest.approx(15.0)
+        assert tracker.position.entry_price == pytest.approx(102.0)
+        # Runner (102) exits at 104 -> 2 * 5.0; close returns whole-trade P&L
+        total = tracker.close_position(104.0)
+        assert total == pytest.approx(25.0)
+        assert tracker.closed_pnl == pytest.approx(25.0)
+
+    def test_lot_pnls(self):
+        tracker = PositionTracker()
+        tracker.open_position(OrderSide.SELL, 100.0, 102.0, 96.0, quantity=2)
+        tracker.scale_in(101.0, 1)
+        assert tracker.position.lot_pnls(99.0) == pytest.approx([10.0, 10.0])
+
+    def test_check_scale_out(self):
+        tracker = PositionTracker()
+        pos = tracker.open_position(OrderSide.BUY, 100.0, 98.0, 104.0, quantity=2)
+        pos.scale_out_price = 102.0
+        pos.scale_out_quantity = 1
+        assert not tracker.check_scale_out(101.5, 99.0)
+        assert tracker.check_scale_out(102.0, 99.0)
+
+
+class TestPositionBook:
+    def test_concurrent_positions(self):
+        book = PositionBook()
+        spy = book.tracker("SPY")
+        qqq = book.tracker("QQQ")
+        spy.open_position(OrderSide.BUY, 100.0, 98.0, 104.0)
+        qqq.open_position(OrderSide.SELL, 200.0, 202.0, 196.0)
+        assert book.open_position_count == 2
+        assert spy.open_position_count == 2
+        assert set(book.positions) == {"SPY", "QQQ"}
+        assert book.tracker("SPY") is spy
+
+    def test_incremental_aggregate_pnl(self):
+        book = PositionBook()
+        spy = book.tracker("SPY")
+        qqq = book.tracker("QQQ")
+        spy.open_position(OrderSide.BUY, 100.0, 98.0, 104.0)
+        qqq.open_position(OrderSide.SELL, 200.0, 202.0, 196.0)
+        spy.mark(101.0)   # +5
+        qqq.mark(199.0)   # +5
+        assert book.unrealized_pnl == pytest.approx(10.0)
+        spy.mark(102.0)   # +10
+        assert book.unrealized_pnl == pytest.approx(15.0)
+        spy.close_position(102.0)
+        assert book.unrealized_pnl == pytest.approx(5.0)
+        assert book.closed_pnl == pytest.approx(10.0)
+        assert book.open_position_count == 1
+        assert book.total_pnl == pytest.approx(15.0)
@@ -0,0 +1,117 @@
+"""Tests for the multi-ticker PortfolioAllocator."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from icc.broker.backtest import BacktestBrokerAdapter
+from icc.config import AppSettings, PortfolioConfig
+from icc.constants import FSMState
+from icc.core.portfolio import PortfolioAllocator
+from icc.core.risk import RiskEngine
+from icc.core.strategy import Signal
+from icc.core.trader import Trader
+from icc.market.candle import Candle
+from icc.oms.manager import OrderManager
+from icc.oms.position_tracker import PositionBook
+
+
+def _candle(price: float, minute: int = 0) -> Candle:
+    return Candle(
+        timestamp=datetime(2024, 1, 2, 10, 0) + timedelta(minutes=minute),
+        open=price, high=price + 1.0, low=price - 1.0, close=price, volume=1000,
+    )
+
+
+def _setup(tickers, max_open=3, portfolio=None):
+    config = AppSettings()
+    config.risk.max_open_positions = max_open
+    config.risk.cooldown_seconds = 0
+    risk = RiskEngine(config.risk)
+    book = PositionBook()
+    allocator = PortfolioAllocator(portfolio or PortfolioConfig(), book)
+    traders = {}
+    for ticker in tickers:
+        cfg = config.model_copy(deep=True)
+        cfg.options.underlying = ticker
+        trader = Trader(
+            config=cfg,
+            order_manager=OrderManager(BacktestBrokerAdapter(), retry_backoff_sec=0.0),
+            shared_risk_engine=risk,
+            position_book=book,
+        )
+        allocator.register(ticker, trader)
+        traders[ticker] = trader
+    return allocator, book, traders
+
+
+def _queue(trader: Trader, price: float, confidence: float, long: bool = True):
+    trader.fsm.force_state(FSMState.CONTINUATION_UP if long else FSMState.CONTINUATION_DOWN)
+    signal = Signal(
+        action="enter_long" if long else "enter_short",
+        entry_price=price,
+        stop_price=price - 2.0 if long else price + 2.0,
+        target_price=price + 4.0 if long else price - 4.0,
+    )
+    trader._handle_entry(signal, _candle(price))
+    trader.pending_entry.confidence = confidence
+
+
+class TestPortfolioAllocator:
+    def test_entries_are_queued_not_executed(self):
+        _, book, traders = _setup(["SPY"])
+        _queue(traders["SPY"], 100.0, 0.9)
+        assert traders["SPY"].pending_entry is not None
+        assert book.open_position_count == 0
+
+    def test_concurrent_fills(self):
+        allocator, book, traders = _setup(["SPY", "QQQ", "NVDA"])
+        for i, ticker in enumerate(traders):
+            _queue(traders[ticker], 100.0 + i, 0.5)
+        filled = allocator.allocate()
+        assert sorted(filled) == ["NVDA", "QQQ", "SPY"]
+        assert book.open_position_count == 3
+
+    def test_ranked_by_confidence_under_position_cap(self):
+        allocator, book, traders = _setup(["SPY", "QQQ", "NVDA"], max_open=2)
+        _queue(traders["SPY"], 100.0, 0.5)
+        _queue(traders["QQQ"], 200.0, 0.9)
+        _queue(traders["NVDA"], 300.0, 0.7)
+        filled = allocator.allocate()
+        assert filled == ["QQQ", "NVDA"]
+        assert traders["SPY"].positions.is_flat
+        assert traders["SPY"].pending_entry is None
+
+    def test_gross_exposure_cap(self):
+        # Each entry is ~100 * $5 = $500 notional
+        allocator, book, traders = _setup(
+            ["SPY", "QQQ"], portfolio=PortfolioConfig(max_gross_exposure=800.0),
+        )
+        _queue(traders["SPY"], 100.0, 0.9)
+        _queue(traders["QQQ"], 100.0, 0.5)
+        assert allocator.allocate() == ["SPY"]
+
+    def test_correlation_cap_same_direction(self):
+        allocator, book, traders = _setup(
+            ["SPY", "QQQ"],
+            portfolio=PortfolioConfig(correlation_threshold=0.8, max_correlated_positions=1),
+        )
+        # Identical return paths -> correlation 1.0
+        for i in range(20):
+            price = 100.0 + (i % 3)
+            traders["SPY"].buffer.append(_candle(price, i))
+            traders["QQQ"].buffer.append(_candle(price * 2, i))
+        assert allocator.correlation("SPY", "QQQ") == pytest.approx(1.0)
+        _queue(traders["SPY"], 100.0, 0.9)
+        _queue(traders["QQQ"], 200.0, 0.5)
+        assert allocator.allocate() == ["SPY"]
+
+    def test_opposite_direction_not_correlation_capped(self):
+        allocator, book, traders = _setup(["SPY", "QQQ"])
+        for i in range(20):
+            price = 100.0 + (i % 3)
+            traders["SPY"].buffer.append(_candle(price, i))
+            traders["QQQ"].buffer.append(_candle(price * 2, i))
+        _queue(traders["SPY"], 100.0, 0.9, long=True)
+        _queue(traders["QQQ"], 200.0, 0.5, long=False)
+        assert sorted(allocator.allocate()) == ["QQQ", "SPY"]
@@ -0,0 +1,167 @@
+"""Tests for quote-driven intra-bar exits (PositionMonitor / Trader.on_quote)."""
+
+import threading
+import time
+from datetime import date
+
+import pytest
+
+from icc.broker.backtest import BacktestBrokerAdapter
+from icc.broker.option_chain import OptionContract
+from icc.config import AppSettings
+from icc.constants import OrderSide
+from icc.core.position_monitor import PositionMonitor
+from icc.core.trader import Trader
+from icc.oms.manager import OrderManager
+
+
+def _trader() -> Trader:
+    return Trader(AppSettings(), OrderManager(BacktestBrokerAdapter()))
+
+
+class TestOnQuote:
+    def test_stop_exits_at_quote(self):
+        trader = _trader()
+        trader.positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0)
+        assert trader.on_quote(99.0) is None
+        assert trader.on_quote(97.75) == "stop_hit"
+        assert trader.positions.is_flat
+
+    def test_short_target(self):
+        trader = _trader()
+        trader.positions.open_position(OrderSide.SELL, 100.0, 102.0, 96.0)
+        assert trader.on_quote(95.5) == "target_hit"
+
+    def test_premium_stop(self):
+        trader = _trader()
+        trader.positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0,
+                                       multiplier=100.0, entry_premium=1.00)
+        assert trader.on_quote(None, premium=0.90) is None
+        assert trader.on_quote(None, premium=0.79) == "premium_stop"
+
+    def test_premium_trail(self):
+        trader = _trader()
+        trader.positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0,
+                                       multiplier=100.0, entry_premium=1.00)
+        assert trader.on_quote(None, premium=1.40) is None
+        assert trader.on_quote(None, premium=1.15) == "premium_trail_stop"
+
+    def test_option_target_needs_premium_profit(self):
+        trader = _trader()
+        trader.positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0,
+                                       multiplier=100.0, entry_premium=1.00)
+        assert trader.on_quote(104.5, premium=0.95) is None
+        assert not trader.positions.is_flat
+
+    def test_underlying_stop_exits_option_at_quoted_premium(self):
+        trader = _trader()
+        trader.positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0,
+                                       multiplier=100.0, entry_premium=1.00)
+        lookups = []
+        trader._get_current_premium_safe = lambda: lookups.append(1) or 0.10
+        assert trader.on_quote(97.5, premium=0.85) == "stop_hit"
+        assert lookups == []
+        per_side = trader.config.options.option_commission_per_side
+        assert trader.risk.state.daily_pnl == pytest.approx((0.85 - 1.00) * 100.0 - per_side * 2)
+
+    def test_option_exit_commission_per_contract(self):
+        trader = _trader()
+        trader.positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0, quantity=3,
+                                       multiplier=100.0, entry_premium=1.00)
+        trader.on_quote(None, premium=0.50)
+        per_side = trader.config.options.option_commission_per_side
+        assert trader.risk.state.daily_pnl == (0.50 - 1.00) * 100.0 * 3 - per_side * 2 * 3
+
+
+class TestFlatten:
+    def test_flatten_at_price(self):
+        trader = _trader()
+        trader.positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0)
+        assert trader.flatten(101.0, "session_flatten")
+        assert trader.positions.is_flat
+        assert not trader.flatten(101.0, "session_flatten")
+
+    def test_flatten_without_price_or_candle_keeps_position(self):
+        trader = _trader()
+        trader.positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0)
+        assert not trader.flatten(None, "emergency_exit")
+        assert not trader.positions.is_flat
+
+    def test_flatten_waits_for_trading_thread_lock(self):
+        trader = _trader()
+        trader.positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0)
+        result = []
+        with trader._lock:
+            worker = threading.Thread(
+                target=lambda: result.append(trader.flatten(99.0, "emergency_exit")))
+            worker.start()
+            time.sleep(0.05)
+            assert not trader.positions.is_flat
+        worker.join(timeout=2.0)
+        assert result == [True]
+
+
+class TestPositionMonitor:
+    def test_poll_exits_and_records_latency(self):
+        traders = {"SPY": _trader(), "QQQ": _trader()}
+        traders["SPY"].positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0)
+        quotes = {"SPY": 97.0, "QQQ": 50.0}
+        monitor = PositionMonitor(traders, quote_fn=quotes.get)
+        assert monitor.poll_once() == [("SPY", "stop_hit")]
+        stats = monitor.get_stats()
+        assert stats["exits"] == 1
+        assert stats["exit_latency_ms"]["last"] is not None
+        assert monitor.poll_once() == []
+
+    def test_premium_comes_from_premium_fn_only(self):
+        trader = _trader()
+        trader.positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0,
+                                       multiplier=100.0, entry_premium=1.00)
+        trader._active_contract = OptionContract("SPY", "CALL", 100.0, date(2026, 3, 2),
+                                                 1.00, 100.0)
+        trader._premium_feed = lambda contract: 0.5  # delayed per-candle feed, not polled
+        assert PositionMonitor({"SPY": trader}).poll_once() == []
+        monitor = PositionMonitor({"SPY": trader}, premium_fn=lambda contract: 0.75)
+        assert monitor.poll_once() == [("SPY", "premium_stop")]
+
+    def test_quote_errors_ignored(self):
+        trader = _trader()
+        trader.positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0)
+
+        def boom(ticker):
+            raise RuntimeError("no data")
+
+        monitor = PositionMonitor({"SPY": trader}, quote_fn=boom)
+        assert monitor.poll_once() == []
+        assert not trader.positions.is_flat
+
+    def test_thread_exits_between_candles(self):
+        trader = _trader()
+        trader.positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0)
+        price = [99.0]
+        monitor = PositionMonitor({"SPY": trader}, quote_fn=lambda t: price[0],
+                                  interval_sec=0.01)
+        monitor.start()
+        try:
+            price[0] = 97.0
+            deadline = time.monotonic() + 2.0
+            while not trader.positions.is_flat and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            monitor.stop()
+        assert trader.positions.is_flat
+        assert monitor.exits == 1
+
+    def test_waits_for_trading_thread_lock(self):
+        trader = _trader()
+        trader.positions.open_position(OrderSide.BUY, 100.0, 98.0, 104.0)
+        monitor = PositionMonitor({"SPY": trader}, quote_fn=lambda t: 97.0)
+        result = []
+        with trader._lock:
+            worker = threading.Thread(target=lambda: result.extend(monitor.poll_once()))
+            worker.start()
+            time.sleep(0.05)
+            assert not trader.positions.is_flat  # blocked while on_candle holds the lock
+        worker.join(timeout=2.0)
+        assert result == [("SPY", "stop_hit")]
+        assert monitor.get_stats()["exit_latency_ms"]["last"] >= 40
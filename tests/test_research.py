@@ -9,7 +9,7 @@ import pytest
 
 from icc.market.candle import Candle, CandleBuffer
 from icc.research.agent import ResearchAgent
-from icc.research.calendar import EconomicCalendar, CalendarState
+from icc.research.calendar import EVENT_BLACKOUTS, EconomicCalendar, CalendarState
 from icc.research.config import ResearchConfig
 from icc.research.regime import RegimeDetector
 
@@ -120,6 +120,52 @@ class TestEconomicCalendar:
 
             os.unlink(f.name)
 
+    def test_indexed_lookup_matches_linear_scan(self):
+        base = datetime(2026, 1, 5, 8, 30)
+        types = ["FOMC", "CPI", "JOBLESS_CLAIMS", "OTHER"]
+        events = [{
+            "name": f"Event {i}",
+            "type": types[i % len(types)],
+            # Irregular spacing, some windows overlapping
+            "timestamp": (base + timedelta(minutes=i * 37 % 500 + i * 300)).isoformat(),
+        } for i in range(200)]
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            json.dump({"events": events}, f)
+        try:
+            cal = EconomicCalendar(f.name)
+        finally:
+            os.unlink(f.name)
+
+        def linear(now):
+            for ev in cal._events:
+                before, after = EVENT_BLACKOUTS.get(ev.event_type, EVENT_BLACKOUTS["DEFAULT"])
+                if ev.timestamp - timedelta(minutes=before) <= now <= ev.timestamp + timedelta(minutes=after):
+                    return f"{ev.event_type}: {ev.name}"
+            return None
+
+        t = base - timedelta(hours=1)
+        for _ in range(3000):
+            assert cal.check(t).active_event == linear(t)
+            t += timedelta(minutes=7)
+
+    def test_next_blackout_start(self):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            json.dump({"events": [
+                {"name": "NFP", "type": "NFP", "timestamp": "2026-03-06T08:30:00"},
+                {"name": "FOMC Rate Decision", "type": "FOMC",
+                 "timestamp": "2026-03-18T14:00:00"},
+            ]}, f)
+        try:
+            cal = EconomicCalendar(f.name)
+        finally:
+            os.unlink(f.name)
+
+        assert cal.next_blackout_start(datetime(2026, 3, 1)) == datetime(2026, 3, 6, 8, 15)
+        state = cal.check(datetime(2026, 3, 6, 8, 20))
+        assert state.in_blackout
+        assert state.next_blackout_start == datetime(2026, 3, 18, 13, 30)
+        assert cal.next_blackout_start(datetime(2026, 3, 19)) is None
+
 
 # --- Regime Detector ---
 
@@ -210,10 +256,118 @@ class TestRegimeDetector:
         # With insufficient data, should default to normal
         assert state.atr_regime == "normal"
 
+    def test_incremental_matches_fresh_detector(self):
+        config = ResearchConfig(atr_lookback=30)
+        detector = RegimeDetector(config)
+        source = _make_buffer(80)
+        buf = CandleBuffer(maxlen=200)
+        now = datetime(2026, 3, 10, 11, 0)
+        for candle in source.candles():
+            buf.append(candle)
+            incremental = detector.assess(buf, "short", now)
+            fresh = RegimeDetector(config).assess(buf, "short", now)
+            assert incremental == fresh
+
+    def test_sorted_mirror_after_eviction(self):
+        config = ResearchConfig(atr_lookback=20)
+        detector = RegimeDetector(config)
+        buf = _make_volatile_buffer(50)
+        track = detector.track(buf)
+        assert len(track._trs) == 20
+        assert track._sorted_trs == sorted(track._trs)
+
+    def test_vwap_resets_at_session_open(self):
+        detector = RegimeDetector(ResearchConfig())
+        buf = CandleBuffer(maxlen=200)
+        # Yesterday far above today's prices
+        day1 = datetime(2026, 3, 9, 10, 0)
+        for i in range(30):
+            buf.append(Candle(timestamp=day1 + timedelta(minutes=i), open=5300.0,
+                              high=5301.0, low=5299.0, close=5300.0, volume=1000))
+        day2 = datetime(2026, 3, 10, 9, 30)
+        for i in range(15):
+            buf.append(Candle(timestamp=day2 + timedelta(minutes=i), open=5200.0,
+                              high=5201.0, low=5199.0, close=5200.0, volume=1000))
+        track = detector.track(buf)
+        assert track.vwap == pytest.approx(5200.0)
+        state = detector.assess(buf, "long", datetime(2026, 3, 10, 11, 0))
+        assert state.vwap_aligned
+
+    def test_state_is_per_buffer(self):
+        detector = RegimeDetector(ResearchConfig())
+        calm = _make_buffer()
+        volatile = _make_volatile_buffer()
+        now = datetime(2026, 3, 10, 11, 0)
+        calm_state = detector.assess(calm, "long", now)
+        detector.assess(volatile, "long", now)
+        assert detector.assess(calm, "long", now).atr_percentile == calm_state.atr_percentile
+        assert (detector.assess(volatile, "long", now).atr_regime
+                == RegimeDetector(ResearchConfig()).assess(volatile, "long", now).atr_regime)
+
+    def test_rewound_buffer_rebuilds(self):
+        detector = RegimeDetector(ResearchConfig())
+        buf = _make_volatile_buffer()
+        now = datetime(2026, 3, 10, 11, 0)
+        detector.assess(buf, "long", now)
+        replay = _make_buffer(30)
+        buf._buf.clear()
+        for candle in replay.candles():
+            buf.append(candle)
+        assert (detector.assess(buf, "long", now).atr_percentile
+                == RegimeDetector(ResearchConfig()).assess(replay, "long", now).atr_percentile)
+
+    @staticmethod
+    def _feed(buf: CandleBuffer, start: int, stop: int) -> None:
+        base = datetime(2026, 3, 10, 9, 30)
+        for i in range(start, stop):
+            mid = 100.0 if i < 150 else 110.0  # price shift mid-session
+            buf.append(Candle(timestamp=base + timedelta(minutes=i), open=mid,
+                              high=mid + 1.0 + (i % 5) * 0.2, low=mid - 1.0, close=mid,
+                              volume=1000))
+
+    def test_sparse_assess_across_full_buffer_rebuilds(self):
+        detector = RegimeDetector(ResearchConfig())
+        buf = CandleBuffer(maxlen=200)
+        now = datetime(2026, 3, 10, 15, 0)
+        self._feed(buf, 0, 20)
+        detector.assess(buf, "long", now)
+        self._feed(buf, 20, 350)
+        track = detector.track(buf)
+        fresh = RegimeDetector(ResearchConfig()).track(buf)
+        assert track._session_count == fresh._session_count == 200
+        assert track.vwap == pytest.approx(fresh.vwap)
+        assert track._trs == fresh._trs
+
+    def test_tracking_every_candle_covers_the_session(self):
+        detector = RegimeDetector(ResearchConfig())
+        buf = CandleBuffer(maxlen=200)
+        for i in range(350):
+            self._feed(buf, i, i + 1)
+            detector.track(buf)
+        track = detector.track(buf)
+        assert track._session_count == 350
+        expected = (150 * (100.0 + 0.4 / 3) + 200 * (110.0 + 0.4 / 3)) / 350
+        assert track.vwap == pytest.approx(expected, rel=1e-3)
+
 
 # --- Research Agent ---
 
 class TestResearchAgent:
+    def test_trader_observes_every_candle(self):
+        from icc.broker.backtest import BacktestBrokerAdapter
+        from icc.config import AppSettings
+        from icc.core.trader import Trader
+        from icc.oms.manager import OrderManager
+
+        agent = ResearchAgent(ResearchConfig())
+        trader = Trader(AppSettings(), OrderManager(BacktestBrokerAdapter()),
+                        research_agent=agent)
+        candles = CandleBuffer(maxlen=250)
+        TestRegimeDetector._feed(candles, 0, 250)
+        for candle in candles.candles():
+            trader.on_candle(candle)
+        assert agent._regime.track(trader.buffer)._session_count == 250
+
     def test_disabled_full_confidence(self):
         config = ResearchConfig(enabled=False)
         agent = ResearchAgent(config)
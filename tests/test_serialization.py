@@ -0,0 +1,75 @@
+"""Tests for the JSON backends and typed event payloads."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from icc import serialization
+from icc.core.events import CandlePayload, EventType, ExitPayload, TradingEvent
+
+
+@pytest.fixture
+def restore_backend():
+    yield
+    serialization.set_backend()
+
+
+def _candle_event(minute: int = 0) -> TradingEvent:
+    return TradingEvent(EventType.CANDLE, CandlePayload(
+        datetime(2026, 3, 2, 9, 30 + minute), 5000.0, 5001.5, 4999.25, 5000.75, 1200,
+    ), timestamp=1772443800.0)
+
+
+class TestBackends:
+    @pytest.mark.parametrize("name", ["orjson", "stdlib"])
+    def test_backends_decode_alike(self, name, restore_backend):
+        if name != "stdlib":
+            pytest.importorskip(name)
+        assert serialization.set_backend(name) == name
+        msg = _candle_event().to_message()
+        decoded = json.loads(serialization.dumps(msg))
+        assert decoded == {
+            "type": "candle",
+            "data": {
+                "timestamp": "2026-03-02T09:30:00", "open": 5000.0, "high": 5001.5,
+                "low": 4999.25, "close": 5000.75, "volume": 1200, "symbol": "MES",
+            },
+            "ts": 1772443800.0,
+        }
+
+    def test_unknown_backend_falls_back(self, restore_backend):
+        assert serialization.set_backend("nope") == "stdlib"
+
+    def test_enum_and_bytes_round_trip(self):
+        raw = serialization.dumps_bytes({"t": EventType.EXIT, "n": [1, 2.5, None]})
+        assert isinstance(raw, bytes)
+        assert serialization.loads(raw) == {"t": "exit", "n": [1, 2.5, None]}
+
+    def test_unserializable_raises(self):
+        with pytest.raises(TypeError):
+            serialization.dumps({"x": object()})
+
+
+class TestPayloads:
+    def test_dict_style_access(self):
+        payload = ExitPayload("long", 100.0, 102.0, 10.0, "target", 25.0)
+        assert payload["pnl"] == 10.0
+        assert payload.get("option") is None
+        assert payload.get("missing", 1) == 1
+        with pytest.raises(KeyError):
+            payload["missing"]
+        assert payload.to_dict()["reason"] == "target"
+
+    def test_encode_is_cached(self):
+        event = _candle_event()
+        frame = event.encode()
+        assert event.encode() is frame
+        assert json.loads(frame)["data"]["close"] == 5000.75
+
+    def test_batch_frame_decodes(self):
+        frames = [_candle_event(i).encode() for i in range(3)]
+        batch = '{"type":"batch","data":[' + ",".join(frames) + "]}"
+        decoded = json.loads(batch)
+        assert decoded["type"] == "batch"
+        assert [m["data"]["timestamp"][-5:] for m in decoded["data"]] == ["30:00", "31:00", "32:00"]
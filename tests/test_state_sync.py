@@ -0,0 +1,122 @@
+"""Tests for versioned snapshot deltas."""
+
+import pytest
+
+from icc.web.state_sync import SnapshotStream, apply_patch, diff
+
+
+def _snap(**overrides):
+    base = {
+        "fsm_state": "FLAT",
+        "daily_pnl": 0.0,
+        "position": None,
+        "win_rate": {"rolling_win_rate": 0.5, "total_wins": 1},
+        "ticker_states": {"SPY": {"last_price": 500.0}, "QQQ": {"last_price": 400.0}},
+    }
+    base.update(overrides)
+    return base
+
+
+class TestDiff:
+    def test_only_changed_fields(self):
+        old = _snap()
+        new = _snap(daily_pnl=12.5)
+        new["ticker_states"] = {"SPY": {"last_price": 501.0}, "QQQ": {"last_price": 400.0}}
+        ops = diff(old, new)
+        assert ops == [
+            {"op": "replace", "path": "/daily_pnl", "value": 12.5},
+            {"op": "replace", "path": "/ticker_states/SPY/last_price", "value": 501.0},
+        ]
+
+    def test_add_remove_and_escaping(self):
+        old = {"a": 1, "x/y": {"k~": 1}}
+        new = {"b": 2, "x/y": {"k~": 2}}
+        ops = diff(old, new)
+        assert {"op": "remove", "path": "/a"} in ops
+        assert {"op": "add", "path": "/b", "value": 2} in ops
+        assert {"op": "replace", "path": "/x~1y/k~0", "value": 2} in ops
+        assert apply_patch(old, ops) == new
+
+    def test_none_to_dict_replaced_whole(self):
+        new = _snap(position={"side": "BUY", "entry_price": 100.0})
+        ops = diff(_snap(), new)
+        assert ops == [{"op": "replace", "path": "/position", "value": new["position"]}]
+
+    @pytest.mark.parametrize("new", [
+        _snap(position={"side": "SELL"}, daily_pnl=-3.0),
+        {"status": "no_session"},
+        _snap(ticker_states={}),
+    ])
+    def test_roundtrip(self, new):
+        old = _snap()
+        assert apply_patch(old, diff(old, new)) == new
+
+
+class TestSnapshotStream:
+    def test_sequence_advances_only_on_change(self):
+        stream = SnapshotStream()
+        first = stream.update(_snap())
+        assert first["seq"] == 1 and first["base"] == 0
+        assert stream.update(_snap()) is None
+        delta = stream.update(_snap(daily_pnl=5.0))
+        assert delta == {"seq": 2, "base": 1,
+                         "ops": [{"op": "replace", "path": "/daily_pnl", "value": 5.0}]}
+        assert stream.full() == {"seq": 2, "state": _snap(daily_pnl=5.0)}
+
+    def test_client_replay_matches_full(self):
+        stream = SnapshotStream()
+        client = {}
+        for pnl in (0.0, 1.0, 2.0, 2.0, 3.5):
+            delta = stream.update(_snap(daily_pnl=pnl))
+            if delta:
+                client = apply_patch(client, delta["ops"])
+        assert client == stream.full()["state"]
+
+    def test_since_combines_deltas(self):
+        stream = SnapshotStream()
+        stream.update(_snap())
+        seq = stream.seq
+        base = stream.full()["state"]
+        stream.update(_snap(daily_pnl=1.0))
+        stream.update(_snap(daily_pnl=1.0, fsm_state="INDICATION_UP"))
+        delta = stream.since(seq)
+        assert delta["base"] == seq and delta["seq"] == seq + 2
+        assert apply_patch(base, delta["ops"]) == stream.full()["state"]
+        assert stream.since(stream.seq)["ops"] == []
+
+    def test_since_outside_history_needs_resync(self):
+        stream = SnapshotStream(history=2)
+        for pnl in range(5):
+            stream.update(_snap(daily_pnl=float(pnl)))
+        assert stream.since(1) is None
+        assert stream.since(3) is not None
+        assert stream.since(99) is None
+
+
+class TestAppRefresh:
+    def test_rebuilds_only_when_dirty(self, monkeypatch):
+        import asyncio
+
+        from icc.web import app
+
+        builds = []
+
+        class _Session:
+            def get_snapshot(self):
+                builds.append(1)
+                return _snap(daily_pnl=float(len(builds)))
+
+        monkeypatch.setattr(app, "session", _Session())
+        monkeypatch.setattr(app, "snapshot_stream", SnapshotStream())
+        monkeypatch.setattr(app, "_snapshot_lock", None)
+        monkeypatch.setattr(app, "_snapshot_dirty", True)
+
+        async def run():
+            await app._refresh_snapshot()
+            await app._refresh_snapshot()  # clean: no rebuild
+            app._mark_snapshot_dirty()
+            await app._refresh_snapshot()
+
+        asyncio.run(run())
+        assert len(builds) == 2
+        assert app.snapshot_stream.full()["state"]["daily_pnl"] == 2.0
@@ -0,0 +1,95 @@
+"""Tests for the merged, cached /api/trades reader."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from icc.db.engine import get_read_engine, get_session, init_db, reset_engine
+from icc.db.models import TradeRecord
+from icc.db.repo import create_trade
+from icc.web.trade_history import TradeHistory
+
+T0 = datetime(2026, 3, 2, 9, 30)
+
+
+@pytest.fixture
+def dbs(tmp_path):
+    reset_engine()
+    urls = [f"sqlite:///{tmp_path / name}" for name in ("live.db", "paper.db")]
+    for url in urls:
+        init_db(url)
+    yield urls
+    reset_engine()
+
+
+def _add(url: str, session_id: str, minute: int, **kwargs) -> None:
+    db = get_session(url)
+    create_trade(
+        db, session_id=session_id, side="BUY", entry_price=5000.0 + minute,
+        stop_price=4990.0, target_price=5010.0, entry_time=T0 + timedelta(minutes=minute),
+        **kwargs,
+    )
+    db.close()
+
+
+class TestTradeHistory:
+    def test_merges_newest_first_and_dedupes(self, dbs):
+        live, paper = dbs
+        for minute in (0, 4, 8):
+            _add(live, "live-1", minute)
+        for minute in (2, 6):
+            _add(paper, "paper-1", minute)
+        _add(paper, "live-1", 4)  # same trade copied into both DBs
+
+        trades = asyncio.run(TradeHistory().recent(dbs, limit=10))
+        assert [t["entry_price"] for t in trades] == [5008.0, 5006.0, 5004.0, 5002.0, 5000.0]
+        assert trades[0]["entry_time"] == "2026-03-02T09:38:00"
+        assert trades[0]["instrument_type"] == "FUTURES"
+
+        top = asyncio.run(TradeHistory().recent(dbs, limit=2))
+        assert [t["entry_price"] for t in top] == [5008.0, 5006.0]
+
+    def test_option_fields(self, dbs):
+        _add(dbs[0], "s", 0, instrument_type="OPTIONS", option_strike=500.0, pnl=12.0, commission=1.3)
+        (trade,) = asyncio.run(TradeHistory().recent(dbs, limit=5))
+        assert trade["stop_price"] is None
+        assert trade["underlying_stop"] == 4990.0
+        assert trade["gross_pnl"] == pytest.approx(13.3)
+
+    def test_cache_until_invalidated(self, dbs):
+        history = TradeHistory()
+        _add(dbs[0], "s", 0)
+
+        async def run():
+            first = await history.recent(dbs, limit=50)
+            _add(dbs[0], "s", 1)
+            cached = await history.recent(dbs, limit=10)
+            history.invalidate()
+            fresh = await history.recent(dbs, limit=10)
+            return first, cached, fresh
+
+        first, cached, fresh = asyncio.run(run())
+        assert len(first) == len(cached) == 1
+        assert len(fresh) == 2
+        assert history.get_stats() == {"cached": True, "hits": 1, "misses": 2}
+
+    def test_larger_limit_misses_cache(self, dbs):
+        history = TradeHistory()
+        asyncio.run(history.recent(dbs, limit=5))
+        asyncio.run(history.recent(dbs, limit=50))
+        assert history.misses == 2
+
+    def test_missing_db_skipped(self, dbs, tmp_path):
+        _add(dbs[0], "s", 0)
+        urls = dbs + [f"sqlite:///{tmp_path / 'absent.db'}"]
+        assert len(asyncio.run(TradeHistory().recent(urls, limit=5))) == 1
+        assert not (tmp_path / "absent.db").exists()
+
+    def test_read_engine_is_read_only(self, dbs):
+        engine = get_read_engine(dbs[0])
+        assert get_read_engine(dbs[0]) is engine
+        with pytest.raises(OperationalError):
+            with engine.begin() as conn:
+                conn.execute(TradeRecord.__table__.delete())
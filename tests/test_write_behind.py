@@ -0,0 +1,185 @@
+"""Tests for write-behind persistence."""
+
+import pytest
+
+from icc.config import RiskConfig
+from icc.core.risk import RiskEngine
+from icc.db.engine import get_session, reset_engine
+from icc.db.models import RiskStateRecord, TradeRecord
+from icc.db.write_behind import WriteBehindQueue, default_journal_path
+from icc.serialization import loads
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    reset_engine()
+    yield tmp_path / "trades.db"
+    reset_engine()
+
+
+def _queue(db_path, **kwargs) -> WriteBehindQueue:
+    url = f"sqlite:///{db_path}"
+    return WriteBehindQueue(url, journal_path=default_journal_path(url), **kwargs)
+
+
+def _trades(db_path) -> list[TradeRecord]:
+    db = get_session(f"sqlite:///{db_path}")
+    try:
+        return db.query(TradeRecord).order_by(TradeRecord.id).all()
+    finally:
+        db.close()
+
+
+def _trade_fields(**overrides) -> dict:
+    fields = dict(session_id="s1", side="BUY", entry_price=5000.0,
+                  stop_price=4990.0, target_price=5010.0)
+    fields.update(overrides)
+    return fields
+
+
+class TestWriteBehindQueue:
+    def test_create_and_close(self, db_path):
+        q = _queue(db_path)
+        q.start()
+        ticket = q.create_trade(**_trade_fields())
+        q.close_trade(ticket, 5010.0, 50.0, "target_hit")
+        assert q.flush()
+        q.stop()
+        (trade,) = _trades(db_path)
+        assert trade.exit_price == 5010.0
+        assert trade.exit_reason == "target_hit"
+        assert trade.exit_time is not None
+        assert q.get_stats()["committed"] == 2
+        assert db_path.with_name("trades.db.wbq").read_text() == ""  # drained -> truncated
+
+    def test_stop_flushes_queue(self, db_path):
+        q = _queue(db_path, flush_interval_sec=5.0)
+        q.start()
+        for i in range(20):
+            q.create_trade(**_trade_fields(entry_price=5000.0 + i))
+        q.stop()
+        assert len(_trades(db_path)) == 20
+
+    def test_risk_state_coalesced(self, db_path):
+        q = _queue(db_path)
+        q.start()
+        with q._cond:  # hold the worker off so the updates queue up
+            for pnl in (-10.0, -20.0, -30.0):
+                q.put_risk_state("2026-03-02", daily_pnl=pnl, trade_count=3)
+        q.stop()
+        assert q.coalesced == 2
+        db = get_session(f"sqlite:///{db_path}")
+        row = db.get(RiskStateRecord, "2026-03-02")
+        assert (row.daily_pnl, row.trade_count) == (-30.0, 3)
+        db.close()
+
+    def test_crash_replays_uncommitted_tail_once(self, db_path):
+        q1 = _queue(db_path)
+        q1.start()
+        ticket = q1.create_trade(**_trade_fields())
+        q1.stop()
+        # Simulate a crash: ops journaled, worker never commits them
+        q1._journal = open(q1._journal_path, "a", encoding="utf-8")
+        q1.close_trade(ticket, 4990.0, -50.0, "stop_hit")
+        q1.create_trade(**_trade_fields(session_id="s2"))
+        q1._journal.close()
+
+        q2 = _queue(db_path)
+        q2.start()  # replays and commits before returning
+        assert q2.replayed == 2
+        trades = _trades(db_path)
+        assert [t.session_id for t in trades] == ["s1", "s2"]
+        assert trades[0].exit_reason == "stop_hit"  # found by (session_id, entry_time)
+        q2.stop()
+
+        q3 = _queue(db_path)
+        q3.start()
+        assert q3.replayed == 0
+        q3.stop()
+        assert len(_trades(db_path)) == 2
+
+    def test_committed_ops_not_replayed(self, db_path):
+        q1 = _queue(db_path)
+        q1.start()
+        q1.create_trade(**_trade_fields())
+        q1.stop()
+        # Crash between commit and journal truncation: seq 1 is still journaled
+        q2 = _queue(db_path)
+        q2._journal = open(q2._journal_path, "a", encoding="utf-8")
+        q2.create_trade(**_trade_fields())
+        q2._journal.close()
+        assert '"seq":1' in db_path.with_name("trades.db.wbq").read_text()
+
+        q3 = _queue(db_path)
+        q3.start()
+        assert q3.replayed == 0
+        q3.stop()
+        assert len(_trades(db_path)) == 1
+
+    def test_poison_op_is_dead_lettered(self, db_path):
+        q = _queue(db_path, flush_interval_sec=0.01, max_attempts=2)
+        q.start()
+        with q._cond:  # one batch: good, poison, good
+            q.create_trade(**_trade_fields(session_id="a"))
+            q.create_trade(**_trade_fields(no_such_column=1))
+            q.create_trade(**_trade_fields(session_id="b"))
+        assert q.flush()
+        q.put_risk_state("2026-03-02", daily_pnl=-5.0, trade_count=1)
+        assert q.flush()
+        q.stop()
+        assert [t.session_id for t in _trades(db_path)] == ["a", "b"]
+        stats = q.get_stats()
+        assert stats["dead_lettered"] == 1 and stats["errors"] == 2
+        (line,) = db_path.with_name("trades.db.wbq.dead").read_text().splitlines()
+        assert loads(line)["seq"] == 2 and "no_such_column" in loads(line)["error"]
+
+        q2 = _queue(db_path)
+        q2.start()
+        assert q2.replayed == 0
+        q2.stop()
+        assert len(_trades(db_path)) == 2
+
+    @pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+    def test_crash_mid_single_op_retry_replays_rest(self, db_path):
+        q = _queue(db_path, flush_interval_sec=0.01, max_attempts=1)
+        real_commit = q._commit
+
+        def crash_after_first_single(db, ops, upto):
+            real_commit(db, ops, upto)
+            if len(ops) == 1 and ops[0].data.get("session_id") == "a":
+                raise SystemExit  # worker thread dies as in a process crash
+
+        q._commit = crash_after_first_single
+        q.start()
+        with q._cond:  # one batch: good, poison, good
+            q.create_trade(**_trade_fields(session_id="a"))
+            q.create_trade(**_trade_fields(no_such_column=1))
+            q.create_trade(**_trade_fields(session_id="b"))
+        q._thread.join(timeout=5.0)
+        assert not q.is_running
+        q.stop()  # worker is gone; only closes the journal
+        assert [t.session_id for t in _trades(db_path)] == ["a"]
+
+        q2 = _queue(db_path, max_attempts=1)
+        q2.start()
+        assert q2.replayed == 2
+        q2.stop()
+        assert [t.session_id for t in _trades(db_path)] == ["a", "b"]
+        assert q2.dead_lettered == 1
+
+    def test_risk_engine_queues_persistence(self, db_path):
+        q = _queue(db_path)
+        q.start()
+        risk = RiskEngine(RiskConfig(), persistence=q, today_provider=lambda: "2026-03-02")
+        risk.update_pnl(-25.0)
+        risk.record_trade()
+        q.stop()
+        db = get_session(f"sqlite:///{db_path}")
+        reloaded = RiskEngine(RiskConfig(), db_session=db, today_provider=lambda: "2026-03-02")
+        assert reloaded.state.daily_pnl == -25.0
+        assert reloaded.state.trade_count == 1
+        db.close()
+
+    def test_no_journal_for_memory_db(self):
+        assert default_journal_path("sqlite://") is None
+        assert default_journal_path("sqlite:///x/icc.db") == "x/icc.db.wbq"
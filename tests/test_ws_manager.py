@@ -0,0 +1,177 @@
+"""Tests for per-client WebSocket send queues."""
+
+import asyncio
+import json
+
+from icc.web.binary_protocol import decode
+from icc.web.ws_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0.0, fail: bool = False, subprotocols: tuple = ()):
+        self.delay = delay
+        self.fail = fail
+        self.scope = {"subprotocols": list(subprotocols)}
+        self.sent: list[dict] = []
+        self.raw: list = []
+        self.subprotocol: str | None = None
+        self.closed_code: int | None = None
+
+    async def accept(self, subprotocol: str | None = None):
+        self.subprotocol = subprotocol
+
+    async def send_text(self, text: str):
+        if self.fail:
+            raise RuntimeError("socket gone")
+        await asyncio.sleep(self.delay)
+        self.raw.append(text)
+        self.sent.append(json.loads(text))
+
+    async def send_bytes(self, data: bytes):
+        self.raw.append(data)
+        self.sent.append(decode(data))
+
+    async def close(self, code: int = 1000):
+        self.closed_code = code
+
+
+async def _settle(seconds: float = 0.01):
+    await asyncio.sleep(seconds)
+
+
+class TestConnectionManager:
+    def test_slow_client_does_not_block_fast_client(self):
+        async def run():
+            mgr = ConnectionManager()
+            fast, slow = FakeWebSocket(), FakeWebSocket(delay=0.2)
+            await mgr.connect(fast)
+            await mgr.connect(slow)
+            await mgr.broadcast({"type": "entry", "data": {}})
+            await asyncio.wait_for(mgr.broadcast({"type": "exit", "data": {}}), 0.05)
+            await _settle(0.02)
+            return fast, slow, mgr
+
+        fast, slow, mgr = asyncio.run(run())
+        assert [m["type"] for m in fast.sent] == ["entry", "exit"]
+        assert slow.sent == []
+
+    def test_stale_candles_coalesced(self):
+        async def run():
+            mgr = ConnectionManager()
+            ws = FakeWebSocket(delay=0.05)
+            await mgr.connect(ws)
+            await mgr.broadcast({"type": "entry", "data": {}})
+            await _settle()  # entry is in flight
+            for i in range(5):
+                await mgr.broadcast({"type": "candle", "data": {"i": i}})
+            await mgr.broadcast({"type": "exit", "data": {}})
+            stats = mgr.get_client_stats()[0]
+            await _settle(0.3)
+            return ws, stats
+
+        ws, stats = asyncio.run(run())
+        assert [m["type"] for m in ws.sent] == ["entry", "candle", "exit"]
+        assert ws.sent[1]["data"]["i"] == 4
+        assert stats["coalesced"] == 4
+
+    def test_candles_coalesce_per_symbol(self):
+        async def run():
+            mgr = ConnectionManager()
+            ws = FakeWebSocket(delay=0.05)
+            await mgr.connect(ws)
+            await mgr.broadcast({"type": "entry", "data": {}})
+            await _settle()  # entry is in flight
+            for i in range(3):
+                for symbol in ("QQQ", "SPY"):
+                    await mgr.broadcast({"type": "candle", "data": {"symbol": symbol, "i": i}})
+            stats = mgr.get_client_stats()[0]
+            await _settle(0.3)
+            return ws, stats
+
+        ws, stats = asyncio.run(run())
+        candles = [(m["data"]["symbol"], m["data"]["i"]) for m in ws.sent[1:]]
+        assert candles == [("QQQ", 2), ("SPY", 2)]
+        assert stats["coalesced"] == 4
+
+    def test_lagging_client_disconnected(self):
+        async def run():
+            mgr = ConnectionManager(max_lag_sec=0.05)
+            ws = FakeWebSocket(delay=1.0)
+            await mgr.connect(ws)
+            await mgr.broadcast({"type": "entry", "data": {}})
+            await _settle()
+            await mgr.broadcast({"type": "exit", "data": {}})
+            await _settle(0.1)
+            await mgr.broadcast({"type": "alert", "data": {}})
+            await _settle()
+            return ws, mgr
+
+        ws, mgr = asyncio.run(run())
+        assert mgr.client_count == 0
+        assert mgr.lag_disconnects == 1
+        assert ws.closed_code == 1013
+
+    def test_queue_limit_disconnects(self):
+        async def run():
+            mgr = ConnectionManager(max_queue=3)
+            ws = FakeWebSocket(delay=1.0)
+            await mgr.connect(ws)
+            for i in range(6):
+                await mgr.broadcast({"type": "alert", "data": {"i": i}})
+            return mgr
+
+        mgr = asyncio.run(run())
+        assert mgr.client_count == 0
+
+    def test_send_failure_removes_client(self):
+        async def run():
+            mgr = ConnectionManager()
+            await mgr.connect(FakeWebSocket(fail=True))
+            await mgr.broadcast({"type": "entry", "data": {}})
+            await _settle()
+            return mgr
+
+        assert asyncio.run(run()).client_count == 0
+
+    def test_stats_report_delivery(self):
+        async def run():
+            mgr = ConnectionManager()
+            ws = FakeWebSocket()
+            await mgr.connect(ws)
+            await mgr.send(ws, {"type": "pong"})
+            await _settle()
+            return mgr.get_client_stats()
+
+        stats = asyncio.run(run())
+        assert stats[0]["sent"] == 1
+        assert stats[0]["queue_depth"] == 0
+        assert stats[0]["lag_ms"] == 0.0
+
+    def test_binary_client_gets_packed_frames(self):
+        from datetime import datetime
+
+        from icc.core.events import CandlePayload, EventType, TradingEvent
+        from icc.web.binary_protocol import binary_frames, json_frames
+
+        events = [
+            TradingEvent(EventType.CANDLE, CandlePayload(datetime(2026, 3, 2, 9, 30), 1, 2, 0.5, 1.5, 10)),
+            TradingEvent(EventType.RISK_VETO, {"reason": "max_trades"}),
+        ]
+
+        async def run():
+            mgr = ConnectionManager()
+            plain, packed = FakeWebSocket(), FakeWebSocket(subprotocols=("icc.bin.v1",))
+            await mgr.connect(plain)
+            await mgr.connect(packed)
+            text, key = json_frames(events)
+            await mgr.broadcast_text(text, key, binary_frames(events))
+            await _settle()
+            return mgr, plain, packed
+
+        mgr, plain, packed = asyncio.run(run())
+        assert mgr.binary_client_count == 1
+        assert packed.subprotocol == "icc.bin.v1" and plain.subprotocol is None
+        assert [type(f) for f in packed.raw] == [bytes, str]
+        assert [m["type"] for m in packed.sent] == ["candle", "risk_veto"]
+        assert plain.sent[0]["type"] == "batch"
+        assert packed.sent[0]["data"] == plain.sent[0]["data"][0]["data"]